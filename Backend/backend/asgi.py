@@ -9,14 +9,24 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+# Populate the app registry before importing consumers (they import models)
+django_asgi_app = get_asgi_application()
+
+# Build the refresh-token blacklist filter before serving the first request
+from users.blacklist import blacklist_filter
+blacklist_filter.warm_up()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-from chat.routing import websocket_urlpatterns
+from chat.middleware import JWTAuthMiddlewareStack
+from chat.routing import websocket_urlpatterns as chat_websocket_urlpatterns
+from notifications.routing import websocket_urlpatterns as notification_websocket_urlpatterns
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(websocket_urlpatterns)
+    "http": django_asgi_app,
+    "websocket": JWTAuthMiddlewareStack(
+        URLRouter(chat_websocket_urlpatterns + notification_websocket_urlpatterns)
     ),
 })
-
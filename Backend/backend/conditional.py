@@ -0,0 +1,82 @@
+"""
+Conditional GET support for API views.
+
+Views describe the current state of a resource with a few cheap values
+(an ``updated_at``, a last id, a row count, ...) instead of the body, so
+a client that already holds the current representation gets a 304 before
+any serialization happens. Lists over whole tables use the response cache's
+model versions instead, which cost no query at all. Responses are marked ``private, no-cache``:
+browsers keep them but revalidate on every use.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .response_cache import canonical_query, get_versions
+
+
+def make_etag(*parts):
+    """Weak ETag over the given validator values"""
+    digest = hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """A 304 response if the client's copy is still current, else None"""
+    return get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if response.status_code in (200, 304):
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(_timestamp(last_modified))
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional(validator):
+    """
+    Decorate a view's GET handler with conditional request support.
+
+    ``validator(view, request, *args, **kwargs)`` returns ``(etag_parts,
+    last_modified)`` for the resource, or None when it cannot tell (e.g.
+    the object does not exist) and the handler should just run.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            state = validator(view, request, *args, **kwargs)
+            if state is None:
+                return method(view, request, *args, **kwargs)
+            etag_parts, last_modified = state
+            etag = make_etag(*etag_parts)
+            response = not_modified(request, etag, last_modified)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+def versioned_state(request, labels, *parts):
+    """
+    (etag parts, last modified) for a response built from the models named
+    by ``labels``: their versions (see ``backend.response_cache``) and the
+    canonical query string, plus any ``parts`` the response also depends on
+    """
+    return [*parts, request.path, canonical_query(request), *get_versions(labels)], None
+
+
+def queryset_state(queryset, field='updated_at'):
+    """(etag parts, last modified) for a list: its size and newest change"""
+    state = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max(field), last_id=Max('pk'))
+    return [state['count'], state['last_id'], state['last_modified']], state['last_modified']
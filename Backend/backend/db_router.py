@@ -0,0 +1,149 @@
+"""
+Read replica routing.
+
+Writes always go to ``default``, and so do reads, except in views using
+``ReplicaReadMixin``: their safe (GET/HEAD/OPTIONS) requests read from one
+of READ_REPLICAS, picked at random once per request.
+
+Replicas lag behind the primary, so users must still see their own writes.
+A request with an unsafe method that writes pins its user to the primary
+for REPLICA_STICKY_SECONDS. Within any request, reads that follow a write or
+run inside a transaction stay on the primary. Pins live in the default
+cache, so with Redis they hold across worker processes and with locmem
+within one process. Code that writes outside a request (the chat WebSocket
+consumer) calls ``pin_to_primary`` itself.
+
+Nothing is routed to a replica without ReplicaRoutingMiddleware or when no
+replicas are configured.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+
+
+class RoutingState:
+    """Where the current request reads from, and whether it has written"""
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    return getattr(settings, 'READ_REPLICAS', [])
+
+
+def _pin_key(user_id):
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Keep ``user_id``'s reads on the primary for the next STICKY_SECONDS"""
+    cache.set(_pin_key(user_id), 1, STICKY_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id)) is not None
+
+
+def use_replica(user):
+    """Send the rest of the current request's reads to a replica, unless ``user`` is pinned"""
+    state = _state.get()
+    replicas = replica_aliases()
+    if state is None or state.wrote or not replicas:
+        return
+    if user.is_authenticated and is_pinned(user.id):
+        return
+    state.read_alias = random.choice(replicas)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary within the block"""
+    state = _state.get()
+    if state is None:
+        yield
+        return
+    alias, state.read_alias = state.read_alias, None
+    try:
+        yield
+    finally:
+        if not state.wrote:
+            state.read_alias = alias
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica the current request picked, and everything
+    else to the primary. Returning the primary explicitly keeps saves of
+    instances loaded from a replica off the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.read_alias is None:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Later reads in this request must see the write
+            state.wrote = True
+            state.read_alias = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Scopes routing decisions to one request and pins users who wrote"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        # DRF authenticates inside the view and sets request.user there
+        user = getattr(request, 'user', None)
+        if state.wrote and request.method not in SAFE_METHODS and user is not None and user.is_authenticated:
+            pin_to_primary(user.id)
+        return response
+
+
+class ReplicaReadMixin:
+    """DRF view mixin reading safe requests from a replica (see ReplicaRouter)"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            use_replica(request.user)
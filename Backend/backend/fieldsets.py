@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets and embedded expansions for read requests.
+
+``?fields=id,title`` keeps only the named fields of a serializer and
+``?expand=created_by`` replaces a related id with the nested object, using
+the serializer class the resource lists in ``expandable_fields``. Both only
+apply to safe methods. ``query_plan`` turns the resulting serializer into
+the ``only()``/``select_related()`` lookups that load exactly those columns.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _param_list(params, name):
+    return [item.strip() for item in params.get(name, '').split(',') if item.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin honouring ``?fields=`` and ``?expand=``, read from
+    the request in the context or from an explicit ``query_params`` entry.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.method not in SAFE_METHODS:
+            return
+        params = self.context.get('query_params', request.query_params if request is not None else None)
+        if params is None:
+            return
+
+        expand = _param_list(params, 'expand')
+        unknown = [name for name in expand if name not in self.expandable_fields]
+        if unknown:
+            raise serializers.ValidationError({'expand': f"Cannot expand: {', '.join(unknown)}."})
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+
+        fields = _param_list(params, 'fields')
+        if fields:
+            readable = {name for name, field in self.fields.items() if not field.write_only}
+            unknown = [name for name in fields if name not in readable]
+            if unknown:
+                raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}."})
+            # Expanded fields are always returned
+            keep = set(fields) | set(expand)
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+
+def expanded_labels(serializer_class, request):
+    """
+    Labels of the models a read request embeds through ``?expand=``; cached
+    responses and validators must track their versions too
+    """
+    if request.method not in SAFE_METHODS:
+        return []
+    expandable = getattr(serializer_class, 'expandable_fields', {})
+    return [
+        expandable[name].Meta.model._meta.label
+        for name in _param_list(request.query_params, 'expand') if name in expandable
+    ]
+
+
+def has_fieldset(request):
+    return request.method in SAFE_METHODS and bool(
+        request.query_params.get('fields') or request.query_params.get('expand')
+    )
+
+
+def query_plan(serializer):
+    """
+    ``(only, select_related)`` lookups covering every field ``serializer``
+    reads, or None when a source is not a plain column or forward relation.
+    """
+    only, related = set(), set()
+
+    def walk(fields, model, prefix):
+        for field in fields.values():
+            if field.write_only:
+                continue
+            nested = isinstance(field, serializers.BaseSerializer)
+            if not field.source_attrs or (nested and isinstance(field, serializers.ListSerializer)):
+                return False
+            current, path = model, prefix
+            for i, attr in enumerate(field.source_attrs):
+                try:
+                    model_field = current._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    return False
+                path = [*path, attr]
+                only.add('__'.join(path))
+                if i < len(field.source_attrs) - 1 or nested:
+                    if not (model_field.many_to_one or model_field.one_to_one):
+                        return False
+                    related.add('__'.join(path))
+                    current = model_field.related_model
+            if nested and not walk(field.fields, current, path):
+                return False
+        return True
+
+    if not walk(serializer.fields, serializer.Meta.model, []):
+        return None
+    return sorted(only), sorted(related)
+
+
+class SparseFieldsetMixin:
+    """Detail view mixin loading only the columns a sparse request returns"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if has_fieldset(self.request):
+            plan = query_plan(self.get_serializer())
+            if plan is not None:
+                only, related = plan
+                # Drop the view's own joins: they may cover deferred relations
+                queryset = queryset.select_related(None).select_related(*related).only(*only)
+        return queryset
@@ -0,0 +1,22 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.filters import OrderingFilter
+
+
+class KeysetOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter for cursor-paginated lists. A keyset cursor cannot point
+    at NULL, so ordering by a nullable column leaves out the rows where it
+    is null (sorting jobs by pay lists those with a known salary).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if ordering:
+            field_name = ordering[0].lstrip('-')
+            try:
+                field = queryset.model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.null:
+                queryset = queryset.filter(**{f'{field_name}__isnull': False})
+        return super().filter_queryset(request, queryset, view)
@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Opaque-cursor keyset pagination for list endpoints.
+
+    Rows are walked newest first on (created_at, id), so fetching a deep
+    page costs the same indexed range scan as fetching the first one.
+    Clients can ask for a smaller or larger page with ``?page_size=``,
+    capped at ``max_page_size``. Full-text search results are walked by
+    relevance and proximity results nearest first, unless the client asked
+    for an explicit ``?ordering=``.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get("ordering"):
+            if "search_rank" in queryset.query.annotations:
+                return ("-search_rank", "-created_at", "-id")
+            if "distance_km" in queryset.query.annotations:
+                return ("distance_km", "-created_at", "-id")
+        return super().get_ordering(request, queryset, view)
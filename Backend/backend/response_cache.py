@@ -0,0 +1,138 @@
+"""
+Versioned response cache for read-heavy list endpoints.
+
+A cached response is keyed on the view, the request URL with its query
+parameters in a canonical order, and the current version of every model
+the response is built from. Saving or deleting one of those models bumps
+its version once the transaction commits, so stale entries are never read
+again and simply expire. Writes that send no signals (``QuerySet.update()``,
+``bulk_create()``) must call ``bump_version`` themselves.
+
+On a miss only one request per key recomputes the response; concurrent
+requests for the same key wait for its result instead of all querying the
+database. Versions and locks live in the default cache, so with Redis this
+holds across worker processes and with locmem within one process.
+"""
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+from .db_router import primary_reads
+from .fieldsets import expanded_labels
+
+CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 5 * 60)
+
+# Bounds how long a request that died mid-recompute holds up the others
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+
+
+def _version_key(label):
+    return f'response-cache:version:{label}'
+
+
+def get_versions(labels):
+    """Current version of each model label, in the same order"""
+    keys = [_version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed from the clock so a version lost to eviction never
+            # comes back as one that was already used
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    """Invalidate every cached response built from ``model``"""
+    key = _version_key(model._meta.label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def _bump_on_commit(sender, **kwargs):
+    # Bumping before commit would let a reader cache the old rows under the new version
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def track_versions(*models):
+    """Bump each model's version whenever one of its rows is saved or deleted"""
+    for model in models:
+        uid = f'response_cache_{model._meta.label}'
+        post_save.connect(_bump_on_commit, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_bump_on_commit, sender=model, dispatch_uid=f'{uid}_delete')
+
+
+def canonical_query(request):
+    """The request's query parameters in a canonical order"""
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def response_cache_key(request, view_name, labels):
+    query = canonical_query(request)
+    versions = get_versions(labels)
+    # Paginated responses embed absolute next/previous links
+    parts = [request.scheme, request.get_host(), request.path, query]
+    parts += [f'{label}={version}' for label, version in zip(labels, versions)]
+    digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+    return f'response-cache:{view_name}:{digest}'
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+        if not cache.get(f'{key}:lock'):
+            # The recompute finished without caching (e.g. an error response)
+            return None
+    return None
+
+
+def cache_response(*labels, timeout=CACHE_TIMEOUT):
+    """
+    Cache a view's successful ``list()`` responses until one of the models
+    named by ``labels`` (``'app_label.Model'``), or embedded with
+    ``?expand=``, changes. Every such model must be registered with
+    ``track_versions``.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            view_name = f'{type(view).__module__}.{type(view).__name__}'
+            tracked = [*labels, *expanded_labels(view.get_serializer_class(), request)]
+            key = response_cache_key(request, view_name, tracked)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            locked = cache.add(f'{key}:lock', 1, LOCK_TIMEOUT)
+            if not locked:
+                data = _wait_for(key)
+                if data is not None:
+                    return Response(data)
+            try:
+                # Shared entries must not capture a lagging replica's view
+                with primary_reads():
+                    response = method(view, request, *args, **kwargs)
+                if response.status_code == 200:
+                    cache.set(key, response.data, timeout)
+            finally:
+                if locked:
+                    cache.delete(f'{key}:lock')
+            return response
+        return wrapper
+    return decorator
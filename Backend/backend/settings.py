@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 
@@ -32,6 +33,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
+    'daphne',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -48,8 +50,16 @@ INSTALLED_APPS = [
     'issues',
     'chat',
     'notifications',
+    'search',
+    'geo',
+    'facets',
 ]
 
+# The benchmark harness (generate_data, run_benchmarks) is only installed in
+# development or when the BENCHMARKS environment variable is set
+if DEBUG or os.environ.get("BENCHMARKS"):
+    INSTALLED_APPS.append('benchmarks')
+
 AUTH_USER_MODEL = 'users.User'
 
 AUTHENTICATION_BACKENDS = [
@@ -58,7 +68,7 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -88,6 +98,72 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache (unread counters and other shared state). Local memory is per
+# process, so point REDIS_CACHE_URL at Redis when running several workers.
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_CACHE_URL,
+    } if REDIS_CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# Seconds an authenticated user's row stays cached for JWT authentication
+# (saving or deleting the user drops it immediately)
+USER_CACHE_TTL = 5 * 60
+
+# Upper bound in seconds on how stale a worker's refresh-token blacklist
+# filter may be when the cache is not shared between processes; prune
+# expired tokens from cron with `manage.py prune_tokens`
+BLACKLIST_FILTER_REFRESH = 5
+
+# Square WebP thumbnails (edge in pixels) rendered from every profile
+# picture by `manage.py process_thumbnails --loop`. Set
+# PROFILE_THUMBNAILS_QUEUED to False to render them right after the upload
+# commits instead (no worker needed, e.g. in development).
+PROFILE_THUMBNAIL_SIZES = {
+    "small": 96,
+    "medium": 256,
+    "large": 512,
+}
+PROFILE_THUMBNAILS_QUEUED = True
+
+# Chat notifications are queued and delivered in batches by
+# `manage.py process_notifications --loop`. Set to False to deliver each one
+# right after its request commits (no worker needed, e.g. in development).
+NOTIFICATIONS_QUEUED = True
+
+# Age in days after which `manage.py purge_notifications` deletes read and
+# unread notifications (None keeps them forever)
+NOTIFICATION_RETENTION_DAYS = {
+    "read": 30,
+    "unread": None,
+}
+
+# `manage.py archive_chat_messages` moves chat messages older than age_days
+# (closed_age_days for inactive jobs and resolved issues) into compressed
+# archive segments of up to segment_size messages
+CHAT_ARCHIVE = {
+    "age_days": 180,
+    "closed_age_days": 30,
+    "segment_size": 500,
+}
+
+# Full-text search engine for job/issue lists. Falls back to icontains
+# matching when the backend cannot run on the configured database; use
+# search.backends.PostgresSearchBackend on Postgres.
+SEARCH_BACKEND = "search.backends.SQLiteFTS5Backend"
+
+# Offline gazetteer (CSV of name, latitude, longitude, "|"-separated aliases)
+# that user, job and issue locations are geocoded against
+GEO_GAZETTEER_PATH = BASE_DIR / "geo" / "data" / "gazetteer.csv"
+
+# Seconds before a cached unread-notification counter is recounted from the DB
+NOTIFICATION_UNREAD_COUNT_TTL = 60 * 60
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
@@ -95,6 +171,7 @@ CORS_ALLOWED_ORIGINS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -139,6 +216,27 @@ DATABASES = {
     }
 }
 
+# Read replicas for the views using backend.db_router.ReplicaReadMixin, as a
+# comma-separated list of SQLite files in DATABASE_REPLICAS. They are opened
+# read-only; pointing one at db.sqlite3 itself or at a copy of it exercises
+# the routing locally. In tests they mirror the test database (see
+# backend/tests.py for the routing tests).
+READ_REPLICAS = []
+for replica_path in filter(None, (path.strip() for path in os.environ.get("DATABASE_REPLICAS", "").split(","))):
+    alias = f"replica{len(READ_REPLICAS) + 1}"
+    DATABASES[alias] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{Path(replica_path).resolve()}?mode=ro",
+        "TEST": {"MIRROR": "default"},
+    }
+    READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["backend.db_router.ReplicaRouter"]
+
+# Seconds a user's reads stay on the primary after one of their requests
+# wrote, so replica lag never hides their own changes from them
+REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import ServiceCategory
+from notifications.counters import get_unread_count
+from notifications.models import Notification
+from users.models import User
+from .db_router import (
+    ReplicaRouter, ReplicaRoutingMiddleware, is_pinned, pin_to_primary, primary_reads, use_replica,
+)
+
+REPLICA = 'replica1'
+
+
+@override_settings(READ_REPLICAS=[REPLICA])
+class ReplicaRouterTests(TransactionTestCase):
+    """
+    Routing decisions are checked through ``QuerySet.db``, which asks the
+    router without opening a connection, so no replica has to exist. Reads
+    inside a transaction stay on the primary, hence TransactionTestCase.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+
+    def in_request(self, view, method='get', user=None):
+        """Run ``view(request)`` inside the routing middleware, like a view would"""
+        request = getattr(RequestFactory(), method)('/')
+        request.user = user or AnonymousUser()
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_reads_use_the_primary_outside_requests(self):
+        self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_replica_reads(self):
+        def view(request):
+            self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+            use_replica(self.user)
+            self.assertEqual(ServiceCategory.objects.all().db, REPLICA)
+        self.in_request(view)
+
+    def test_writes_and_later_reads_use_the_primary(self):
+        def view(request):
+            use_replica(self.user)
+            self.assertEqual(ServiceCategory.objects.all().db, REPLICA)
+            category = ServiceCategory.objects.create(name='Plumbing')
+            self.assertEqual(category._state.db, DEFAULT_DB_ALIAS)
+            # The request wrote: it must read its own write
+            self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+        self.in_request(view)
+
+    def test_primary_reads_block(self):
+        def view(request):
+            use_replica(self.user)
+            with primary_reads():
+                self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+            self.assertEqual(ServiceCategory.objects.all().db, REPLICA)
+        self.in_request(view)
+
+    def test_reads_inside_a_transaction_use_the_primary(self):
+        def view(request):
+            use_replica(self.user)
+            with transaction.atomic():
+                self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+        self.in_request(view)
+
+    def test_pinned_user_reads_the_primary(self):
+        pin_to_primary(self.user.id)
+
+        def view(request):
+            use_replica(self.user)
+            self.assertEqual(ServiceCategory.objects.all().db, DEFAULT_DB_ALIAS)
+        self.in_request(view)
+
+    def test_unsafe_request_that_writes_pins_its_user(self):
+        def view(request):
+            ServiceCategory.objects.create(name='Plumbing')
+        self.in_request(view, method='post', user=self.user)
+        self.assertTrue(is_pinned(self.user.id))
+
+    def test_safe_request_that_writes_does_not_pin(self):
+        def view(request):
+            ServiceCategory.objects.create(name='Plumbing')
+        self.in_request(view, user=self.user)
+        self.assertFalse(is_pinned(self.user.id))
+
+    def test_sticky_pin_follows_a_post(self):
+        # Record where the real views would read notifications from, while
+        # still serving them from the test database
+        decisions = []
+
+        def recording_db_for_read(router, model, **hints):
+            if model is Notification:
+                decisions.append(db_for_read(router, model, **hints))
+            return DEFAULT_DB_ALIAS
+
+        db_for_read = ReplicaRouter.db_for_read
+        # The unread counter always fills from the primary; keep it cached
+        get_unread_count(self.user.id)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with mock.patch.object(ReplicaRouter, 'db_for_read', recording_db_for_read):
+            self.assertEqual(client.get('/api/notifications/').status_code, 200)
+            self.assertEqual(set(decisions), {REPLICA})
+
+            self.assertEqual(client.post('/api/notifications/mark-all-read/').status_code, 200)
+            self.assertTrue(is_pinned(self.user.id))
+
+            decisions.clear()
+            self.assertEqual(client.get('/api/notifications/').status_code, 200)
+            self.assertEqual(set(decisions), {DEFAULT_DB_ALIAS})
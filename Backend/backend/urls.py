@@ -26,6 +26,7 @@ urlpatterns = [
     path('api/issues/', include('issues.urls')),
     path("api/chat/", include("chat.urls")),
     path("api/notifications/", include("notifications.urls")),
+    path("api/facets/", include("facets.urls")),
 ]
 
 # Serve media files during development
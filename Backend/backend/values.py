@@ -0,0 +1,121 @@
+"""
+values()-based read path for list views.
+
+A ModelSerializer builds a model instance per row and walks every field
+through ``get_attribute``. For list endpoints the same output can be
+produced from ``QuerySet.values()`` rows, with the joins done by the
+database and each value passed through the serializer field's own
+``to_representation``, so the payload stays byte-for-byte the same.
+Sparse fieldsets and expansions (see ``backend.fieldsets``) narrow the
+values() call to the columns the response actually contains.
+"""
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .renderers import FastJSONRenderer
+
+
+class ValuesSerializer:
+    """
+    Serializes ``values()`` rows the way ``serializer`` serializes
+    instances. Supports concrete fields, dotted sources and nested
+    serializers across forward relations, and primary key relations.
+    """
+
+    def __init__(self, serializer):
+        self.lookups = []
+        self.columns = self._columns(serializer, serializer.Meta.model, [])
+        self.lookups = list(dict.fromkeys(self.lookups))
+
+    def _columns(self, serializer, model, prefix):
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            nested = isinstance(field, serializers.ModelSerializer)
+            if (isinstance(field, serializers.BaseSerializer) and not nested) or isinstance(field, (
+                    serializers.ManyRelatedField, serializers.SerializerMethodField, serializers.HiddenField)):
+                raise ImproperlyConfigured(
+                    f'{type(serializer).__name__}.{name} cannot be serialized from values()'
+                )
+            attrs = field.source_attrs
+            path = [*prefix, *attrs]
+            lookup = '__'.join(path)
+            # DRF leaves a dotted field out when a relation on the way is None
+            guards = ['__'.join([*prefix, *attrs[:i]]) for i in range(1, len(attrs))]
+
+            current, model_field = model, None
+            try:
+                for attr in attrs:
+                    model_field = current._meta.get_field(attr)
+                    current = model_field.related_model or current
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f'{type(serializer).__name__}.{name} is not backed by a model field'
+                )
+
+            children = None
+            convert = field.to_representation
+            if nested:
+                children = self._columns(field, current, path)
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                convert = None
+            elif isinstance(field, serializers.FileField):
+                convert = self._file_converter(field, model_field)
+            columns.append((name, lookup, guards, convert, children))
+            self.lookups += [lookup, *guards]
+        return columns
+
+    @staticmethod
+    def _file_converter(field, model_field):
+        # values() returns the stored name; the field expects a FieldFile
+        def convert(name):
+            return field.to_representation(model_field.attr_class(None, model_field, name))
+        return convert
+
+    def values(self, queryset, extra=()):
+        """``queryset`` as values() rows carrying every lookup plus ``extra``"""
+        annotations = list(queryset.query.annotations)
+        return queryset.values(*dict.fromkeys([*self.lookups, *annotations, *extra]))
+
+    def _item(self, row, columns):
+        item = {}
+        for name, lookup, guards, convert, children in columns:
+            if any(row[guard] is None for guard in guards):
+                continue
+            value = row[lookup]
+            if value is None:
+                item[name] = None
+            elif children is not None:
+                item[name] = self._item(row, children)
+            else:
+                item[name] = value if convert is None else convert(value)
+        return item
+
+    def serialize(self, rows):
+        return [self._item(row, self.columns) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Serve a generic view's ``list()`` from values() rows instead of model
+    instances, rendered with FastJSONRenderer. Cursor pagination works on
+    the rows directly; the fields it orders by are always fetched.
+    """
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = ValuesSerializer(self.get_serializer())
+
+        ordering = ()
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            ordering = [field.lstrip('-') for field in self.paginator.get_ordering(request, queryset, self)]
+        rows = serializer.values(queryset, ordering)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Build the refresh-token blacklist filter before serving the first request
+from users.blacklist import blacklist_filter  # noqa: E402
+blacklist_filter.warm_up()
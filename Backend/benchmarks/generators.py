@@ -0,0 +1,245 @@
+"""
+Reproducible synthetic data for load testing. Everything is derived from a
+single seed and written with bulk_create in batches, so multi-million row
+datasets can be generated without holding them in memory.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from chat.models import Conversation, Message, pair_key
+from geo.gazetteer import geocode
+from geo.geohash import encode
+from issues.models import Issue
+from jobs.models import Job, ServiceCategory
+from notifications.models import Notification
+
+User = get_user_model()
+
+CATEGORY_NAMES = [
+    'Plumbing', 'Electrical', 'Cleaning', 'Carpentry', 'Painting', 'Gardening',
+    'Masonry', 'Roofing', 'Appliance Repair', 'Moving', 'Tutoring', 'IT Support',
+]
+WORDS = (
+    'fix leaking pipe kitchen bathroom wall paint door window roof garden '
+    'fence install replace broken light socket wiring tile floor clean house '
+    'urgent weekend quote repair water heater ceiling fan cupboard gate lock '
+    'laptop network printer move furniture lawn hedge drain blocked'
+).split()
+LOCATIONS = ['Colombo', 'Kandy', 'Galle', 'Jaffna', 'Negombo', 'Matara', 'Kurunegala', 'Anuradhapura']
+ISSUE_STATUSES = ['open', 'in_progress', 'resolved']
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create store the given created_at/updated_at values"""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class DataGenerator:
+
+    def __init__(self, seed=0, batch_size=5000, prefix='bench', span_days=365, stdout=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.end = timezone.now()
+        self.start = self.end - timedelta(days=span_days)
+        self.stdout = stdout
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def sentence(self, low, high):
+        return ' '.join(self.random.choices(WORDS, k=self.random.randint(low, high)))
+
+    def timestamp(self):
+        span = (self.end - self.start).total_seconds()
+        return self.start + timedelta(seconds=self.random.uniform(0, span))
+
+    def bulk_create(self, model, objects, total):
+        """Insert a generator of objects in batches; returns the created ids"""
+        ids = []
+        batch = []
+        with explicit_timestamps(model):
+            for obj in objects:
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    ids.extend(self._flush(model, batch))
+                    self.log(f'  {model.__name__}: {len(ids)}/{total}')
+                    batch = []
+            if batch:
+                ids.extend(self._flush(model, batch))
+        self.log(f'{model.__name__}: {len(ids)} created')
+        return ids
+
+    @staticmethod
+    def _flush(model, batch):
+        with transaction.atomic():
+            created = model.objects.bulk_create(batch)
+        return [obj.pk for obj in created]
+
+    def salary(self, as_type):
+        """A random salary in ``as_type`` with its normalized range"""
+        amount = self.random.randrange(1000, 100000, 500)
+        return {'salary': as_type(amount), 'salary_min': Decimal(amount), 'salary_max': Decimal(amount)}
+
+    def place(self):
+        """A random location with its coordinates, as model field values"""
+        location = self.random.choice(LOCATIONS)
+        latitude, longitude = geocode(location)
+        return {'location': location, 'latitude': latitude, 'longitude': longitude, 'geohash': encode(latitude, longitude)}
+
+    def users(self, count):
+        password = make_password(f'{self.prefix}-password')
+        offset = User.objects.filter(username__startswith=f'{self.prefix}_user_').count()
+        return self.bulk_create(User, (
+            User(
+                username=f'{self.prefix}_user_{offset + i}',
+                email=f'{self.prefix}_user_{offset + i}@example.com',
+                password=password,
+                **self.place(),
+                date_joined=self.timestamp(),
+            )
+            for i in range(count)
+        ), count)
+
+    def categories(self):
+        for name in CATEGORY_NAMES:
+            ServiceCategory.objects.get_or_create(name=name)
+        return list(ServiceCategory.objects.values_list('id', flat=True))
+
+    def jobs(self, count, user_ids, category_ids):
+        def build():
+            for _ in range(count):
+                created_at = self.timestamp()
+                yield Job(
+                    title=self.sentence(3, 7).capitalize(),
+                    description=self.sentence(20, 80),
+                    category_id=self.random.choice(category_ids),
+                    **self.salary(str),
+                    created_by_id=self.random.choice(user_ids),
+                    **self.place(),
+                    created_at=created_at,
+                    updated_at=created_at,
+                    is_active=self.random.random() < 0.9,
+                )
+        return self.bulk_create(Job, build(), count)
+
+    def issues(self, count, user_ids):
+        def build():
+            for _ in range(count):
+                created_at = self.timestamp()
+                yield Issue(
+                    user_id=self.random.choice(user_ids),
+                    **self.place(),
+                    title=self.sentence(3, 7).capitalize(),
+                    description=self.sentence(20, 80),
+                    category=self.random.choice(CATEGORY_NAMES),
+                    **self.salary(Decimal),
+                    status=self.random.choice(ISSUE_STATUSES),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+        return self.bulk_create(Issue, build(), count)
+
+    def chats(self, object_type, subjects, count, user_ids):
+        """
+        Private chats between a subject's owner and a random other user.
+        ``subjects`` is a list of (subject id, owner id).
+        """
+        seen = set()
+
+        def build():
+            attempts = 0
+            while len(seen) < count and attempts < count * 10:
+                attempts += 1
+                subject_id, owner_id = self.random.choice(subjects)
+                other_id = self.random.choice(user_ids)
+                low, high = sorted([owner_id, other_id])
+                if low == high or (subject_id, low, high) in seen:
+                    continue
+                seen.add((subject_id, low, high))
+                yield Conversation(
+                    object_type=object_type,
+                    object_id=subject_id,
+                    participant1_id=low,
+                    participant2_id=high,
+                    pair_key=pair_key(object_type, subject_id, low, high),
+                    created_at=self.timestamp(),
+                )
+
+        ids = self.bulk_create(Conversation, build(), count)
+        if not ids:
+            return []
+        return list(Conversation.objects.filter(
+            id__gte=min(ids), id__lte=max(ids)
+        ).values_list('id', 'participant1_id', 'participant2_id'))
+
+    def messages(self, chats, count):
+        """
+        Spread ``count`` messages over ``chats`` with a long tail: a few chats
+        get most of the traffic, like real conversations do.
+        """
+        if not chats:
+            return []
+        weights = [1 / (rank + 1) for rank in range(len(chats))]
+        step = (self.end - self.start) / count
+
+        def build():
+            # Timestamps grow with ids so history order matches id order
+            for i in range(count):
+                chat_id, p1, p2 = self.random.choices(chats, weights)[0]
+                yield Message(
+                    conversation_id=chat_id,
+                    sender_id=self.random.choice((p1, p2)),
+                    text=self.sentence(2, 25),
+                    created_at=self.start + step * i,
+                )
+
+        ids = self.bulk_create(Message, build(), count)
+
+        # Point every chat at its newest message; leave a few unread per side
+        latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-id')
+        Conversation.objects.filter(id__gte=chats[0][0], id__lte=chats[-1][0]).update(
+            last_message_id=Subquery(latest.values('id')[:1]),
+            last_message_at=Subquery(latest.values('created_at')[:1]),
+            participant1_last_read_id=Coalesce(Subquery(latest.values('id')[5:6]), 0),
+            participant2_last_read_id=Coalesce(Subquery(latest.values('id')[2:3]), 0),
+        )
+        return ids
+
+    def notifications(self, count, user_ids, job_ids, issue_ids):
+        def build():
+            for _ in range(count):
+                recipient, sender = self.random.sample(user_ids, 2)
+                on_job = bool(job_ids) and (not issue_ids or self.random.random() < 0.5)
+                yield Notification(
+                    recipient_id=recipient,
+                    sender_id=sender,
+                    notification_type='job_message' if on_job else 'issue_message',
+                    job_id=self.random.choice(job_ids) if on_job else None,
+                    issue_id=None if on_job else self.random.choice(issue_ids),
+                    message=f'New private message: {self.sentence(3, 10)}...',
+                    is_read=self.random.random() < 0.7,
+                    created_at=self.timestamp(),
+                )
+        return self.bulk_create(Notification, build(), count)
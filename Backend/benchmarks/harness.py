@@ -0,0 +1,122 @@
+"""
+Offline benchmark harness. Requests are driven through the real URLconf and
+middleware with Django's test client, authenticated with a real JWT, and
+measured for latency, throughput, query count and payload size.
+"""
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from chat.models import Conversation
+from issues.models import Issue
+from jobs.models import Job
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    method: str = 'get'
+    data: dict = field(default_factory=dict)
+
+
+@dataclass
+class Result:
+    name: str
+    requests: int
+    status: int
+    p50_ms: float
+    p99_ms: float
+    throughput: float
+    queries: int
+    bytes: int
+
+    def as_dict(self):
+        return self.__dict__.copy()
+
+
+def default_scenarios(user):
+    """Read-path scenarios for ``user``, built from whatever data exists"""
+    scenarios = [
+        Scenario('jobs.list', '/api/jobs/'),
+        Scenario('jobs.list_100', '/api/jobs/?page_size=100'),
+        Scenario('jobs.search', '/api/jobs/?search=pipe'),
+        Scenario('jobs.near', '/api/jobs/?near=Kandy&radius_km=25'),
+        Scenario('jobs.by_pay', '/api/jobs/?salary_min=50000&ordering=salary_min'),
+        Scenario('jobs.categories', '/api/jobs/categories/'),
+        Scenario('facets', '/api/facets/'),
+        Scenario('issues.list', '/api/issues/'),
+        Scenario('issues.list_100', '/api/issues/?page_size=100'),
+        Scenario('issues.filter', '/api/issues/?status=open'),
+        Scenario('chat.inbox', '/api/chat/inbox/'),
+        Scenario('notifications.list', '/api/notifications/'),
+        Scenario('notifications.list_100', '/api/notifications/?page_size=100'),
+        Scenario('notifications.unread_count', '/api/notifications/unread-count/'),
+    ]
+
+    job = Job.objects.order_by('-id').only('id').first()
+    if job:
+        scenarios.append(Scenario('jobs.detail', f'/api/jobs/{job.id}/'))
+    issue = Issue.objects.order_by('-id').only('id').first()
+    if issue:
+        scenarios.append(Scenario('issues.detail', f'/api/issues/{issue.id}/'))
+
+    # The user's busiest job chat exercises history windowing
+    chat = (
+        Conversation.objects.filter(object_type=Conversation.JOB, participant1=user)
+        .order_by('-last_message_id').first()
+    )
+    if chat:
+        other_id = chat.participant2_id
+        scenarios.append(Scenario('chat.job_messages', f'/api/chat/job/{chat.object_id}/messages/?user_id={other_id}'))
+        scenarios.append(Scenario('chat.job_conversations', f'/api/chat/job/{chat.object_id}/conversations/'))
+    return scenarios
+
+
+def run_scenario(client, scenario, requests, warmup):
+    send = getattr(client, scenario.method)
+    for _ in range(warmup):
+        send(scenario.path, scenario.data)
+
+    # Count queries once; capturing on every request would skew latencies
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        response = send(scenario.path, scenario.data)
+    queries = len(captured)
+
+    timings = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        begin = time.perf_counter()
+        send(scenario.path, scenario.data)
+        timings.append((time.perf_counter() - begin) * 1000)
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return Result(
+        name=scenario.name,
+        requests=requests,
+        status=response.status_code,
+        p50_ms=round(statistics.median(timings), 2),
+        p99_ms=round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 2),
+        throughput=round(requests / elapsed, 1) if elapsed else 0.0,
+        queries=queries,
+        bytes=len(response.content),
+    )
+
+
+def run_benchmarks(user, scenarios, requests=50, warmup=5, cached=True):
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    # Measure production-like settings: no per-query bookkeeping from DEBUG
+    overrides = {'DEBUG': False, 'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+    if not cached:
+        # Every request does the full database and serialization work
+        overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with override_settings(**overrides):
+        return [run_scenario(client, scenario, requests, warmup) for scenario in scenarios]
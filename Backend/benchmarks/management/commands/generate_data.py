@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+
+from backend.response_cache import bump_version
+from benchmarks.generators import DataGenerator
+from chat.models import Conversation
+from facets.counts import FACETS, rebuild_counts
+from issues.models import Issue
+from jobs.models import Job, ServiceCategory
+from search.backends import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic dataset for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--jobs", type=int, default=10000)
+        parser.add_argument("--issues", type=int, default=10000)
+        parser.add_argument("--chats", type=int, default=5000, help="Private chats per type (job and issue)")
+        parser.add_argument("--messages", type=int, default=100000, help="Messages per chat type")
+        parser.add_argument("--notifications", type=int, default=50000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="bench", help="Username prefix of generated users")
+
+    def handle(self, *args, **options):
+        generator = DataGenerator(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            prefix=options["prefix"],
+            stdout=self.stdout,
+        )
+
+        user_ids = generator.users(options["users"])
+        if len(user_ids) < 2:
+            self.stderr.write("At least two users are needed")
+            return
+        category_ids = generator.categories()
+        job_ids = generator.jobs(options["jobs"], user_ids, category_ids)
+        issue_ids = generator.issues(options["issues"], user_ids)
+
+        # Chats are spread over (at most) the first 50k generated jobs/issues
+        job_owners = list(
+            Job.objects.filter(id__gte=job_ids[0]).order_by("id").values_list("id", "created_by_id")[:50000]
+        ) if job_ids else []
+        issue_owners = list(
+            Issue.objects.filter(id__gte=issue_ids[0]).order_by("id").values_list("id", "user_id")[:50000]
+        ) if issue_ids else []
+
+        if job_owners:
+            chats = generator.chats(Conversation.JOB, job_owners, options["chats"], user_ids)
+            generator.messages(chats, options["messages"])
+        if issue_owners:
+            chats = generator.chats(Conversation.ISSUE, issue_owners, options["chats"], user_ids)
+            generator.messages(chats, options["messages"])
+
+        generator.notifications(options["notifications"], user_ids, job_ids, issue_ids)
+
+        # bulk_create skips the signals that keep the search index, the facet
+        # counts and the response cache in sync
+        rebuild_index()
+        for board in FACETS:
+            rebuild_counts(board)
+        for model in (ServiceCategory, Job, Issue):
+            bump_version(model)
+        self.stdout.write(self.style.SUCCESS("Synthetic dataset generated"))
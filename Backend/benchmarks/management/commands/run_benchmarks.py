@@ -0,0 +1,54 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from benchmarks.harness import default_scenarios, run_benchmarks
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark the REST API read paths (p50/p99 latency, throughput, queries)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--user", help="Username to authenticate as (default: busiest chat user)")
+        parser.add_argument("--only", help="Run only scenarios whose name contains this text")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+        parser.add_argument("--no-cache", action="store_true", help="Bypass the cache (measures the uncached read path)")
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['user']}")
+        else:
+            user = (
+                User.objects.annotate(chats=Count("conversations_as_p1"))
+                .order_by("-chats", "id").first()
+            )
+            if user is None:
+                raise CommandError("No users found; run generate_data first")
+
+        scenarios = default_scenarios(user)
+        if options["only"]:
+            scenarios = [s for s in scenarios if options["only"] in s.name]
+
+        results = run_benchmarks(user, scenarios, options["requests"], options["warmup"], cached=not options["no_cache"])
+
+        header = f"{'endpoint':<28}{'status':>7}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'bytes':>10}"
+        self.stdout.write(f"Benchmarking as {user.username}")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for r in results:
+            self.stdout.write(
+                f"{r.name:<28}{r.status:>7}{r.p50_ms:>10}{r.p99_ms:>10}{r.throughput:>10}{r.queries:>9}{r.bytes:>10}"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as f:
+                json.dump([r.as_dict() for r in results], f, indent=2)
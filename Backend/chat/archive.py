@@ -0,0 +1,210 @@
+"""
+Cold storage for chat history.
+
+Old messages are moved out of the hot message table into per-chat
+segments of zlib-compressed JSON, which keeps the hot table and its
+(conversation, id) index small. A chat's archived messages always have lower ids
+than its hot ones (``archived_until_id`` marks the boundary), so history
+windows can page from the hot range straight into the archive.
+"""
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from issues.models import Issue
+from jobs.models import Job
+from .models import Conversation, Message, MessageSegment
+
+User = get_user_model()
+
+DEFAULT_ARCHIVE_POLICY = {'age_days': 180, 'closed_age_days': 30, 'segment_size': 500}
+
+
+def closed_chats():
+    """Chats whose job or issue is finished, archived after the shorter age"""
+    return (
+        Q(object_type=Conversation.JOB, object_id__in=Job.objects.filter(is_active=False).values('id'))
+        | Q(object_type=Conversation.ISSUE, object_id__in=Issue.objects.filter(status='resolved').values('id'))
+    )
+
+
+class ArchivedMessage:
+    """Read-only stand-in for a message row restored from a segment"""
+    __slots__ = ('id', 'conversation_id', 'sender_id', 'sender', 'text', 'created_at')
+
+    def __init__(self, id, conversation_id, sender_id, text, created_at):
+        self.id = id
+        self.conversation_id = conversation_id
+        self.sender_id = sender_id
+        self.sender = None
+        self.text = text
+        self.created_at = created_at
+
+
+def _dump(rows):
+    return zlib.compress(json.dumps(rows, separators=(',', ':')).encode())
+
+
+def _load(segment):
+    # Postgres hands BinaryField values back as memoryview
+    return json.loads(zlib.decompress(bytes(segment.data)))
+
+
+def decode_segment(segment):
+    return [
+        ArchivedMessage(id, segment.conversation_id, sender_id, text, parse_datetime(created_at))
+        for id, sender_id, text, created_at in _load(segment)
+    ]
+
+
+def _attach_senders(messages):
+    users = User.objects.only('id', 'username').in_bulk({m.sender_id for m in messages})
+    for message in messages:
+        message.sender = users.get(message.sender_id)
+    # Deleting a user removes their hot messages, so drop their archived ones too
+    return [m for m in messages if m.sender is not None]
+
+
+class ArchivedHistory:
+    """Reads one chat's archived messages around a message id"""
+
+    def __init__(self, chat):
+        self.chat = chat
+        self.segments = MessageSegment.objects.filter(conversation=chat)
+
+    def before(self, bound, count):
+        """Up to ``count`` messages older than ``bound`` (all when None), newest first"""
+        segments = self.segments.order_by('-last_message_id')
+        if bound:
+            segments = segments.filter(first_message_id__lt=bound)
+        messages = []
+        for segment in segments.iterator(chunk_size=4):
+            messages.extend(m for m in reversed(decode_segment(segment)) if not bound or m.id < bound)
+            if len(messages) >= count:
+                break
+        return _attach_senders(messages[:count])
+
+    def after(self, bound, count):
+        """Up to ``count`` messages newer than ``bound``, oldest first"""
+        if bound >= self.chat.archived_until_id:
+            return []
+        messages = []
+        segments = self.segments.filter(last_message_id__gt=bound).order_by('last_message_id')
+        for segment in segments.iterator(chunk_size=4):
+            messages.extend(m for m in decode_segment(segment) if m.id > bound)
+            if len(messages) >= count:
+                break
+        return _attach_senders(messages[:count])
+
+    def has_at_or_before(self, message_id):
+        return self.segments.filter(first_message_id__lte=message_id).exists()
+
+    def has_at_or_after(self, message_id):
+        return message_id <= self.chat.archived_until_id and self.segments.filter(
+            last_message_id__gte=message_id
+        ).exists()
+
+
+def archived_history(chat):
+    """The chat's archive reader, or None when nothing was archived yet"""
+    if not chat.archived_until_id:
+        return None
+    return ArchivedHistory(chat)
+
+
+def archive_policy(**overrides):
+    policy = {**DEFAULT_ARCHIVE_POLICY, **getattr(settings, 'CHAT_ARCHIVE', {})}
+    policy.update({key: value for key, value in overrides.items() if value is not None})
+    return policy
+
+
+def archive_chat(chat_id, cutoff, segment_size):
+    """
+    Move a chat's messages created before ``cutoff`` into segments, topping
+    up the newest segment first. Messages a participant has not read yet
+    stay hot, with everything after them. Returns the number of messages
+    moved.
+    """
+    with transaction.atomic():
+        chat = Conversation.objects.select_for_update().get(pk=chat_id)
+        hot = Message.objects.filter(conversation=chat)
+        if chat.last_message_id:
+            # The newest message stays hot so the inbox keeps its pointer
+            hot = hot.filter(id__lt=chat.last_message_id)
+        # Unread counts are taken from hot messages, so stop before the first
+        # message its recipient has not read yet
+        first_unread = hot.filter(
+            Q(sender_id=chat.participant1_id, id__gt=chat.participant2_last_read_id)
+            | Q(sender_id=chat.participant2_id, id__gt=chat.participant1_last_read_id)
+        ).aggregate(first=Min('id'))['first']
+        if first_unread is not None:
+            hot = hot.filter(id__lt=first_unread)
+        boundary = hot.filter(created_at__lt=cutoff).aggregate(boundary=Max('id'))['boundary']
+        if boundary is None:
+            return 0
+
+        # Always archive a contiguous prefix so archived ids stay below hot ids
+        hot = hot.filter(id__lte=boundary).order_by('id')
+        tail = MessageSegment.objects.filter(conversation=chat).order_by('-last_message_id').first()
+        if tail and tail.message_count >= segment_size:
+            tail = None
+
+        moved = 0
+        while True:
+            room = segment_size - (tail.message_count if tail else 0)
+            rows = list(hot.values('id', 'sender_id', 'text', 'created_at')[:room])
+            if not rows:
+                break
+            payload = (_load(tail) if tail else []) + [
+                [row['id'], row['sender_id'], row['text'], row['created_at'].isoformat()] for row in rows
+            ]
+            segment = tail or MessageSegment(
+                conversation=chat,
+                first_message_id=rows[0]['id'],
+                first_created_at=rows[0]['created_at'],
+            )
+            segment.last_message_id = rows[-1]['id']
+            segment.last_created_at = rows[-1]['created_at']
+            segment.message_count = len(payload)
+            segment.data = _dump(payload)
+            segment.save()
+
+            Message.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            moved += len(rows)
+            tail = None
+
+        Conversation.objects.filter(pk=chat.pk).update(archived_until_id=boundary)
+    return moved
+
+
+def archive_chats(age_days=None, closed_age_days=None, segment_size=None, on_chat=None):
+    """
+    Archive every chat's history past the policy age; chats on inactive jobs
+    and resolved issues use ``closed_age_days``. Each chat is archived in its
+    own transaction. Returns the total number of messages moved.
+    """
+    policy = archive_policy(age_days=age_days, closed_age_days=closed_age_days, segment_size=segment_size)
+    now = timezone.now()
+    age_cutoff = now - timedelta(days=policy['age_days'])
+    closed_cutoff = now - timedelta(days=policy['closed_age_days'])
+
+    total = 0
+    closed = closed_chats()
+    # A chat can only hold messages older than the cutoff if it is older itself
+    chats = Conversation.objects.filter(
+        Q(created_at__lt=age_cutoff) | (closed & Q(created_at__lt=closed_cutoff))
+    ).annotate(is_closed=Q(closed)).values_list('id', 'object_type', 'is_closed').order_by('id')
+    for chat_id, object_type, is_closed in chats.iterator():
+        cutoff = max(age_cutoff, closed_cutoff) if is_closed else age_cutoff
+        moved = archive_chat(chat_id, cutoff, policy['segment_size'])
+        total += moved
+        if moved and on_chat:
+            on_chat(object_type, chat_id, moved)
+    return total
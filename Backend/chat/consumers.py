@@ -0,0 +1,97 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.contrib.auth import get_user_model
+from backend.db_router import pin_to_primary
+from .models import Conversation, pair_key
+from .services import chat_group_name, open_conversation, send_private_message, subject_owner_id
+
+User = get_user_model()
+
+
+class PrivateChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket endpoint for one private chat. The chat is resolved exactly like
+    the REST views do: by the job/issue in the URL plus an optional
+    ``?user_id=`` for the creator picking who to talk to.
+
+    The socket joins the group of the chat's pair key, so it can connect
+    before the chat exists; the first message received creates it. Messages
+    are persisted and fanned out through the channel layer group, so every
+    worker process holding a socket for the same chat delivers them.
+    """
+    object_type = None
+
+    async def connect(self):
+        self.user = self.scope.get("user")
+        if self.user is None or not self.user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.other_user_id = await self.get_other_user_id()
+        if self.other_user_id is None:
+            await self.close(code=4404)
+            return
+
+        self.object_id = self.scope["url_route"]["kwargs"]["object_id"]
+        self.chat = None
+        self.group_name = chat_group_name(pair_key(self.object_type, self.object_id, self.user.id, self.other_user_id))
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        text = (content.get("text") or "").strip()
+        if not text:
+            await self.send_json({"error": "Message text is required"})
+            return
+        await self.save_message(text)
+
+    async def chat_message(self, event):
+        message = event["message"]
+        await self.send_json({
+            **message,
+            "is_sender": message["sender_id"] == self.user.id,
+        })
+
+    @database_sync_to_async
+    def get_other_user_id(self):
+        owner_id = subject_owner_id(self.object_type, self.scope["url_route"]["kwargs"]["object_id"])
+        if owner_id is None:
+            return None
+
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        other_user_id = query.get("user_id", [None])[0]
+        if other_user_id:
+            try:
+                other_user_id = User.objects.filter(id=other_user_id).values_list("id", flat=True).first()
+            except ValueError:
+                return None
+        else:
+            other_user_id = owner_id
+
+        # Nobody chats with themselves
+        if other_user_id == self.user.id:
+            return None
+        return other_user_id
+
+    @database_sync_to_async
+    def save_message(self, text):
+        if self.chat is None:
+            self.chat = open_conversation(self.object_type, self.object_id, self.user.id, self.other_user_id)
+        message = send_private_message(self.chat, self.user, text)
+        # No request middleware here: keep the sender's next reads on the primary
+        pin_to_primary(self.user.id)
+        return message
+
+
+class JobChatConsumer(PrivateChatConsumer):
+    object_type = Conversation.JOB
+
+
+class IssueChatConsumer(PrivateChatConsumer):
+    object_type = Conversation.ISSUE
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from chat.archive import archive_chats
+
+
+class Command(BaseCommand):
+    help = "Move old chat messages into compressed archive segments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--age-days", type=int, help="Archive messages older than this many days")
+        parser.add_argument(
+            "--closed-age-days", type=int,
+            help="Age limit for chats on inactive jobs and resolved issues",
+        )
+        parser.add_argument("--segment-size", type=int, help="Messages per archive segment")
+
+    def handle(self, *args, **options):
+        def on_chat(object_type, chat_id, moved):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {object_type} chat {chat_id}: archived {moved}")
+
+        total = archive_chats(
+            age_days=options["age_days"],
+            closed_age_days=options["closed_age_days"],
+            segment_size=options["segment_size"],
+            on_chat=on_chat,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} messages"))
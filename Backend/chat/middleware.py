@@ -0,0 +1,34 @@
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+from users.authentication import user_for_access_token
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    """Resolve the user behind a SimpleJWT access token, or AnonymousUser"""
+    return user_for_access_token(raw_token) or AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket connections with the same access tokens the REST
+    API uses. Browsers cannot set headers on a WebSocket handshake, so the
+    token is passed as ``?token=<access>`` in the query string.
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        raw_token = query.get("token", [None])[0]
+        if raw_token:
+            scope = dict(scope, user=await get_user_for_token(raw_token))
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    """Session auth first (admin, browsable API), then JWT from the query string"""
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_remove_issuemessage_room_remove_issuemessage_sender_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issueprivatemessage',
+            index=models.Index(fields=['chat', 'id'], name='issue_msg_chat_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobprivatemessage',
+            index=models.Index(fields=['chat', 'id'], name='job_msg_chat_id_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_last_message(apps, schema_editor):
+    """Point every chat at its newest message and mark existing history as read"""
+    for chat_name, message_name in [
+        ('JobPrivateChat', 'JobPrivateMessage'),
+        ('IssuePrivateChat', 'IssuePrivateMessage'),
+    ]:
+        Chat = apps.get_model('chat', chat_name)
+        Message = apps.get_model('chat', message_name)
+        latest = (
+            Message.objects.filter(chat=models.OuterRef('pk'))
+            .order_by('-id')
+        )
+        Chat.objects.update(
+            last_message_id=models.Subquery(latest.values('id')[:1]),
+            last_message_at=models.Subquery(latest.values('created_at')[:1]),
+        )
+        Chat.objects.filter(last_message__isnull=False).update(
+            participant1_last_read_id=models.F('last_message_id'),
+            participant2_last_read_id=models.F('last_message_id'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0006_message_chat_id_index'),
+        ('issues', '0003_created_at_index'),
+        ('jobs', '0003_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issueprivatechat',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.issueprivatemessage'),
+        ),
+        migrations.AddField(
+            model_name='issueprivatechat',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='issueprivatechat',
+            name='participant1_last_read_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='issueprivatechat',
+            name='participant2_last_read_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobprivatechat',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.jobprivatemessage'),
+        ),
+        migrations.AddField(
+            model_name='jobprivatechat',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobprivatechat',
+            name='participant1_last_read_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobprivatechat',
+            name='participant2_last_read_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='issueprivatechat',
+            index=models.Index(fields=['participant1', '-last_message_at'], name='issue_chat_p1_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issueprivatechat',
+            index=models.Index(fields=['participant2', '-last_message_at'], name='issue_chat_p2_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobprivatechat',
+            index=models.Index(fields=['participant1', '-last_message_at'], name='job_chat_p1_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobprivatechat',
+            index=models.Index(fields=['participant2', '-last_message_at'], name='job_chat_p2_activity_idx'),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,132 @@
+"""
+Copy job and issue private chats into the unified conversation tables.
+
+Job message ids are kept as they are. Issue message ids are shifted past the
+highest job message id, together with everything that refers to them (read
+markers, archive boundaries and the ids stored inside archive segments), so
+both histories share one id space without reordering anything within a
+chat. Chats that never received a message were only ever created by
+someone opening the chat window and are not copied.
+"""
+import json
+import zlib
+
+from django.core.management.color import no_style
+from django.db import migrations
+from django.db.models import Exists, Max, OuterRef, Q, Subquery
+
+BATCH_SIZE = 2000
+
+
+def shift_segment(data, offset):
+    rows = json.loads(zlib.decompress(bytes(data)))
+    return zlib.compress(json.dumps([[row[0] + offset, *row[1:]] for row in rows], separators=(',', ':')).encode())
+
+
+def shift(message_id, offset):
+    return message_id + offset if message_id else 0
+
+
+def copy_chat_type(apps, object_type, offset):
+    prefix = 'Job' if object_type == 'job' else 'Issue'
+    chat_model = apps.get_model('chat', f'{prefix}PrivateChat')
+    message_model = apps.get_model('chat', f'{prefix}PrivateMessage')
+    segment_model = apps.get_model('chat', f'{prefix}MessageSegment')
+    Conversation = apps.get_model('chat', 'Conversation')
+    Message = apps.get_model('chat', 'Message')
+    MessageSegment = apps.get_model('chat', 'MessageSegment')
+
+    chats = chat_model.objects.filter(
+        Q(Exists(message_model.objects.filter(chat=OuterRef('pk'))))
+        | Q(Exists(segment_model.objects.filter(chat=OuterRef('pk'))))
+    ).order_by('id')
+
+    conversation_ids = {}
+    batch = []
+
+    def flush_conversations():
+        created = Conversation.objects.bulk_create([conversation for _, conversation in batch])
+        conversation_ids.update((chat_id, conversation.id) for (chat_id, _), conversation in zip(batch, created))
+        batch.clear()
+
+    for chat in chats.iterator(chunk_size=BATCH_SIZE):
+        object_id = getattr(chat, f'{object_type}_id')
+        low, high = sorted([chat.participant1_id, chat.participant2_id])
+        batch.append((chat.id, Conversation(
+            object_type=object_type,
+            object_id=object_id,
+            participant1_id=chat.participant1_id,
+            participant2_id=chat.participant2_id,
+            pair_key=f"{object_type}-{object_id}-{low}-{high}",
+            last_message_id=shift(chat.last_message_id, offset) or None,
+            last_message_at=chat.last_message_at,
+            participant1_last_read_id=shift(chat.participant1_last_read_id, offset),
+            participant2_last_read_id=shift(chat.participant2_last_read_id, offset),
+            archived_until_id=shift(chat.archived_until_id, offset),
+        )))
+        if len(batch) >= BATCH_SIZE:
+            flush_conversations()
+    if batch:
+        flush_conversations()
+
+    messages = []
+    for row in message_model.objects.order_by('id').values('id', 'chat_id', 'sender_id', 'text').iterator(chunk_size=BATCH_SIZE):
+        messages.append(Message(
+            id=row['id'] + offset,
+            conversation_id=conversation_ids[row['chat_id']],
+            sender_id=row['sender_id'],
+            text=row['text'],
+        ))
+        if len(messages) >= BATCH_SIZE:
+            Message.objects.bulk_create(messages)
+            messages = []
+    Message.objects.bulk_create(messages)
+
+    for segment in segment_model.objects.order_by('id').iterator(chunk_size=100):
+        MessageSegment.objects.create(
+            conversation_id=conversation_ids[segment.chat_id],
+            first_message_id=segment.first_message_id + offset,
+            last_message_id=segment.last_message_id + offset,
+            message_count=segment.message_count,
+            first_created_at=segment.first_created_at,
+            last_created_at=segment.last_created_at,
+            data=shift_segment(segment.data, offset) if offset else segment.data,
+        )
+
+    # auto_now_add stamped the copies with the migration time: write the
+    # original timestamps back from the rows they were copied from
+    Conversation.objects.filter(object_type=object_type).update(created_at=Subquery(
+        chat_model.objects.filter(**{
+            f'{object_type}_id': OuterRef('object_id'),
+            'participant1_id': OuterRef('participant1_id'),
+            'participant2_id': OuterRef('participant2_id'),
+        }).values('created_at')
+    ))
+    Message.objects.filter(conversation__object_type=object_type).update(created_at=Subquery(
+        message_model.objects.filter(id=OuterRef('id') - offset).values('created_at')
+    ))
+
+
+def copy_private_chats(apps, schema_editor):
+    Message = apps.get_model('chat', 'Message')
+    job_messages = apps.get_model('chat', 'JobPrivateMessage').objects.aggregate(high=Max('id'))['high']
+    job_segments = apps.get_model('chat', 'JobMessageSegment').objects.aggregate(high=Max('last_message_id'))['high']
+    copy_chat_type(apps, 'job', 0)
+    copy_chat_type(apps, 'issue', max(job_messages or 0, job_segments or 0))
+
+    # Message ids were inserted explicitly, so move the sequence past them
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Message]):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0009_conversation'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_private_chats, migrations.RunPython.noop),
+    ]
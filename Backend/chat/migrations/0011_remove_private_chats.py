@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0010_copy_private_chats'),
+    ]
+
+    operations = [
+        # Break the chat <-> message cycle before dropping the tables
+        migrations.RemoveField(
+            model_name='jobprivatechat',
+            name='last_message',
+        ),
+        migrations.RemoveField(
+            model_name='issueprivatechat',
+            name='last_message',
+        ),
+        migrations.DeleteModel(
+            name='JobMessageSegment',
+        ),
+        migrations.DeleteModel(
+            name='IssueMessageSegment',
+        ),
+        migrations.DeleteModel(
+            name='JobPrivateMessage',
+        ),
+        migrations.DeleteModel(
+            name='IssuePrivateMessage',
+        ),
+        migrations.DeleteModel(
+            name='JobPrivateChat',
+        ),
+        migrations.DeleteModel(
+            name='IssuePrivateChat',
+        ),
+    ]
@@ -1,69 +1,107 @@
 # chat/models.py
 from django.db import models
 from django.conf import settings
-from jobs.models import Job
-from issues.models import Issue
 
 User = settings.AUTH_USER_MODEL
 
-# Private Chat Models
-class JobPrivateChat(models.Model):
-    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="private_chats")
-    participant1 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="job_private_chats_as_p1")
-    participant2 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="job_private_chats_as_p2")
-    created_at = models.DateTimeField(auto_now_add=True)
+OBJECT_TYPE_LENGTH = 10
+# Longest pair_key(): an object type, then three 64-bit ids after dashes
+PAIR_KEY_LENGTH = OBJECT_TYPE_LENGTH + 3 * len(f"-{2 ** 63 - 1}")
 
-    class Meta:
-        unique_together = ['job', 'participant1', 'participant2']
 
-    def __str__(self):
-        return f"Private Job Chat: {self.job.title} ({self.participant1} ↔ {self.participant2})"
-
-    def get_other_participant(self, user):
-        """Get the other participant in this chat"""
-        return self.participant2 if self.participant1 == user else self.participant1
+def pair_key(object_type, object_id, user_a_id, user_b_id):
+    """
+    Canonical key of the private conversation between two users about one
+    job or issue. Participants are ordered by id, so both sides derive the
+    same key and it doubles as the chat's channel layer group suffix.
+    """
+    low, high = sorted([user_a_id, user_b_id])
+    return f"{object_type}-{object_id}-{low}-{high}"
 
 
-class IssuePrivateChat(models.Model):
-    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="private_chats")
-    participant1 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="issue_private_chats_as_p1")
-    participant2 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="issue_private_chats_as_p2")
+# Private Chat Models
+class Conversation(models.Model):
+    """
+    A private chat between two users about a job or an issue. Rows are only
+    created when the first message is sent; reading a conversation that does
+    not exist yet is simply an empty history.
+    """
+    JOB = 'job'
+    ISSUE = 'issue'
+    OBJECT_TYPES = [(JOB, 'Job'), (ISSUE, 'Issue')]
+
+    object_type = models.CharField(max_length=OBJECT_TYPE_LENGTH, choices=OBJECT_TYPES)
+    object_id = models.PositiveBigIntegerField()
+    participant1 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="conversations_as_p1")
+    participant2 = models.ForeignKey(User, on_delete=models.CASCADE, related_name="conversations_as_p2")
+    # See pair_key(); unique so concurrent first messages end up in one row
+    pair_key = models.CharField(max_length=PAIR_KEY_LENGTH, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized so the inbox can list chats without per-chat lookups
+    last_message = models.ForeignKey("Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    # Id of the newest message each participant has seen, for unread counts
+    participant1_last_read_id = models.BigIntegerField(default=0)
+    participant2_last_read_id = models.BigIntegerField(default=0)
+    # Messages with ids up to here live in compressed archive segments
+    archived_until_id = models.BigIntegerField(default=0)
+
     class Meta:
-        unique_together = ['issue', 'participant1', 'participant2']
+        indexes = [
+            models.Index(fields=['participant1', '-last_message_at'], name='chat_p1_activity_idx'),
+            models.Index(fields=['participant2', '-last_message_at'], name='chat_p2_activity_idx'),
+            models.Index(fields=['object_type', 'object_id'], name='chat_object_idx'),
+        ]
 
     def __str__(self):
-        return f"Private Issue Chat: {self.issue.title} ({self.participant1} ↔ {self.participant2})"
+        return f"Private {self.get_object_type_display()} Chat #{self.object_id} ({self.participant1} ↔ {self.participant2})"
 
     def get_other_participant(self, user):
         """Get the other participant in this chat"""
-        return self.participant2 if self.participant1 == user else self.participant1
+        return self.participant2 if self.participant1_id == user.id else self.participant1
 
+    def last_read_field(self, user):
+        """Name of the read-marker column belonging to ``user``"""
+        return 'participant1_last_read_id' if self.participant1_id == user.id else 'participant2_last_read_id'
 
-class JobPrivateMessage(models.Model):
-    chat = models.ForeignKey(JobPrivateChat, on_delete=models.CASCADE, related_name="messages")
+
+class Message(models.Model):
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(User, on_delete=models.CASCADE)
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Backs before=/after= windowing over a chat's history
+            models.Index(fields=['conversation', 'id'], name='chat_msg_conversation_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.sender} → {self.text[:20]}"
 
 
-class IssuePrivateMessage(models.Model):
-    chat = models.ForeignKey(IssuePrivateChat, on_delete=models.CASCADE, related_name="messages")
-    sender = models.ForeignKey(User, on_delete=models.CASCADE)
-    text = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+# Cold storage for old chat history
+class MessageSegment(models.Model):
+    """
+    A contiguous run of archived messages from one chat, stored as
+    zlib-compressed JSON. Segments of a chat never overlap and always hold
+    older ids than the chat's hot messages.
+    """
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="archive_segments")
+    first_message_id = models.BigIntegerField()
+    last_message_id = models.BigIntegerField()
+    message_count = models.PositiveIntegerField()
+    first_created_at = models.DateTimeField()
+    last_created_at = models.DateTimeField()
+    data = models.BinaryField()
 
     class Meta:
-        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'last_message_id'], name='chat_segment_last_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.sender} → {self.text[:20]}"
-
-
+        return f"Chat {self.conversation_id}: messages {self.first_message_id}-{self.last_message_id}"
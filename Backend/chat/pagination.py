@@ -0,0 +1,91 @@
+import base64
+import json
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+INBOX_PAGE_SIZE = 20
+INBOX_MAX_PAGE_SIZE = 100
+
+
+def _int_param(params, name, default=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: 'Must be an integer.'})
+    if value < 1:
+        raise ValidationError({name: 'Must be a positive integer.'})
+    return value
+
+
+def window_messages(queryset, params, archive=None):
+    """
+    Return a bounded window of a chat's messages plus has-more flags.
+
+    ``?after=<id>`` fetches messages newer than ``id`` (catching up),
+    ``?before=<id>`` fetches messages older than ``id`` (scrolling back) and
+    with neither the newest page is returned. ``?limit=`` sets the page size,
+    capped at MAX_PAGE_SIZE. Every query is a range scan on (chat_id, id).
+    The window is always returned oldest first.
+
+    ``archive`` is the chat's ArchivedHistory, if any. Archived messages are
+    all older than the hot ones, so a window that runs past the oldest hot
+    message continues into the archive.
+    """
+    before = _int_param(params, 'before')
+    after = _int_param(params, 'after')
+    if before and after:
+        raise ValidationError({'detail': "Use either 'before' or 'after', not both."})
+    limit = min(_int_param(params, 'limit', DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+
+    if after:
+        window = archive.after(after, limit + 1) if archive else []
+        if len(window) <= limit:
+            window += list(queryset.filter(id__gt=after).order_by('id')[:limit + 1 - len(window)])
+        has_more_after = len(window) > limit
+        window = window[:limit]
+        has_more_before = queryset.filter(id__lte=after).exists() or bool(
+            archive and archive.has_at_or_before(after)
+        )
+    else:
+        newest_first = queryset.order_by('-id')
+        if before:
+            newest_first = newest_first.filter(id__lt=before)
+        window = list(newest_first[:limit + 1])
+        if archive and len(window) <= limit:
+            window += archive.before(before, limit + 1 - len(window))
+        has_more_before = len(window) > limit
+        window = window[:limit][::-1]
+        has_more_after = bool(before) and (
+            queryset.filter(id__gte=before).exists() or bool(archive and archive.has_at_or_after(before))
+        )
+
+    return window, has_more_before, has_more_after
+
+
+def encode_inbox_cursor(entry):
+    """Opaque cursor pointing just past an inbox entry"""
+    position = [entry['last_activity'], entry['chat_id']]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_inbox_cursor(cursor):
+    """Return (last_activity, chat_id) from an inbox cursor"""
+    try:
+        last_activity, chat_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        last_activity = parse_datetime(last_activity)
+        if last_activity is None:
+            raise ValueError
+        return last_activity, int(chat_id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
+def inbox_page_size(params):
+    return min(_int_param(params, 'page_size', INBOX_PAGE_SIZE), INBOX_MAX_PAGE_SIZE)
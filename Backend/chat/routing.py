@@ -0,0 +1,7 @@
+from django.urls import path
+from .consumers import JobChatConsumer, IssueChatConsumer
+
+websocket_urlpatterns = [
+    path("ws/chat/job/<int:object_id>/", JobChatConsumer.as_asgi()),
+    path("ws/chat/issue/<int:object_id>/", IssueChatConsumer.as_asgi()),
+]
@@ -1,18 +1,10 @@
 from rest_framework import serializers
-from .models import JobPrivateMessage, IssuePrivateMessage
+from .models import Message
 
 
-class JobPrivateMessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(serializers.ModelSerializer):
     sender = serializers.StringRelatedField(read_only=True)
 
     class Meta:
-        model = JobPrivateMessage
-        fields = ["id", "chat", "sender", "text", "created_at"]
-
-
-class IssuePrivateMessageSerializer(serializers.ModelSerializer):
-    sender = serializers.StringRelatedField(read_only=True)
-
-    class Meta:
-        model = IssuePrivateMessage
-        fields = ["id", "chat", "sender", "text", "created_at"]
+        model = Message
+        fields = ["id", "conversation", "sender", "text", "created_at"]
@@ -0,0 +1,119 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db.models import Q
+
+from issues.models import Issue
+from jobs.models import Job
+from notifications.dispatcher import enqueue_notification
+from .models import Conversation, Message, pair_key
+
+logger = logging.getLogger(__name__)
+
+# What a chat can be about, and which column holds its creator
+CHAT_SUBJECTS = {
+    Conversation.JOB: (Job, 'created_by_id'),
+    Conversation.ISSUE: (Issue, 'user_id'),
+}
+
+
+def chat_group_name(key):
+    """Channel layer group that every socket attached to a chat joins"""
+    return f"chat_{key}"
+
+
+def subject_owner_id(object_type, object_id):
+    """Creator of the job or issue a chat is about, or None if it does not exist"""
+    model, owner_field = CHAT_SUBJECTS[object_type]
+    return model.objects.filter(id=object_id).values_list(owner_field, flat=True).first()
+
+
+def find_conversation(object_type, object_id, user_id, other_user_id):
+    """The existing conversation between two users about an object, or None"""
+    return Conversation.objects.filter(
+        pair_key=pair_key(object_type, object_id, user_id, other_user_id)
+    ).first()
+
+
+def open_conversation(object_type, object_id, user_id, other_user_id):
+    """
+    Fetch or create the conversation between two users about an object.
+    Only the send path calls this; the unique pair key makes concurrent
+    first messages converge on a single row.
+    """
+    low, high = sorted([user_id, other_user_id])
+    conversation, _ = Conversation.objects.get_or_create(
+        pair_key=pair_key(object_type, object_id, low, high),
+        defaults={
+            'object_type': object_type,
+            'object_id': object_id,
+            'participant1_id': low,
+            'participant2_id': high,
+        },
+    )
+    return conversation
+
+
+def serialize_message(message):
+    """Wire format shared by the REST views and the WebSocket consumer"""
+    return {
+        'id': message.id,
+        'text': message.text,
+        'sender': message.sender.username,
+        'sender_id': message.sender_id,
+        'created_at': message.created_at.isoformat(),
+    }
+
+
+def send_private_message(chat, sender, text):
+    """
+    Persist a message in a private chat, notify the other participant and
+    fan the message out to every socket connected to the chat.
+    """
+    message = Message.objects.create(conversation=chat, sender=sender, text=text)
+
+    # Keep the inbox pointer current; a concurrent send that committed a
+    # newer message first must not be overwritten
+    Conversation.objects.filter(
+        Q(last_message__isnull=True) | Q(last_message_id__lt=message.id), pk=chat.pk,
+    ).update(last_message=message, last_message_at=message.created_at)
+    # The sender has implicitly read the chat
+    mark_chat_read(chat, sender, message.id)
+
+    # Queue a notification for the other participant only; the dispatcher
+    # builds and stores it off the request path
+    recipient_id = chat.participant2_id if chat.participant1_id == sender.id else chat.participant1_id
+    enqueue_notification(
+        recipient_id=recipient_id,
+        sender_id=sender.id,
+        notification_type=f'{chat.object_type}_message',
+        **{f'{chat.object_type}_id': chat.object_id},
+        preview=message.text[:50],
+    )
+
+    broadcast_message(chat.pair_key, serialize_message(message))
+    return message
+
+
+def mark_chat_read(chat, user, message_id):
+    """Advance ``user``'s read marker in ``chat`` up to ``message_id``"""
+    field = chat.last_read_field(user)
+    Conversation.objects.filter(pk=chat.pk, **{f'{field}__lt': message_id}).update(**{field: message_id})
+
+
+def broadcast_message(key, payload):
+    """
+    Push a serialized message to the chat's group. A missing or unreachable
+    channel layer must never fail the write, so errors are only logged.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            chat_group_name(key),
+            {"type": "chat.message", "message": payload},
+        )
+    except Exception:
+        logger.exception("Could not broadcast message to chat %s", key)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete
+
+from issues.models import Issue
+from jobs.models import Job
+
+from .models import Conversation
+
+
+def delete_conversations(sender, instance, **kwargs):
+    # Conversations point at their job or issue by type and id rather than a
+    # foreign key, so nothing cascades to them on its own
+    object_type = Conversation.JOB if sender is Job else Conversation.ISSUE
+    Conversation.objects.filter(object_type=object_type, object_id=instance.pk).delete()
+
+
+post_delete.connect(delete_conversations, sender=Job, dispatch_uid='chat_job_conversations')
+post_delete.connect(delete_conversations, sender=Issue, dispatch_uid='chat_issue_conversations')
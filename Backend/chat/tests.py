@@ -0,0 +1,321 @@
+from datetime import timedelta
+from unittest import mock
+
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from issues.models import Issue
+from jobs.models import Job, ServiceCategory
+from users.models import User
+from .archive import archive_chat
+from .middleware import JWTAuthMiddlewareStack
+from .models import Conversation, Message, MessageSegment, pair_key
+from .routing import websocket_urlpatterns
+from .services import chat_group_name, mark_chat_read, open_conversation, send_private_message
+
+application = JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class PrivateChatConsumerTests(TransactionTestCase):
+    """The consumer reads the database from worker threads, hence TransactionTestCase"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.worker = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        category = ServiceCategory.objects.create(name='Plumbing')
+        self.job = Job.objects.create(
+            title='Leaking tap', description='Kitchen', category=category, created_by=self.owner, salary='5000',
+        )
+
+    def communicator(self, user=None, job_id=None, query=''):
+        params = [query] if query else []
+        if user is not None:
+            params.append(f'token={AccessToken.for_user(user)}')
+        path = f'/ws/chat/job/{job_id or self.job.id}/'
+        if params:
+            path += '?' + '&'.join(params)
+        return WebsocketCommunicator(application, path)
+
+    async def test_rejects_anonymous_connections(self):
+        communicator = self.communicator()
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_rejects_invalid_tokens(self):
+        communicator = WebsocketCommunicator(application, f'/ws/chat/job/{self.job.id}/?token=garbage')
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_rejects_unknown_jobs(self):
+        communicator = self.communicator(self.worker, job_id=self.job.id + 1000)
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4404)
+
+    async def test_message_reaches_both_participants(self):
+        worker = self.communicator(self.worker)
+        owner = self.communicator(self.owner, query=f'user_id={self.worker.id}')
+        self.assertTrue((await worker.connect())[0])
+        self.assertTrue((await owner.connect())[0])
+
+        # The first message creates the conversation
+        await worker.send_json_to({'text': 'Can I come tomorrow?'})
+        sent = await worker.receive_json_from(timeout=2)
+        received = await owner.receive_json_from(timeout=2)
+        self.assertEqual(sent['text'], 'Can I come tomorrow?')
+        self.assertTrue(sent['is_sender'])
+        self.assertEqual(received['sender_id'], self.worker.id)
+        self.assertFalse(received['is_sender'])
+
+        conversation = await database_sync_to_async(Conversation.objects.get)()
+        self.assertEqual({conversation.participant1_id, conversation.participant2_id}, {self.owner.id, self.worker.id})
+        self.assertEqual(await database_sync_to_async(Message.objects.count)(), 1)
+
+        await worker.disconnect()
+        await owner.disconnect()
+
+    async def test_rest_sends_are_broadcast(self):
+        worker = self.communicator(self.worker)
+        self.assertTrue((await worker.connect())[0])
+
+        @database_sync_to_async
+        def send_from_owner():
+            conversation = open_conversation(Conversation.JOB, self.job.id, self.owner.id, self.worker.id)
+            return send_private_message(conversation, self.owner, 'Yes, after 9')
+
+        message = await send_from_owner()
+        received = await worker.receive_json_from(timeout=2)
+        self.assertEqual(received['id'], message.id)
+        self.assertEqual(received['text'], 'Yes, after 9')
+        self.assertFalse(received['is_sender'])
+        await worker.disconnect()
+
+    async def test_empty_messages_are_refused(self):
+        worker = self.communicator(self.worker)
+        self.assertTrue((await worker.connect())[0])
+        await worker.send_json_to({'text': '  '})
+        self.assertEqual(await worker.receive_json_from(timeout=2), {'error': 'Message text is required'})
+        self.assertEqual(await database_sync_to_async(Message.objects.count)(), 0)
+        await worker.disconnect()
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class ChatArchiveTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.worker = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        category = ServiceCategory.objects.create(name='Plumbing')
+        self.job = Job.objects.create(title='Leaking tap', description='', category=category, created_by=self.owner)
+        self.chat = open_conversation(Conversation.JOB, self.job.id, self.worker.id, self.owner.id)
+        self.client = APIClient()
+        self.client.force_authenticate(self.worker)
+
+    def send(self, sender, text):
+        message = send_private_message(self.chat, sender, text)
+        # Old enough for any archive cutoff
+        Message.objects.filter(pk=message.pk).update(created_at=timezone.now() - timedelta(days=400))
+        return message.id
+
+    def converse(self, count):
+        ids = [self.send(self.worker if i % 2 else self.owner, f'message {i}') for i in range(count)]
+        for user in (self.owner, self.worker):
+            mark_chat_read(self.chat, user, ids[-1])
+        return ids
+
+    def archive(self, segment_size=3):
+        moved = archive_chat(self.chat.id, timezone.now(), segment_size)
+        self.chat.refresh_from_db()
+        return moved
+
+    def window(self, **params):
+        response = self.client.get(f'/api/chat/job/{self.job.id}/messages/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_newest_message_stays_hot(self):
+        ids = self.converse(7)
+        self.assertEqual(self.archive(), 6)
+        self.assertEqual(list(Message.objects.values_list('id', flat=True)), [ids[-1]])
+        self.assertEqual(self.chat.last_message_id, ids[-1])
+        self.assertEqual(self.chat.archived_until_id, ids[-2])
+        self.assertEqual(list(MessageSegment.objects.order_by('id').values_list('message_count', flat=True)), [3, 3])
+        # Nothing left to move
+        self.assertEqual(self.archive(), 0)
+
+    def test_windows_page_across_the_archive(self):
+        ids = self.converse(7)
+        self.archive()
+
+        page = self.window(limit=2)
+        seen = [message['id'] for message in page['results']]
+        while page['has_more_before']:
+            page = self.window(limit=2, before=seen[0])
+            seen = [message['id'] for message in page['results']] + seen
+        self.assertEqual(seen, ids)
+
+        page = self.window(limit=2, after=ids[0])
+        seen = [message['id'] for message in page['results']]
+        self.assertTrue(page['has_more_before'])
+        while page['has_more_after']:
+            page = self.window(limit=2, after=seen[-1])
+            seen += [message['id'] for message in page['results']]
+        self.assertEqual(seen, ids[1:])
+
+        archived = self.window(limit=1, before=ids[1])['results'][0]
+        self.assertEqual((archived['text'], archived['sender']), ('message 0', 'owner'))
+        self.assertFalse(archived['is_sender'])
+
+    def test_unread_messages_stay_hot(self):
+        self.send(self.owner, 'hello')
+        read = self.send(self.worker, 'first')
+        mark_chat_read(self.chat, self.owner, read)
+        unread = [self.send(self.worker, 'second'), self.send(self.worker, 'third'), self.send(self.worker, 'fourth')]
+
+        self.assertEqual(self.archive(), 2)
+        self.assertEqual(list(Message.objects.values_list('id', flat=True)), unread)
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get('/api/chat/inbox/').json()['results'][0]['unread_count'], 3)
+
+        # Once read, they can go too (all but the newest)
+        mark_chat_read(self.chat, self.owner, unread[-1])
+        self.assertEqual(self.archive(), 2)
+        self.assertEqual(self.client.get('/api/chat/inbox/').json()['results'][0]['unread_count'], 0)
+
+
+class OpenConversationTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.worker = User.objects.create_user('worker', 'worker@example.com', 'pw')
+
+    def test_both_sides_open_the_same_conversation(self):
+        chat = open_conversation(Conversation.JOB, 7, self.worker.id, self.owner.id)
+        self.assertEqual(open_conversation(Conversation.JOB, 7, self.owner.id, self.worker.id), chat)
+        self.assertNotEqual(open_conversation(Conversation.ISSUE, 7, self.owner.id, self.worker.id), chat)
+        self.assertEqual(chat.pair_key, f'job-7-{self.owner.id}-{self.worker.id}')
+
+    def test_concurrent_first_sends_converge(self):
+        # The other sender's insert lands between our lookup and our insert
+        other = open_conversation(Conversation.JOB, 7, self.owner.id, self.worker.id)
+        get = QuerySet.get
+        lookups = []
+
+        def racing_get(queryset, *args, **kwargs):
+            lookups.append(kwargs)
+            if len(lookups) == 1:
+                raise Conversation.DoesNotExist
+            return get(queryset, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'get', racing_get):
+            chat = open_conversation(Conversation.JOB, 7, self.worker.id, self.owner.id)
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(chat, other)
+        self.assertEqual(Conversation.objects.count(), 1)
+
+    def test_pair_key_fits_the_largest_ids(self):
+        largest = 2 ** 63 - 1
+        key = pair_key(Conversation.ISSUE, largest, largest, largest - 1)
+        self.assertLessEqual(len(key), Conversation._meta.get_field('pair_key').max_length)
+        self.assertLessEqual(len(chat_group_name(key)), 100)
+
+
+class CopyPrivateChatsMigrationTests(TransactionTestCase):
+    before = [('chat', '0009_conversation')]
+    after = [('chat', '0010_copy_private_chats')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.addCleanup(self.migrate_to_latest)
+        self.old_apps = executor.loader.project_state(self.before).apps
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        return executor.loader.project_state(self.after).apps
+
+    def old_chat(self, prefix, subject, participants, messages, created_at):
+        Chat = self.old_apps.get_model('chat', f'{prefix}PrivateChat')
+        Message = self.old_apps.get_model('chat', f'{prefix}PrivateMessage')
+        chat = Chat.objects.create(
+            participant1_id=participants[0].id, participant2_id=participants[1].id, **{f'{prefix.lower()}_id': subject.id},
+        )
+        ids = []
+        for minutes, sender in enumerate(messages):
+            message = Message.objects.create(chat=chat, sender_id=sender.id, text=f'{prefix} {minutes}')
+            Message.objects.filter(pk=message.pk).update(created_at=created_at + timedelta(minutes=minutes))
+            ids.append(message.id)
+        Chat.objects.filter(pk=chat.pk).update(
+            created_at=created_at,
+            last_message_id=ids[-1] if ids else None,
+            participant1_last_read_id=ids[-1] if ids else 0,
+            participant2_last_read_id=ids[0] if ids else 0,
+        )
+        return ids
+
+    def test_copies_chats_with_their_timestamps(self):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        worker = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        job = Job.objects.create(
+            title='Leaking tap', description='', category=ServiceCategory.objects.create(name='Plumbing'),
+            created_by=owner,
+        )
+        issue = Issue.objects.create(user=owner, title='Broken window', description='')
+        started = timezone.now().replace(microsecond=0) - timedelta(days=30)
+        job_ids = self.old_chat('Job', job, (worker, owner), [worker, owner, worker], started)
+        issue_ids = self.old_chat('Issue', issue, (owner, worker), [owner, worker], started + timedelta(days=1))
+        self.old_chat('Job', job, (owner, worker), [], started)
+
+        apps = self.migrate()
+        Conversation = apps.get_model('chat', 'Conversation')
+        Message = apps.get_model('chat', 'Message')
+        # The chat nobody wrote in is not copied
+        self.assertEqual(Conversation.objects.count(), 2)
+
+        offset = job_ids[-1]
+        low, high = sorted([owner.id, worker.id])
+        job_chat = Conversation.objects.get(object_type='job')
+        self.assertEqual(
+            (job_chat.object_id, job_chat.pair_key, job_chat.created_at),
+            (job.id, f'job-{job.id}-{low}-{high}', started),
+        )
+        self.assertEqual(
+            (job_chat.last_message_id, job_chat.participant1_last_read_id, job_chat.participant2_last_read_id),
+            (job_ids[-1], job_ids[-1], job_ids[0]),
+        )
+        issue_chat = Conversation.objects.get(object_type='issue')
+        self.assertEqual(issue_chat.created_at, started + timedelta(days=1))
+        self.assertEqual(issue_chat.last_message_id, issue_ids[-1] + offset)
+
+        copied = list(Message.objects.order_by('id').values_list('id', 'conversation_id', 'text', 'created_at'))
+        self.assertEqual(copied, [
+            *[(id, job_chat.id, f'Job {i}', started + timedelta(minutes=i)) for i, id in enumerate(job_ids)],
+            *[
+                (id + offset, issue_chat.id, f'Issue {i}', started + timedelta(days=1, minutes=i))
+                for i, id in enumerate(issue_ids)
+            ],
+        ])
+        # New messages are numbered after the copied ones
+        message = Message.objects.create(conversation=job_chat, sender_id=owner.id, text='new')
+        self.assertGreater(message.id, issue_ids[-1] + offset)
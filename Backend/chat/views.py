@@ -1,345 +1,252 @@
-from rest_framework import generics, permissions, status
+from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.shortcuts import get_object_or_404
+from rest_framework.utils.urls import replace_query_param
+from django.http import Http404
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
-from jobs.models import Job
+from backend.conditional import make_etag, not_modified, set_validators
+from backend.db_router import ReplicaReadMixin
+from users.thumbnails import thumbnail_url
 
 User = get_user_model()
-from issues.models import Issue
-from .models import JobPrivateChat, JobPrivateMessage, IssuePrivateChat, IssuePrivateMessage
-from notifications.models import Notification
+from .models import Conversation, Message
+from .archive import archived_history
+from .pagination import decode_inbox_cursor, encode_inbox_cursor, inbox_page_size, window_messages
+from .services import (
+    CHAT_SUBJECTS, find_conversation, mark_chat_read, open_conversation, send_private_message,
+    serialize_message, subject_owner_id,
+)
 
 
-class JobChatMessagesView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
+class ConversationViewMixin:
+    """Works out which conversation a request about a job or issue refers to"""
+    object_type = None
 
-    def get(self, request, job_id):
-        """Get messages for a private job chat between current user and another user"""
-        job = get_object_or_404(Job, id=job_id)
-        current_user = request.user
-        job_creator = job.created_by
-        
-        # Get the other user ID from query parameters (for creators to specify who to chat with)
-        other_user_id = request.GET.get('user_id')
-        
-        if other_user_id:
-            # Creator wants to chat with a specific user
-            try:
-                
-                other_user = User.objects.get(id=other_user_id)
-            except User.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Don't allow user to chat with themselves
-            if current_user == other_user:
-                return Response({'error': 'Cannot chat with yourself'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < other_user.id else other_user
-            participant2 = other_user if current_user.id < other_user.id else current_user
-        else:
-            # Non-creator wants to chat with job creator (default behavior)
-            if current_user == job_creator:
-                # Creator trying to access chat without specifying user - return empty
-                return Response([])
-                
-            participant1 = current_user if current_user.id < job_creator.id else job_creator
-            participant2 = job_creator if current_user.id < job_creator.id else current_user
-        
-        private_chat, created = JobPrivateChat.objects.get_or_create(
-            job=job,
-            participant1=participant1,
-            participant2=participant2,
-            defaults={
-                'job': job,
-                'participant1': participant1,
-                'participant2': participant2
-            }
-        )
-        
-        messages = JobPrivateMessage.objects.filter(chat=private_chat).order_by('created_at')
-        
-        # Format messages for frontend
-        message_data = []
-        for msg in messages:
-            message_data.append({
-                'id': msg.id,
-                'text': msg.text,
-                'sender': msg.sender.username,
-                'is_sender': msg.sender == request.user,
-                'created_at': msg.created_at.isoformat(),
-            })
-        
-        return Response(message_data)
+    def get_owner_id(self, object_id):
+        owner_id = subject_owner_id(self.object_type, object_id)
+        if owner_id is None:
+            raise Http404
+        return owner_id
 
-    def post(self, request, job_id):
-        """Send a message to private job chat"""
-        job = get_object_or_404(Job, id=job_id)
-        current_user = request.user
-        job_creator = job.created_by
-        
-        # Get the other user ID from request data (for creators to specify who to message)
-        other_user_id = request.data.get('user_id')
-        
+    def get_other_user_id(self, user, owner_id, other_user_id, verb):
+        """
+        The other participant: the ``user_id`` a creator picked, otherwise the
+        creator. None when the creator did not pick anybody.
+        """
         if other_user_id:
-            # Creator wants to message a specific user
             try:
-                
-                other_user = User.objects.get(id=other_user_id)
-            except User.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Don't allow user to message themselves
-            if current_user == other_user:
-                return Response({'error': 'Cannot message yourself'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < other_user.id else other_user
-            participant2 = other_user if current_user.id < other_user.id else current_user
-        else:
-            # Default behavior: chat with job creator
-            if current_user == job_creator:
-                return Response({'error': 'Creator must specify user_id to message someone'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < job_creator.id else job_creator
-            participant2 = job_creator if current_user.id < job_creator.id else current_user
-        
-        private_chat, created = JobPrivateChat.objects.get_or_create(
-            job=job,
-            participant1=participant1,
-            participant2=participant2,
-            defaults={
-                'job': job,
-                'participant1': participant1,
-                'participant2': participant2
-            }
-        )
-        
-        # Create message
-        message = JobPrivateMessage.objects.create(
-            chat=private_chat,
-            sender=request.user,
-            text=request.data.get('text', '')
-        )
-        
-        # Create notification for the other participant only
-        other_participant = private_chat.get_other_participant(current_user)
-        Notification.objects.create(
-            recipient=other_participant,
-            sender=current_user,
-            notification_type='job_message',
-            job=job,
-            message=f"New private message from {current_user.username} on job '{job.title}': {message.text[:50]}..."
-        )
-        
-        # Return formatted message
-        return Response({
-            'id': message.id,
-            'text': message.text,
-            'sender': message.sender.username,
-            'is_sender': True,
-            'created_at': message.created_at.isoformat(),
-        }, status=status.HTTP_201_CREATED)
+                other_user_id = User.objects.filter(id=other_user_id).values_list('id', flat=True).first()
+            except (TypeError, ValueError):
+                other_user_id = None
+            if other_user_id is None:
+                raise NotFound({'error': 'User not found'})
+            # Don't allow user to chat with themselves
+            if other_user_id == user.id:
+                raise ValidationError({'error': f'Cannot {verb} yourself'})
+            return other_user_id
+        return None if user.id == owner_id else owner_id
 
 
-class IssueChatMessagesView(APIView):
+class ChatMessagesView(ReplicaReadMixin, ConversationViewMixin, APIView):
+    """
+    Messages of the private chat between the current user and another user
+    about one job or issue. Reading never creates anything: a chat only
+    exists once its first message has been sent.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
-    def get(self, request, issue_id):
-        """Get messages for a private issue chat between current user and another user"""
-        issue = get_object_or_404(Issue, id=issue_id)
+    def get(self, request, object_id):
         current_user = request.user
-        issue_creator = issue.user
-        
-        # Get the other user ID from query parameters (for creators to specify who to chat with)
-        other_user_id = request.GET.get('user_id')
-        
-        if other_user_id:
-            # Creator wants to chat with a specific user
-            try:
-                
-                other_user = User.objects.get(id=other_user_id)
-            except User.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Don't allow user to chat with themselves
-            if current_user == other_user:
-                return Response({'error': 'Cannot chat with yourself'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < other_user.id else other_user
-            participant2 = other_user if current_user.id < other_user.id else current_user
-        else:
-            # Non-creator wants to chat with issue creator (default behavior)
-            if current_user == issue_creator:
-                # Creator trying to access chat without specifying user - return empty
-                return Response([])
-                
-            participant1 = current_user if current_user.id < issue_creator.id else issue_creator
-            participant2 = issue_creator if current_user.id < issue_creator.id else current_user
-        
-        private_chat, created = IssuePrivateChat.objects.get_or_create(
-            issue=issue,
-            participant1=participant1,
-            participant2=participant2,
-            defaults={
-                'issue': issue,
-                'participant1': participant1,
-                'participant2': participant2
-            }
+        owner_id = self.get_owner_id(object_id)
+        # Creators pass ?user_id= to pick who to chat with
+        other_user_id = self.get_other_user_id(current_user, owner_id, request.GET.get('user_id'), 'chat with')
+
+        empty = {'results': [], 'has_more_before': False, 'has_more_after': False}
+        if other_user_id is None:
+            # Creator opening the chat without picking a user
+            return Response(empty)
+        private_chat = find_conversation(self.object_type, object_id, current_user.id, other_user_id)
+        if private_chat is None:
+            return Response(empty)
+
+        # Messages are append-only: the newest id and the archive boundary
+        # identify the chat's history; is_sender depends on the reader
+        etag = make_etag(current_user.id, private_chat.id, private_chat.last_message_id, private_chat.archived_until_id)
+        response = not_modified(request, etag, private_chat.last_message_at)
+        if response is not None:
+            return set_validators(response, etag, private_chat.last_message_at)
+
+        messages = Message.objects.filter(conversation=private_chat).select_related('sender')
+        messages, has_more_before, has_more_after = window_messages(
+            messages, request.GET, archive=archived_history(private_chat)
         )
-        
-        messages = IssuePrivateMessage.objects.filter(chat=private_chat).order_by('created_at')
-        
-        # Format messages for frontend
-        message_data = []
-        for msg in messages:
-            message_data.append({
-                'id': msg.id,
-                'text': msg.text,
-                'sender': msg.sender.username,
-                'is_sender': msg.sender == request.user,
-                'created_at': msg.created_at.isoformat(),
-            })
-        
-        return Response(message_data)
+        if messages and not has_more_after:
+            mark_chat_read(private_chat, current_user, messages[-1].id)
 
-    def post(self, request, issue_id):
-        """Send a message to private issue chat"""
-        issue = get_object_or_404(Issue, id=issue_id)
+        message_data = [
+            {**serialize_message(msg), 'is_sender': msg.sender_id == current_user.id}
+            for msg in messages
+        ]
+        return set_validators(Response({
+            'results': message_data,
+            'has_more_before': has_more_before,
+            'has_more_after': has_more_after,
+        }), etag, private_chat.last_message_at)
+
+    def post(self, request, object_id):
+        """Send a message, starting the chat if this is its first one"""
         current_user = request.user
-        issue_creator = issue.user
-        
-        # Get the other user ID from request data (for creators to specify who to message)
-        other_user_id = request.data.get('user_id')
-        
-        if other_user_id:
-            # Creator wants to message a specific user
-            try:
-                
-                other_user = User.objects.get(id=other_user_id)
-            except User.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Don't allow user to message themselves
-            if current_user == other_user:
-                return Response({'error': 'Cannot message yourself'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < other_user.id else other_user
-            participant2 = other_user if current_user.id < other_user.id else current_user
-        else:
-            # Non-creator wants to message issue creator (default behavior)
-            if current_user == issue_creator:
-                return Response({'error': 'Creator must specify user_id to message someone'}, status=status.HTTP_400_BAD_REQUEST)
-                
-            participant1 = current_user if current_user.id < issue_creator.id else issue_creator
-            participant2 = issue_creator if current_user.id < issue_creator.id else current_user
-        
-        private_chat, created = IssuePrivateChat.objects.get_or_create(
-            issue=issue,
-            participant1=participant1,
-            participant2=participant2,
-            defaults={
-                'issue': issue,
-                'participant1': participant1,
-                'participant2': participant2
-            }
-        )
-        
-        # Create message
-        message = IssuePrivateMessage.objects.create(
-            chat=private_chat,
-            sender=request.user,
-            text=request.data.get('text', '')
-        )
-        
-        # Create notification for the other participant only
-        other_participant = private_chat.get_other_participant(current_user)
-        Notification.objects.create(
-            recipient=other_participant,
-            sender=current_user,
-            notification_type='issue_message',
-            issue=issue,
-            message=f"New private message from {current_user.username} on issue '{issue.title}': {message.text[:50]}..."
-        )
-        
-        # Return formatted message
+        owner_id = self.get_owner_id(object_id)
+        other_user_id = self.get_other_user_id(current_user, owner_id, request.data.get('user_id'), 'message')
+        if other_user_id is None:
+            return Response({'error': 'Creator must specify user_id to message someone'}, status=status.HTTP_400_BAD_REQUEST)
+
+        private_chat = open_conversation(self.object_type, object_id, current_user.id, other_user_id)
+        # Create message, notify the other participant and push it to open sockets
+        message = send_private_message(private_chat, current_user, request.data.get('text', ''))
+
         return Response({
-            'id': message.id,
-            'text': message.text,
-            'sender': message.sender.username,
+            **serialize_message(message),
             'is_sender': True,
-            'created_at': message.created_at.isoformat(),
         }, status=status.HTTP_201_CREATED)
 
 
-class JobConversationsView(APIView):
-    """Get all users who have conversations with the current user for a specific job"""
+class JobChatMessagesView(ChatMessagesView):
+    object_type = Conversation.JOB
+
+
+class IssueChatMessagesView(ChatMessagesView):
+    object_type = Conversation.ISSUE
+
+
+class ConversationsView(ReplicaReadMixin, ConversationViewMixin, APIView):
+    """Get all users who have conversations with the current user for one job or issue"""
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get(self, request, job_id):
-        from django.db import models
-        
-        job = get_object_or_404(Job, id=job_id)
+
+    def get(self, request, object_id):
         current_user = request.user
-        
-        # Find all private chats involving this user and job
-        chats = JobPrivateChat.objects.filter(
-            job=job
+        self.get_owner_id(object_id)
+
+        chats = Conversation.objects.filter(
+            object_type=self.object_type, object_id=object_id,
         ).filter(
-            models.Q(participant1=current_user) | models.Q(participant2=current_user)
-        ).select_related('participant1', 'participant2')
-        
+            Q(participant1=current_user) | Q(participant2=current_user)
+        ).select_related('participant1', 'participant2', 'last_message__sender')
+
         conversations = []
         for chat in chats:
             other_user = chat.get_other_participant(current_user)
-            
-            # Get the latest message from this conversation
-            latest_message = JobPrivateMessage.objects.filter(chat=chat).order_by('-created_at').first()
-            
+            latest_message = chat.last_message
+
             conversations.append({
                 'user_id': other_user.id,
                 'username': other_user.username,
+                'profile_picture': thumbnail_url(other_user.profile_thumbnails, 'small', request),
+                'selected_avatar': other_user.selected_avatar,
                 'latest_message': {
-                    'text': latest_message.text if latest_message else 'No messages yet',
-                    'created_at': latest_message.created_at.isoformat() if latest_message else None,
-                    'sender': latest_message.sender.username if latest_message else None
+                    'text': latest_message.text,
+                    'created_at': latest_message.created_at.isoformat(),
+                    'sender': latest_message.sender.username,
                 } if latest_message else None
             })
-        
+
         return Response(conversations)
 
 
-class IssueConversationsView(APIView):
-    """Get all users who have conversations with the current user for a specific issue"""
+class JobConversationsView(ConversationsView):
+    object_type = Conversation.JOB
+
+
+class IssueConversationsView(ConversationsView):
+    object_type = Conversation.ISSUE
+
+
+class InboxView(ReplicaReadMixin, APIView):
+    """
+    Every private chat the current user takes part in, across jobs and
+    issues, newest activity first. Each entry carries the last message, the
+    other participant and the unread count; a page costs one query for the
+    chats plus one per subject type for the titles.
+    """
     permission_classes = [permissions.IsAuthenticated]
-    
-    def get(self, request, issue_id):
-        from django.db import models
-        
-        issue = get_object_or_404(Issue, id=issue_id)
+
+    def get(self, request):
         current_user = request.user
-        
-        # Find all private chats involving this user and issue
-        chats = IssuePrivateChat.objects.filter(
-            issue=issue
-        ).filter(
-            models.Q(participant1=current_user) | models.Q(participant2=current_user)
-        ).select_related('participant1', 'participant2')
-        
-        conversations = []
-        for chat in chats:
-            other_user = chat.get_other_participant(current_user)
-            
-            # Get the latest message from this conversation
-            latest_message = IssuePrivateMessage.objects.filter(chat=chat).order_by('-created_at').first()
-            
-            conversations.append({
-                'user_id': other_user.id,
+        page_size = inbox_page_size(request.GET)
+        cursor = request.GET.get('cursor')
+
+        queryset = Conversation.objects.filter(
+            Q(participant1=current_user) | Q(participant2=current_user),
+            last_message__isnull=False,
+        )
+        if cursor:
+            last_activity, chat_id = decode_inbox_cursor(cursor)
+            queryset = queryset.filter(
+                Q(last_message_at__lt=last_activity) | Q(last_message_at=last_activity, id__lt=chat_id)
+            )
+
+        unread = (
+            Message.objects.filter(conversation=OuterRef('pk'), id__gt=OuterRef('my_last_read_id'))
+            .exclude(sender=current_user)
+            .order_by()
+            .values('conversation')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        chats = list(queryset.annotate(
+            my_last_read_id=Case(
+                When(participant1=current_user, then=F('participant1_last_read_id')),
+                default=F('participant2_last_read_id'),
+            ),
+            unread_count=Coalesce(Subquery(unread), 0),
+        ).select_related(
+            'participant1', 'participant2', 'last_message__sender'
+        ).order_by('-last_message_at', '-id')[:page_size + 1])
+
+        has_next = len(chats) > page_size
+        chats = chats[:page_size]
+        subjects = self.load_subjects(chats)
+        results = [self.serialize_entry(chat, subjects, current_user, request) for chat in chats]
+
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_inbox_cursor(results[-1])
+            )
+        return Response({'next': next_url, 'results': results})
+
+    @staticmethod
+    def load_subjects(chats):
+        """Titles of the jobs and issues the chats are about, keyed by (type, id)"""
+        subjects = {}
+        for object_type, (model, _) in CHAT_SUBJECTS.items():
+            ids = {chat.object_id for chat in chats if chat.object_type == object_type}
+            if ids:
+                titles = model.objects.filter(id__in=ids).values_list('id', 'title')
+                subjects.update(((object_type, object_id), title) for object_id, title in titles)
+        return subjects
+
+    @staticmethod
+    def serialize_entry(chat, subjects, user, request):
+        other_user = chat.get_other_participant(user)
+        return {
+            'type': chat.object_type,
+            'chat_id': chat.id,
+            'object_id': chat.object_id,
+            'title': subjects.get((chat.object_type, chat.object_id)),
+            'other_user': {
+                'id': other_user.id,
                 'username': other_user.username,
-                'latest_message': {
-                    'text': latest_message.text if latest_message else 'No messages yet',
-                    'created_at': latest_message.created_at.isoformat() if latest_message else None,
-                    'sender': latest_message.sender.username if latest_message else None
-                } if latest_message else None
-            })
-        
-        return Response(conversations)
+                'profile_picture': thumbnail_url(other_user.profile_thumbnails, 'small', request),
+                'selected_avatar': other_user.selected_avatar,
+            },
+            'last_message': {
+                **serialize_message(chat.last_message),
+                'is_sender': chat.last_message.sender_id == user.id,
+            },
+            'unread_count': chat.unread_count,
+            'last_activity': chat.last_message_at.isoformat(),
+        }
@@ -0,0 +1,101 @@
+"""
+Incrementally maintained facet counts for the job and issue boards.
+
+Every save or delete of a faceted model adjusts the matching FacetCount
+rows in the write's own transaction, after locking the stored row, so
+reads never group over the boards and concurrent writes of one row cannot
+apply the same change twice. Writes that skip signals (``QuerySet.update()``,
+``bulk_create()``) leave the counts behind; ``rebuild_facet_counts``
+recomputes them and ``check_facet_counts`` reports drift.
+"""
+from collections import Counter
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import FacetCount
+
+# Board name -> (model label, faceted fields)
+FACETS = {
+    'jobs': ('jobs.Job', ['category', 'is_active']),
+    'issues': ('issues.Issue', ['category', 'status']),
+}
+
+
+def faceted_models():
+    """Yield (board, model, field names) for every board"""
+    for board, (label, fields) in FACETS.items():
+        yield board, apps.get_model(label), fields
+
+
+def facet_key(value):
+    return '' if value is None else str(value)
+
+
+def facet_values(model, fields, obj):
+    """{field: key} for an instance or a values() row of ``model``"""
+    values = {}
+    for name in fields:
+        attname = model._meta.get_field(name).attname
+        value = obj[attname] if isinstance(obj, dict) else getattr(obj, attname)
+        values[name] = facet_key(value)
+    return values
+
+
+def adjust(board, deltas):
+    """Apply {(facet, value): delta} to the stored counts"""
+    for (facet, value), delta in deltas.items():
+        if not delta:
+            continue
+        rows = FacetCount.objects.filter(board=board, facet=facet, value=value)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                FacetCount.objects.create(board=board, facet=facet, value=value, count=delta)
+        except IntegrityError:
+            # Another transaction created the row first
+            rows.update(count=F('count') + delta)
+
+
+def compute_counts(board):
+    """Recount a board from its table: {(facet, value): count}"""
+    label, fields = FACETS[board]
+    model = apps.get_model(label)
+    counts = Counter()
+    for name in fields:
+        attname = model._meta.get_field(name).attname
+        for value, count in model.objects.order_by().values_list(attname).annotate(n=Count('pk')):
+            counts[(name, facet_key(value))] += count
+    return counts
+
+
+def stored_counts(board):
+    return Counter({
+        (facet, value): count
+        for facet, value, count in FacetCount.objects.filter(board=board).values_list('facet', 'value', 'count')
+        if count
+    })
+
+
+def rebuild_counts(board):
+    """Replace a board's stored counts with a fresh recount; returns the number of rows"""
+    counts = compute_counts(board)
+    with transaction.atomic():
+        FacetCount.objects.filter(board=board).delete()
+        FacetCount.objects.bulk_create(
+            FacetCount(board=board, facet=facet, value=value, count=count)
+            for (facet, value), count in counts.items()
+        )
+    return len(counts)
+
+
+def drift(board):
+    """{(facet, value): (stored, actual)} for every count that is off"""
+    stored, actual = stored_counts(board), compute_counts(board)
+    return {
+        key: (stored[key], actual[key])
+        for key in stored.keys() | actual.keys()
+        if stored[key] != actual[key]
+    }
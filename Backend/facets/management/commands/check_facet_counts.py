@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from facets.counts import FACETS, drift, rebuild_counts
+
+
+class Command(BaseCommand):
+    help = "Compare the stored facet counts with the tables; exits non-zero on drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Rebuild the boards that drifted")
+
+    def handle(self, *args, **options):
+        drifted = []
+        for board in FACETS:
+            wrong = drift(board)
+            for (facet, value), (stored, actual) in sorted(wrong.items()):
+                self.stdout.write(f"  {board}.{facet}={value!r}: stored {stored}, actual {actual}")
+            if wrong:
+                drifted.append(board)
+                if options["fix"]:
+                    rebuild_counts(board)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Facet counts are consistent"))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {', '.join(drifted)}"))
+        else:
+            raise CommandError(f"Facet counts drifted for {', '.join(drifted)}; run with --fix")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from facets.counts import FACETS, rebuild_counts
+
+
+class Command(BaseCommand):
+    help = "Recount the job and issue facet counts from their tables"
+
+    def handle(self, *args, **options):
+        for board in FACETS:
+            self.stdout.write(f"{board}: {rebuild_counts(board)} facet values")
+        self.stdout.write(self.style.SUCCESS("Facet counts rebuilt"))
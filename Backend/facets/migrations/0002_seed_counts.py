@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count
+
+FACETS = {
+    'jobs': ('jobs', 'Job', ['category_id', 'is_active']),
+    'issues': ('issues', 'Issue', ['category', 'status']),
+}
+
+
+def seed_counts(apps, schema_editor):
+    FacetCount = apps.get_model('facets', 'FacetCount')
+    rows = []
+    for board, (app_label, model_name, columns) in FACETS.items():
+        model = apps.get_model(app_label, model_name)
+        for column in columns:
+            facet = column.removesuffix('_id')
+            for value, count in model.objects.order_by().values_list(column).annotate(n=Count('pk')):
+                rows.append(FacetCount(board=board, facet=facet, value='' if value is None else str(value), count=count))
+    FacetCount.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facets', '0001_initial'),
+        ('jobs', '0008_backfill_salary_range'),
+        ('issues', '0008_backfill_salary_range'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import models, router, transaction
+
+
+class FacetCount(models.Model):
+    """
+    Number of rows on a board (``jobs``/``issues``) with one value of one
+    facet field, e.g. how many jobs are in category 3. Kept current by
+    signals, so reading a board's facets is one small range scan.
+    """
+    board = models.CharField(max_length=20)
+    facet = models.CharField(max_length=50)
+    # str() of the field value (the primary key for relations), '' for NULL
+    value = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'facet', 'value'], name='facet_count_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.board}.{self.facet}={self.value!r}: {self.count}"
+
+
+class FacetCounted(models.Model):
+    """
+    Base for faceted models: runs every save in a transaction, so the facet
+    signals can lock the stored row, read the values the save moves it away
+    from and adjust the counts before anyone else can save the same row.
+    Deletes already run in one (see ``facets.signals``).
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
@@ -0,0 +1,64 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from .counts import adjust, facet_values, faceted_models
+
+
+def stored_facets(sender, instance, using):
+    """
+    The facet values of the row as stored, locked until the surrounding
+    transaction ends so concurrent saves/deletes of it wait for our counts
+    (FacetCounted runs saves in one; the deletion collector runs deletes in
+    one). None when the row does not exist (anymore).
+    """
+    attnames = [sender._meta.get_field(name).attname for name in FACET_FIELDS[sender]]
+    rows = sender._default_manager.db_manager(using).select_for_update().filter(pk=instance.pk)
+    row = rows.values(*attnames).first()
+    return facet_values(sender, FACET_FIELDS[sender], row) if row is not None else None
+
+
+def remember_facets(sender, instance, using, update_fields=None, **kwargs):
+    # The stored values, so post_save can move the row between facet values
+    instance._facet_previous = None
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(FACET_FIELDS[sender])):
+        return
+    instance._facet_previous = stored_facets(sender, instance, using)
+
+
+def count_saved(sender, instance, created, update_fields=None, **kwargs):
+    fields = FACET_FIELDS[sender]
+    previous = getattr(instance, '_facet_previous', None)
+    if not created and previous is None:
+        return
+    current = facet_values(sender, fields, instance)
+    deltas = Counter()
+    for name in fields:
+        if previous is not None:
+            if previous[name] == current[name]:
+                continue
+            deltas[(name, previous[name])] -= 1
+        deltas[(name, current[name])] += 1
+    adjust(BOARDS[sender], deltas)
+
+
+def remember_deleted(sender, instance, using, **kwargs):
+    instance._facet_deleted = stored_facets(sender, instance, using)
+
+
+def count_deleted(sender, instance, **kwargs):
+    # Nothing to subtract when the row was already gone (a repeated delete)
+    deleted = getattr(instance, '_facet_deleted', None)
+    if deleted is None:
+        return
+    adjust(BOARDS[sender], Counter({(name, value): -1 for name, value in deleted.items()}))
+
+
+BOARDS, FACET_FIELDS = {}, {}
+for board, model, fields in faceted_models():
+    BOARDS[model], FACET_FIELDS[model] = board, fields
+    uid = f'facets_{model._meta.label}'
+    pre_save.connect(remember_facets, sender=model, dispatch_uid=f'{uid}_pre_save')
+    post_save.connect(count_saved, sender=model, dispatch_uid=f'{uid}_save')
+    pre_delete.connect(remember_deleted, sender=model, dispatch_uid=f'{uid}_pre_delete')
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f'{uid}_delete')
@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from issues.models import Issue
+from jobs.models import Job, ServiceCategory
+from users.models import User
+from .counts import drift, stored_counts
+
+
+class FacetCountTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.plumbing = ServiceCategory.objects.create(name='Plumbing')
+        self.painting = ServiceCategory.objects.create(name='Painting')
+
+    def job(self, category=None, **fields):
+        return Job.objects.create(
+            title='Job', description='', category=category or self.plumbing, created_by=self.owner, **fields,
+        )
+
+    def assertCounts(self, board, expected):
+        self.assertEqual(dict(stored_counts(board)), expected)
+        self.assertEqual(drift(board), {})
+
+    def test_create_counts_every_facet(self):
+        self.job()
+        self.job(is_active=False)
+        self.assertCounts('jobs', {
+            ('category', str(self.plumbing.id)): 2, ('is_active', 'True'): 1, ('is_active', 'False'): 1,
+        })
+
+    def test_save_moves_the_row_between_values(self):
+        job = self.job()
+        job.category = self.painting
+        job.save()
+        self.assertCounts('jobs', {('category', str(self.painting.id)): 1, ('is_active', 'True'): 1})
+
+        # Saves that keep the facet values, or skip the faceted fields, change nothing
+        job.title = 'Renamed'
+        job.save()
+        job.save(update_fields=['title'])
+        self.assertCounts('jobs', {('category', str(self.painting.id)): 1, ('is_active', 'True'): 1})
+
+    def test_stale_instances_move_from_the_stored_values(self):
+        job = self.job()
+        stale = Job.objects.get(pk=job.pk)
+        job.category = self.painting
+        job.save()
+        # This copy still holds plumbing; the count moves from what is stored
+        stale.is_active = False
+        stale.save()
+        self.assertCounts('jobs', {('category', str(self.plumbing.id)): 1, ('is_active', 'False'): 1})
+
+    def test_delete_subtracts_once(self):
+        job = self.job()
+        self.job()
+        copy = Job.objects.get(pk=job.pk)
+        job.delete()
+        # The row is already gone: deleting it again must not subtract again
+        copy.delete()
+        self.assertCounts('jobs', {('category', str(self.plumbing.id)): 1, ('is_active', 'True'): 1})
+
+    def test_save_and_counts_commit_together(self):
+        job = self.job()
+        job.category = self.painting
+        with mock.patch('facets.signals.adjust', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                job.save()
+        self.assertEqual(Job.objects.get(pk=job.pk).category, self.plumbing)
+        self.assertCounts('jobs', {('category', str(self.plumbing.id)): 1, ('is_active', 'True'): 1})
+
+    def test_issue_status_changes(self):
+        issue = Issue.objects.create(user=self.owner, title='Issue', description='', category='Roof')
+        issue.status = 'resolved'
+        issue.save()
+        self.assertCounts('issues', {('category', 'Roof'): 1, ('status', 'resolved'): 1})
+
+
+class FacetsViewTests(TestCase):
+
+    def setUp(self):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        plumbing = ServiceCategory.objects.create(name='Plumbing')
+        painting = ServiceCategory.objects.create(name='Painting')
+        for category in (plumbing, plumbing, painting):
+            Job.objects.create(title='Job', description='', category=category, created_by=owner)
+        Issue.objects.create(user=owner, title='Issue', description='', category='Roof', status='in_progress')
+        self.plumbing, self.painting = plumbing, painting
+        self.client = APIClient()
+        self.client.force_authenticate(owner)
+
+    def test_board_facets(self):
+        response = self.client.get('/api/facets/jobs/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'jobs': {
+            'category': [
+                {'value': self.plumbing.id, 'label': 'Plumbing', 'count': 2},
+                {'value': self.painting.id, 'label': 'Painting', 'count': 1},
+            ],
+            'is_active': [{'value': True, 'label': 'True', 'count': 3}],
+        }})
+
+    def test_every_board(self):
+        response = self.client.get('/api/facets/')
+        self.assertEqual(set(response.json()), {'jobs', 'issues'})
+        self.assertEqual(response.json()['issues']['status'], [
+            {'value': 'in_progress', 'label': 'In Progress', 'count': 1},
+        ])
+
+    def test_emptied_values_are_left_out(self):
+        # Deleting the category deletes its job, leaving a zero count
+        self.painting.delete()
+        categories = self.client.get('/api/facets/jobs/').json()['jobs']['category']
+        self.assertEqual([entry['label'] for entry in categories], ['Plumbing'])
+
+    def test_unknown_board(self):
+        self.assertEqual(self.client.get('/api/facets/nope/').status_code, 404)
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/facets/').status_code, 401)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import FacetsView
+
+urlpatterns = [
+    path("", FacetsView.as_view(), name="facets"),
+    path("<str:board>/", FacetsView.as_view(), name="board-facets"),
+]
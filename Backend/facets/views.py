@@ -0,0 +1,65 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.http import Http404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .counts import FACETS
+from .models import FacetCount
+
+
+def board_facets(board):
+    """
+    A board's facets as {field: [{value, label, count}, ...]}, largest
+    count first. Costs one query for the counts plus one per relation
+    facet for the labels.
+    """
+    label, fields = FACETS[board]
+    model = apps.get_model(label)
+    grouped = defaultdict(list)
+    for facet, value, count in (
+        FacetCount.objects.filter(board=board, count__gt=0)
+        .order_by('facet', '-count', 'value').values_list('facet', 'value', 'count')
+    ):
+        grouped[facet].append((value, count))
+
+    facets = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        entries = grouped.get(name, [])
+        labels = {}
+        if field.is_relation:
+            related = field.related_model.objects.in_bulk([value for value, _ in entries if value])
+            labels = {str(pk): str(obj) for pk, obj in related.items()}
+        elif field.choices:
+            labels = {str(key): str(text) for key, text in field.flatchoices}
+
+        to_python = (field.target_field if field.is_relation else field).to_python
+        facets[name] = [
+            {
+                'value': to_python(value) if value else None,
+                'label': labels.get(value, value or None),
+                'count': count,
+            }
+            for value, count in entries
+            # Relations whose row is gone are left out until the next rebuild
+            if not (field.is_relation and value and value not in labels)
+        ]
+    return facets
+
+
+class FacetsView(APIView):
+    """
+    Counts per category, status and active flag for the filter sidebars,
+    read from the maintained aggregate table: ``/api/facets/`` for every
+    board or ``/api/facets/<board>/`` for one.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, board=None):
+        if board is not None and board not in FACETS:
+            raise Http404
+        boards = [board] if board else list(FACETS)
+        return Response({name: board_facets(name) for name in boards})
@@ -0,0 +1,122 @@
+import math
+import operator
+from functools import reduce
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .gazetteer import geocode
+from .geohash import covering, successor
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+
+def in_cells(prefixes):
+    """Rows whose geohash starts with one of ``prefixes``, as index range scans"""
+    conditions = []
+    for prefix in prefixes:
+        upper = successor(prefix)
+        conditions.append(Q(geohash__gte=prefix, geohash__lt=upper) if upper else Q(geohash__gte=prefix))
+    return reduce(operator.or_, conditions)
+
+
+def within_box(queryset, min_lat, min_lng, max_lat, max_lng):
+    """Rows located inside the box; the geohash cells narrow, the coordinates decide"""
+    return queryset.filter(
+        in_cells(covering(min_lat, min_lng, max_lat, max_lng)),
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    )
+
+
+def distance_km(latitude, longitude):
+    """Haversine distance from the point to each row, as an expression"""
+    lat, lng = math.radians(latitude), math.radians(longitude)
+    half_chord = (
+        Power(Sin((Radians(F('latitude')) - Value(lat)) / 2), 2)
+        + Value(math.cos(lat)) * Cos(Radians(F('latitude')))
+        * Power(Sin((Radians(F('longitude')) - Value(lng)) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(half_chord, output_field=FloatField()))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """Rows within ``radius_km`` of the point, annotated with ``distance_km``"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_delta = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    queryset = within_box(
+        queryset,
+        max(latitude - lat_delta, -90.0), max(longitude - lng_delta, -180.0),
+        min(latitude + lat_delta, 90.0), min(longitude + lng_delta, 180.0),
+    )
+    return queryset.annotate(distance_km=distance_km(latitude, longitude)).filter(distance_km__lte=radius_km)
+
+
+class ProximityFilter(BaseFilterBackend):
+    """
+    Narrow a list of geocoded rows by location:
+
+    * ``?near=<place>`` or ``?lat=&lng=`` with an optional ``?radius_km=``
+      (default 10, at most 500) keeps rows within that distance and
+      annotates ``distance_km``;
+    * ``?bbox=<min_lat>,<min_lng>,<max_lat>,<max_lng>`` keeps rows inside
+      the box.
+
+    Places are resolved with the offline gazetteer.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        if params.get('bbox'):
+            return within_box(queryset, *self.get_box(params['bbox']))
+
+        center = self.get_center(params)
+        if center is None:
+            return queryset
+        return within_radius(queryset, *center, self.get_radius(params))
+
+    @staticmethod
+    def get_box(value):
+        try:
+            min_lat, min_lng, max_lat, max_lng = (float(part) for part in value.split(','))
+        except ValueError:
+            raise ValidationError({'bbox': 'Expected min_lat,min_lng,max_lat,max_lng.'})
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+            raise ValidationError({'bbox': 'Coordinates out of range or in the wrong order.'})
+        return min_lat, min_lng, max_lat, max_lng
+
+    @staticmethod
+    def get_center(params):
+        if params.get('near'):
+            point = geocode(params['near'])
+            if point is None:
+                raise ValidationError({'near': 'Unknown location.'})
+            return point
+        if params.get('lat') or params.get('lng'):
+            try:
+                latitude, longitude = float(params.get('lat')), float(params.get('lng'))
+            except (TypeError, ValueError):
+                raise ValidationError({'detail': "Both 'lat' and 'lng' must be numbers."})
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValidationError({'detail': 'Coordinates out of range.'})
+            return latitude, longitude
+        return None
+
+    @staticmethod
+    def get_radius(params):
+        value = params.get('radius_km')
+        if value in (None, ''):
+            return DEFAULT_RADIUS_KM
+        try:
+            radius = float(value)
+        except ValueError:
+            raise ValidationError({'radius_km': 'Must be a number.'})
+        if not 0 < radius <= MAX_RADIUS_KM:
+            raise ValidationError({'radius_km': f'Must be between 0 and {MAX_RADIUS_KM}.'})
+        return radius
@@ -0,0 +1,52 @@
+"""
+Offline geocoding against a bundled gazetteer.
+
+Free-text locations are matched against a CSV of place names with their
+coordinates (``settings.GEO_GAZETTEER_PATH``), so resolving a location
+never leaves the process. Matching ignores case and punctuation; for
+addresses like "12 Temple Road, Nugegoda, Colombo" the first comma-separated
+part that names a known place wins, so the most specific one is used.
+"""
+import csv
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_GAZETTEER = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+
+def normalize(name):
+    return ' '.join(re.sub(r'[^\w\s]', ' ', name.lower()).split())
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path):
+    """Map of normalized place name and alias to (latitude, longitude)"""
+    places = {}
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            point = (float(row['latitude']), float(row['longitude']))
+            for name in [row['name'], *(row.get('aliases') or '').split('|')]:
+                if name.strip():
+                    places.setdefault(normalize(name), point)
+    return places
+
+
+def gazetteer():
+    return load_gazetteer(str(getattr(settings, 'GEO_GAZETTEER_PATH', DEFAULT_GAZETTEER)))
+
+
+def geocode(text):
+    """(latitude, longitude) for a free-text location, or None when it is unknown"""
+    if not text:
+        return None
+    places = gazetteer()
+    point = places.get(normalize(text))
+    if point is None:
+        for part in re.split(r'[,;/\n]', text):
+            point = places.get(normalize(part))
+            if point is not None:
+                break
+    return point
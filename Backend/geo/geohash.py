@@ -0,0 +1,77 @@
+"""
+Geohash encoding and cell covering.
+
+A geohash interleaves longitude and latitude bits into a base32 string, so
+every prefix names a rectangular cell and nearby points share prefixes.
+Stored in an ordinary indexed column, the points inside a cell are one
+range scan (``prefix <= geohash < successor(prefix)``), which is what makes
+proximity queries sub-linear without a spatial database.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Characters stored per point: precision 9 cells are about 5 m across
+PRECISION = 9
+
+# Upper bound on the cells a query is split into; coarser cells are used
+# when a finer covering would need more
+MAX_CELLS = 16
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(height, width) in degrees of a cell with ``precision`` characters"""
+    lat_bits = 5 * precision // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def successor(prefix):
+    """Smallest geohash prefix sorting after every hash that starts with ``prefix``, or None"""
+    prefix = prefix.rstrip(BASE32[-1])
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+def _cell_indexes(low, high, origin, size, count):
+    first = max(0, math.floor((low - origin) / size))
+    last = min(count - 1, math.floor((high - origin) / size))
+    return range(first, last + 1)
+
+
+def covering(min_lat, min_lng, max_lat, max_lng, max_cells=MAX_CELLS):
+    """
+    Geohash prefixes whose cells together cover the box, using the finest
+    precision that needs at most ``max_cells`` of them. Boxes must not
+    cross the antimeridian.
+    """
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = _cell_indexes(min_lat, max_lat, -90.0, height, round(180.0 / height))
+        columns = _cell_indexes(min_lng, max_lng, -180.0, width, round(360.0 / width))
+        if len(rows) * len(columns) <= max_cells or precision == 1:
+            return sorted({
+                encode(-90.0 + (row + 0.5) * height, -180.0 + (column + 0.5) * width, precision)
+                for row in rows for column in columns
+            })
@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from backend.response_cache import bump_version
+from geo.models import GEO_FIELDS, GeoLocated
+
+
+class Command(BaseCommand):
+    help = "Resolve stored locations to coordinates with the bundled gazetteer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--missing", action="store_true", help="Only rows without coordinates yet")
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not issubclass(model, GeoLocated):
+                continue
+            queryset = model.objects.only("id", "location", *GEO_FIELDS).order_by("id")
+            if options["missing"]:
+                queryset = queryset.filter(latitude__isnull=True)
+
+            updated = located = 0
+            batch = []
+            for instance in queryset.iterator(chunk_size=options["batch_size"]):
+                instance.update_coordinates()
+                located += instance.latitude is not None
+                batch.append(instance)
+                if len(batch) >= options["batch_size"]:
+                    model.objects.bulk_update(batch, GEO_FIELDS)
+                    updated += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, GEO_FIELDS)
+                updated += len(batch)
+
+            # bulk_update sends no signals
+            bump_version(model)
+            self.stdout.write(f"{model._meta.label}: {located} of {updated} rows located")
@@ -0,0 +1,33 @@
+from django.db import models
+
+from .gazetteer import geocode
+from .geohash import PRECISION, encode
+
+GEO_FIELDS = ('latitude', 'longitude', 'geohash')
+
+
+class GeoLocated(models.Model):
+    """
+    Coordinates resolved from the model's free-text ``location`` field,
+    refreshed on every save that writes ``location``. ``geohash`` is
+    indexed and backs proximity filtering (see ``geo.filters``).
+    """
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geohash = models.CharField(max_length=PRECISION, blank=True, default='', db_index=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def update_coordinates(self):
+        point = geocode(self.location)
+        self.latitude, self.longitude = point or (None, None)
+        self.geohash = encode(*point) if point else ''
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            self.update_coordinates()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *GEO_FIELDS}
+        super().save(*args, **kwargs)
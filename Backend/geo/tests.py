@@ -0,0 +1,115 @@
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from jobs.models import Job, ServiceCategory
+from users.models import User
+from .geohash import BASE32, MAX_CELLS, cell_size, covering, encode, successor
+
+
+class GeohashTests(SimpleTestCase):
+
+    def test_encode_known_points(self):
+        self.assertEqual(encode(57.64911, 10.40744), 'u4pruydqq')
+        self.assertEqual(encode(57.64911, 10.40744, precision=5), 'u4pru')
+
+    def test_neighbouring_cells_round_trip(self):
+        height, width = cell_size(6)
+        cell = encode(6.9271, 79.8612, precision=6)
+        row, column = int((6.9271 + 90) // height), int((79.8612 + 180) // width)
+        centre = (-90 + (row + 0.5) * height, -180 + (column + 0.5) * width)
+        # The centre of a point's cell encodes back to that cell
+        self.assertEqual(encode(*centre, precision=6), cell)
+
+        neighbours = {
+            encode(centre[0] + d_lat * height, centre[1] + d_lng * width, precision=6)
+            for d_lat in (-1, 0, 1) for d_lng in (-1, 0, 1)
+        }
+        self.assertEqual(len(neighbours), 9)
+        # ... and the box around the neighbours is covered by exactly those cells
+        self.assertEqual(set(covering(
+            centre[0] - 1.5 * height + 1e-9, centre[1] - 1.5 * width + 1e-9,
+            centre[0] + 1.5 * height - 1e-9, centre[1] + 1.5 * width - 1e-9,
+        )), neighbours)
+
+    def test_covering_contains_every_point_in_the_box(self):
+        rng = random.Random(0)
+        box = (6.8, 79.8, 7.0, 80.0)
+        prefixes = covering(*box)
+        self.assertLessEqual(len(prefixes), MAX_CELLS)
+        for _ in range(200):
+            point = encode(rng.uniform(box[0], box[2]), rng.uniform(box[1], box[3]))
+            self.assertTrue(any(point.startswith(prefix) for prefix in prefixes), point)
+
+    def test_successor_bounds_the_prefix_range(self):
+        self.assertEqual(successor('tc3p'), 'tc3q')
+        self.assertEqual(successor('tcz'), 'td')
+        self.assertIsNone(successor('zz'))
+        for char in BASE32:
+            self.assertLess(f'tc3p{char}zzz', successor('tc3p'))
+        self.assertGreater('tc3q', 'tc3p')
+
+
+class ProximityFilterTests(TestCase):
+    # Distances from Colombo: Nugegoda ~8 km, Dehiwala ~8.5 km, Moratuwa ~17 km, Kandy ~94 km
+    PLACES = ['Kandy', 'Nugegoda', 'Colombo', 'Moratuwa', 'Dehiwala', 'Nowhere in particular']
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        category = ServiceCategory.objects.create(name='Plumbing')
+        self.jobs = {
+            place: Job.objects.create(
+                title=place, description='', category=category, created_by=owner, location=place,
+            ).id
+            for place in self.PLACES
+        }
+        self.client = APIClient()
+        self.client.force_authenticate(owner)
+
+    def get(self, **params):
+        return self.client.get('/api/jobs/', {'fields': 'id', **params})
+
+    def places(self, **params):
+        response = self.get(**params)
+        self.assertEqual(response.status_code, 200, response.content)
+        by_id = {job_id: place for place, job_id in self.jobs.items()}
+        return [by_id[row['id']] for row in response.json()['results']]
+
+    def test_radius_keeps_nearby_rows_nearest_first(self):
+        self.assertEqual(self.places(near='Colombo'), ['Colombo', 'Nugegoda', 'Dehiwala'])
+        self.assertEqual(self.places(near='Colombo', radius_km='20'), ['Colombo', 'Nugegoda', 'Dehiwala', 'Moratuwa'])
+        self.assertEqual(self.places(lat='6.9271', lng='79.8612', radius_km='8.3'), ['Colombo', 'Nugegoda'])
+        self.assertEqual(self.places(near='12 Temple Road, Kandy', radius_km='1'), ['Kandy'])
+
+    def test_explicit_ordering_overrides_distance(self):
+        self.assertEqual(self.places(near='Colombo', ordering='-created_at'), ['Dehiwala', 'Colombo', 'Nugegoda'])
+
+    def test_bbox_keeps_rows_inside(self):
+        self.assertEqual(self.places(bbox='6.8,79.85,6.9,79.95'), ['Dehiwala', 'Nugegoda'])
+        self.assertEqual(self.places(bbox='0,0,1,1'), [])
+
+    def test_without_a_location_nothing_is_filtered(self):
+        self.assertEqual(len(self.places()), len(self.PLACES))
+
+    def test_invalid_parameters(self):
+        cases = [
+            ({'near': 'Atlantis'}, 'near'),
+            ({'lat': '6.9'}, 'detail'),
+            ({'lat': 'north', 'lng': '79.8'}, 'detail'),
+            ({'lat': '91', 'lng': '79.8'}, 'detail'),
+            ({'near': 'Colombo', 'radius_km': 'far'}, 'radius_km'),
+            ({'near': 'Colombo', 'radius_km': '0'}, 'radius_km'),
+            ({'near': 'Colombo', 'radius_km': '501'}, 'radius_km'),
+            ({'bbox': '6.8,79.85,6.9'}, 'bbox'),
+            ({'bbox': '6.9,79.85,6.8,79.95'}, 'bbox'),
+            ({'bbox': '6.8,179,6.9,181'}, 'bbox'),
+        ]
+        for params, field in cases:
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.json())
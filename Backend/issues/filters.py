@@ -0,0 +1,17 @@
+import django_filters
+
+from .models import Issue
+
+
+class IssueFilter(django_filters.FilterSet):
+    """
+    ``?salary_min=`` / ``?salary_max=`` bound the offered salary;
+    ``?category_name=`` matches part of the category.
+    """
+    category_name = django_filters.CharFilter(field_name='category', lookup_expr='icontains')
+    salary_min = django_filters.NumberFilter(field_name='salary_max', lookup_expr='gte')
+    salary_max = django_filters.NumberFilter(field_name='salary_min', lookup_expr='lte')
+
+    class Meta:
+        model = Issue
+        fields = ['status', 'category', 'category_name', 'salary_min', 'salary_max']
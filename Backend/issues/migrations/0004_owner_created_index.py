@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_created_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='issue_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def copy_owner_location(apps, schema_editor):
+    # Existing issues take the location (and coordinates) of whoever posted them
+    Issue = apps.get_model('issues', 'Issue')
+    User = apps.get_model('users', 'User')
+    owner = User.objects.filter(pk=OuterRef('user_id'))
+    Issue.objects.filter(location__isnull=True).update(**{
+        field: Subquery(owner.values(field)[:1])
+        for field in ('location', 'latitude', 'longitude', 'geohash')
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0005_geocoded_location'),
+        ('users', '0004_geocode_users'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_owner_location, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def backfill_salary_range(apps, schema_editor):
+    Issue = apps.get_model('issues', 'Issue')
+    Issue.objects.filter(salary__isnull=False).update(salary_min=F('salary'), salary_max=F('salary'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0007_salary_range'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_salary_range, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.conf import settings
+from facets.models import FacetCounted
+from geo.models import GeoLocated
 
-class Issue(models.Model):
+class Issue(FacetCounted, GeoLocated):
     STATUS_CHOICES = [
         ('open', 'Open'),
         ('in_progress', 'In Progress'),
@@ -17,9 +19,33 @@ class Issue(models.Model):
     description = models.TextField()
     category = models.CharField(max_length=100, blank=True, null=True)  
     salary = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    # Same pay range columns as jobs; an issue's salary is a single amount
+    salary_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    # Where the issue is; defaults to the reporter's location
+    location = models.CharField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Backs keyset pagination on the issue board (newest first)
+            models.Index(fields=['-created_at', '-id'], name='issue_created_id_idx'),
+            # Backs the owner-scoped "my issues" list
+            models.Index(fields=['user', '-created_at', '-id'], name='issue_owner_created_idx'),
+            # Back pay-range filters and sorting by pay
+            models.Index(fields=['salary_min'], name='issue_salary_min_idx'),
+            models.Index(fields=['salary_max'], name='issue_salary_max_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'salary' in update_fields:
+            self.salary_min = self.salary_max = self.salary
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'salary_min', 'salary_max'}
+        super().save(*args, **kwargs)
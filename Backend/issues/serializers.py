@@ -1,14 +1,20 @@
 from rest_framework import serializers
+from backend.fieldsets import DynamicFieldsMixin
+from users.serializers import UserSummarySerializer
 from .models import Issue
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {'user': UserSummarySerializer}
+
     class Meta:
         model = Issue
-        fields = ['id', 'user', 'title', 'description', 'category', 'salary', 'status', 'created_at', 'updated_at']
+        fields = ['id', 'user', 'title', 'description', 'category', 'salary', 'salary_min', 'salary_max', 'status', 'location', 'latitude', 'longitude', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
     def create(self, validated_data):
         request = self.context.get("request")
         if request and hasattr(request, "user"):
             validated_data["user"] = request.user
+            if not validated_data.get("location"):
+                validated_data["location"] = request.user.location
         return super().create(validated_data)
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import IssueListCreateView, IssueDetailView
+from .views import IssueListCreateView, MyIssueListView, IssueDetailView
 
 urlpatterns = [
     path('', IssueListCreateView.as_view(), name='issue-list-create'),
+    path('my/', MyIssueListView.as_view(), name='my-issues'),
     path('<int:pk>/', IssueDetailView.as_view(), name='issue-detail'),
 ]
@@ -1,24 +1,79 @@
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Issue
+from .filters import IssueFilter
 from .serializers import IssueSerializer
+from backend.filters import KeysetOrderingFilter
+from backend.pagination import CreatedAtCursorPagination
+from backend.fieldsets import SparseFieldsetMixin, expanded_labels
+from backend.conditional import conditional, versioned_state
+from backend.db_router import ReplicaReadMixin
+from backend.response_cache import cache_response, get_versions
+from backend.values import ValuesListMixin
+from geo.filters import ProximityFilter
+from search.filters import FullTextSearchFilter
 
-class IssueListCreateView(generics.ListCreateAPIView):
+
+# Conditional GET validators; lists are validated by the model version
+# alone, without aggregating the filtered table. ?expand=user embeds the
+# reporter, so the user version is tracked too.
+def issue_list_state(view, request, *args, **kwargs):
+    labels = ['issues.Issue', *expanded_labels(view.get_serializer_class(), request)]
+    return versioned_state(request, labels, request.user.id)
+
+
+def issue_state(view, request, pk, **kwargs):
+    updated_at = Issue.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    return [pk, updated_at, *get_versions(expanded_labels(view.get_serializer_class(), request))], updated_at
+
+
+class IssueListCreateView(ReplicaReadMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['status', 'category']
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, ProximityFilter, KeysetOrderingFilter]
+    filterset_class = IssueFilter
     search_fields = ['title', 'description']
+    ordering_fields = ['created_at', 'updated_at', 'salary_min', 'salary_max']
+    ordering = ['-created_at', '-id']
 
     def get_queryset(self):
-        return Issue.objects.all().order_by('-created_at')
+        return Issue.objects.all().order_by('-created_at', '-id')
+
+    @conditional(issue_list_state)
+    @cache_response('issues.Issue')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
-class IssueDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MyIssueListView(ValuesListMixin, generics.ListAPIView):
+    """Issues reported by the current user"""
+    serializer_class = IssueSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend, KeysetOrderingFilter]
+    filterset_class = IssueFilter
+    ordering_fields = ['created_at', 'updated_at', 'salary_min', 'salary_max']
+    ordering = ['-created_at', '-id']
+
+    def get_queryset(self):
+        return Issue.objects.filter(user=self.request.user).order_by('-created_at', '-id')
+
+    @conditional(issue_list_state)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class IssueDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Issue.objects.all()
+
+    @conditional(issue_state)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def perform_update(self, serializer):
         # Only allow the owner to update
@@ -0,0 +1,19 @@
+import django_filters
+
+from .models import Job
+
+
+class JobFilter(django_filters.FilterSet):
+    """
+    ``?salary_min=`` and ``?salary_max=`` select jobs whose pay range
+    overlaps the requested one: a job paying 5000-8000 matches
+    ``salary_min=7000``. Each bound is an index range scan.
+    ``?category_name=`` matches part of the category name.
+    """
+    category_name = django_filters.CharFilter(field_name='category__name', lookup_expr='icontains')
+    salary_min = django_filters.NumberFilter(field_name='salary_max', lookup_expr='gte')
+    salary_max = django_filters.NumberFilter(field_name='salary_min', lookup_expr='lte')
+
+    class Meta:
+        model = Job
+        fields = ['category', 'category_name', 'is_active', 'salary_min', 'salary_max']
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from jobs.salary import parse_salary
+
+
+def backfill_salary_range(apps, schema_editor):
+    # Salaries repeat a lot ("5000", "Negotiable"), so parse each distinct
+    # string once and update all of its rows in one statement
+    Job = apps.get_model('jobs', 'Job')
+    salaries = Job.objects.exclude(salary__isnull=True).values_list('salary', flat=True).order_by().distinct()
+    for salary in salaries.iterator():
+        salary_min, salary_max = parse_salary(salary)
+        if salary_min is not None:
+            Job.objects.filter(salary=salary).update(salary_min=salary_min, salary_max=salary_max)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_salary_range'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_salary_range, migrations.RunPython.noop),
+    ]
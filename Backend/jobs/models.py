@@ -1,5 +1,8 @@
 from django.db import models
+from facets.models import FacetCounted
+from geo.models import GeoLocated
 from users.models import User
+from .salary import parse_salary
 
 
 # Service Category (ex: Plumbing, Cleaning, Electrical, etc.)
@@ -12,15 +15,39 @@ class ServiceCategory(models.Model):
 
 
 # Job (a task posted by a user)
-class Job(models.Model):
+class Job(FacetCounted, GeoLocated):
     title = models.CharField(max_length=200)
     description = models.TextField()
     category = models.ForeignKey(ServiceCategory, on_delete=models.CASCADE, related_name="jobs")
     salary = models.CharField(max_length=100, blank=True, null=True)  
+    # Numeric range parsed from ``salary`` on save, for filtering and sorting by pay
+    salary_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, editable=False)
+    # Where the work is; defaults to the poster's location
+    location = models.CharField(max_length=200, blank=True, null=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Backs keyset pagination on the job board (newest first)
+            models.Index(fields=["-created_at", "-id"], name="job_created_id_idx"),
+            # Backs the owner-scoped "my jobs" list
+            models.Index(fields=["created_by", "-created_at", "-id"], name="job_owner_created_idx"),
+            # Back pay-range filters and sorting by pay
+            models.Index(fields=["salary_min"], name="job_salary_min_idx"),
+            models.Index(fields=["salary_max"], name="job_salary_max_idx"),
+        ]
+
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "salary" in update_fields:
+            self.salary_min, self.salary_max = parse_salary(self.salary)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "salary_min", "salary_max"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,73 @@
+"""
+Parsing of the free-text ``Job.salary`` into a numeric range.
+
+Posters write pay as "5000", "Rs. 5,000 - 8,000", "25k/day", "1.5 lakhs"
+or "Negotiable". The first amount found is the pay; when a range separator
+("-", "to", "~") joins it to a second amount, the two are the range bounds,
+and a multiplier written only on the upper bound ("10 to 20k") applies to
+both. Numbers followed by a duration or head count ("2 days", "3 workers")
+are not pay. Text without an amount parses to (None, None).
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+MULTIPLIERS = {
+    'k': 1000,
+    'm': 1000000, 'mn': 1000000, 'million': 1000000,
+    'lakh': 100000, 'lakhs': 100000, 'lac': 100000, 'lacs': 100000,
+}
+
+AMOUNT = re.compile(r'(\d+(?:\.\d+)?)\s*(' + '|'.join(sorted(MULTIPLIERS, key=len, reverse=True)) + r')?\b', re.I)
+
+# Words that make the number before them a duration or head count
+COUNT_UNIT = re.compile(
+    r'\s*(?:days?|hours?|hrs?|weeks?|months?|years?|yrs?|persons?|people|workers?)\b', re.I,
+)
+
+RANGE_SEPARATOR = re.compile(r'\s*(?:-|–|—|~|to)\s*(?:rs\.?|lkr)?\s*', re.I)
+
+# Largest amount the salary_min/salary_max columns hold
+MAX_AMOUNT = Decimal('9999999999.99')
+
+
+def parse_salary(text):
+    """Return (salary_min, salary_max) as Decimals, or (None, None)"""
+    if text in (None, ''):
+        return None, None
+    # Thousands separators: "5,000" -> "5000"
+    text = re.sub(r'(?<=\d),(?=\d{3}\b)', '', str(text))
+
+    bounds = []
+    previous_end = None
+    for match in AMOUNT.finditer(text):
+        if COUNT_UNIT.match(text, match.end()):
+            if bounds:
+                break
+            continue
+        if bounds and not RANGE_SEPARATOR.fullmatch(text, previous_end, match.start()):
+            break
+        number, unit = match.groups()
+        try:
+            number = Decimal(number)
+        except InvalidOperation:
+            break
+        bounds.append((number, MULTIPLIERS.get((unit or '').lower())))
+        previous_end = match.end()
+        if len(bounds) == 2:
+            break
+
+    if len(bounds) == 2:
+        (low, low_multiplier), (high, high_multiplier) = bounds
+        # "10 to 20k" means 10k to 20k, but "500 - 2k" stays 500 to 2000
+        if low_multiplier is None and high_multiplier and low <= high:
+            bounds[0] = (low, high_multiplier)
+
+    amounts = []
+    for number, multiplier in bounds:
+        amount = number * (multiplier or 1)
+        if not 0 < amount <= MAX_AMOUNT:
+            break
+        amounts.append(amount.quantize(Decimal('0.01')))
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from backend.fieldsets import DynamicFieldsMixin
+from users.serializers import UserSummarySerializer
 from .models import ServiceCategory, Job
 
 
@@ -8,11 +10,13 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "description"]
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = serializers.CharField(write_only=True)  # Accept string input
     category_name = serializers.CharField(source='category.name', read_only=True)  # Return category name
 
+    expandable_fields = {'created_by': UserSummarySerializer}
+
     class Meta:
         model = Job
-        fields = ["id", "title", "description", "category", "category_name", "salary", "created_by", "created_at", "updated_at", "is_active"]
+        fields = ["id", "title", "description", "category", "category_name", "salary", "salary_min", "salary_max", "location", "latitude", "longitude", "created_by", "created_at", "updated_at", "is_active"]
         read_only_fields = ["created_by", "created_at", "updated_at"]
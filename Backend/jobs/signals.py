@@ -0,0 +1,5 @@
+from backend.response_cache import track_versions
+
+from .models import Job, ServiceCategory
+
+track_versions(Job, ServiceCategory)
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from .salary import parse_salary
+
+
+class ParseSalaryTests(SimpleTestCase):
+    CASES = [
+        ('5000', ('5000', '5000')),
+        ('Rs. 5,000 - 8,000', ('5000', '8000')),
+        ('25k/day', ('25000', '25000')),
+        ('1.5 lakhs', ('150000', '150000')),
+        ('10 to 20k', ('10000', '20000')),
+        ('10k to 20k', ('10000', '20000')),
+        ('500 - 2k', ('500', '2000')),
+        ('2 days work, 5000', ('5000', '5000')),
+        ('5000 per month, 2 days', ('5000', '5000')),
+        ('3 workers needed, 2000 - 2500', ('2000', '2500')),
+        ('8 hours', (None, None)),
+        ('Negotiable', (None, None)),
+        ('', (None, None)),
+        (None, (None, None)),
+    ]
+
+    def test_parse_salary(self):
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                expected = tuple(Decimal(value) if value else None for value in expected)
+                self.assertEqual(parse_salary(text), expected)
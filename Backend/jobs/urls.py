@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import ServiceCategoryListCreateView, JobListCreateView, JobDetailView
+from .views import ServiceCategoryListCreateView, JobListCreateView, MyJobListView, JobDetailView
 
 urlpatterns = [
     path("jobs/categories/", ServiceCategoryListCreateView.as_view(), name="category_list_create"),
     path("jobs/", JobListCreateView.as_view(), name="job_list_create"),
+    path("jobs/my/", MyJobListView.as_view(), name="my_jobs"),
     path("jobs/<int:pk>/", JobDetailView.as_view(), name="job_detail"),
 ]
@@ -1,6 +1,7 @@
 from .models import ServiceCategory, Job
+from .filters import JobFilter
 from .serializers import ServiceCategorySerializer, JobSerializer
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 
 
@@ -9,37 +10,72 @@ from rest_framework import status
 
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
+from backend.filters import KeysetOrderingFilter
+from backend.pagination import CreatedAtCursorPagination
+from backend.fieldsets import SparseFieldsetMixin, expanded_labels
+from backend.conditional import conditional, versioned_state
+from backend.db_router import ReplicaReadMixin
+from backend.response_cache import cache_response, get_versions
+from backend.values import ValuesListMixin
+from geo.filters import ProximityFilter
+from search.filters import FullTextSearchFilter
 
-class JobListCreateView(generics.ListCreateAPIView):
+
+# Conditional GET validators; category names are embedded in job payloads,
+# so every job validator also carries the category version, and the user
+# version when ?expand=created_by embeds the poster. Lists are
+# validated by model versions alone: aggregating the filtered table on every
+# request would cost more than the cached response it guards.
+def job_list_state(view, request, *args, **kwargs):
+    labels = ['jobs.Job', 'jobs.ServiceCategory', *expanded_labels(view.get_serializer_class(), request)]
+    return versioned_state(request, labels, request.user.id)
+
+
+def job_state(view, request, pk, **kwargs):
+    updated_at = Job.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    labels = ['jobs.ServiceCategory', *expanded_labels(view.get_serializer_class(), request)]
+    return [pk, updated_at, *get_versions(labels)], updated_at
+
+
+def category_list_state(view, request, *args, **kwargs):
+    return get_versions(['jobs.ServiceCategory']), None
+
+
+class JobListCreateView(ReplicaReadMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
     
     def get_queryset(self):
         """
         Return all jobs ordered by most recent first
         """
         try:
-            return Job.objects.all().order_by('-created_at')
+            return Job.objects.select_related('category').order_by('-created_at', '-id')
         except Exception as e:
             raise ValidationError(detail=str(e))
 
+    @conditional(job_list_state)
+    @cache_response('jobs.Job', 'jobs.ServiceCategory')
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            return super().list(request, *args, **kwargs)
+        except APIException:
+            raise
         except Exception as e:
             return Response(
                 {"detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ["status"]                # filter by status
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, ProximityFilter, KeysetOrderingFilter]
+    filterset_class = JobFilter  # category, active flag and pay range
     search_fields = ["title", "description"]     # search by title/description
-    ordering_fields = ["created_at", "updated_at"]
-    ordering = ["-created_at"]                   # default newest first
+    ordering_fields = ["created_at", "updated_at", "salary_min", "salary_max"]
+    ordering = ["-created_at", "-id"]            # default newest first
 
     def create(self, request, *args, **kwargs):
         try:
@@ -71,19 +107,47 @@ class JobListCreateView(generics.ListCreateAPIView):
             )
 
     def perform_create(self, serializer, category):
-        serializer.save(created_by=self.request.user, category=category)
+        location = serializer.validated_data.get('location') or self.request.user.location
+        serializer.save(created_by=self.request.user, category=category, location=location)
+
+
 
+# Jobs posted by the current user
+class MyJobListView(ValuesListMixin, generics.ListAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend, KeysetOrderingFilter]
+    filterset_class = JobFilter
+    ordering_fields = ["created_at", "updated_at", "salary_min", "salary_max"]
+    ordering = ["-created_at", "-id"]
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user).order_by('-created_at', '-id')
+
+    @conditional(job_list_state)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 
 # Category List + Create
-class ServiceCategoryListCreateView(generics.ListCreateAPIView):
+class ServiceCategoryListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     queryset = ServiceCategory.objects.all()
     serializer_class = ServiceCategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    @conditional(category_list_state)
+    @cache_response('jobs.ServiceCategory')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 # Job Detail (Retrieve, Update, Delete)
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.all()
+class JobDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Job.objects.select_related('category')
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    @conditional(job_state)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
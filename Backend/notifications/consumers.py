@@ -0,0 +1,43 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .services import get_unread_count, notification_group_name
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Per-user push channel for new notifications and unread count changes.
+    The current unread count is sent right after connecting so clients do not
+    need an initial REST round trip.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.group_name = notification_group_name(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_json({
+            "type": "unread_count",
+            "unread_count": await database_sync_to_async(get_unread_count)(user.id),
+        })
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def notification_created(self, event):
+        await self.send_json({
+            "type": "notification",
+            "notification": event["notification"],
+            "unread_count": event["unread_count"],
+        })
+
+    async def notification_unread_count(self, event):
+        await self.send_json({
+            "type": "unread_count",
+            "unread_count": event["unread_count"],
+        })
@@ -0,0 +1,133 @@
+"""
+Per-user unread notification counters kept in Django's cache.
+
+Writers wrap every change to a user's unread rows in ``unread_count_change``;
+readers call ``get_unread_count``. A cached counter is only ever filled from
+the database while no write for that user is in flight, and a fill that
+overlaps a write is thrown away, so the counter cannot drift from the table:
+a write either lands in the count the reader saw or is applied to the
+counter afterwards, never both and never neither.
+
+Use a shared backend (Redis) when running several worker processes; the
+local-memory backend keeps one counter per process.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from backend.db_router import primary_reads
+
+from .models import Notification
+
+UNREAD_COUNT_TTL = getattr(settings, 'NOTIFICATION_UNREAD_COUNT_TTL', 60 * 60)
+
+# Bounds how long a writer that never finished (e.g. a rolled back
+# transaction) keeps readers on the database path
+IN_FLIGHT_TTL = 60
+
+
+def _count_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _generation_key(user_id):
+    return f'notifications:unread:{user_id}:generation'
+
+
+def _in_flight_key(user_id):
+    return f'notifications:unread:{user_id}:in-flight'
+
+
+def _incr(key, timeout=None):
+    cache.add(key, 0, timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.add(key, 1, timeout)
+
+
+def _decr(key):
+    try:
+        cache.decr(key)
+    except ValueError:
+        pass
+
+
+def count_unread_in_db(user_id):
+    return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+
+def get_unread_count(user_id):
+    """Unread notifications for ``user_id``, from the cache when possible"""
+    count = cache.get(_count_key(user_id))
+    if count is not None:
+        return count
+
+    generation = cache.get(_generation_key(user_id), 0)
+    quiet = not cache.get(_in_flight_key(user_id))
+    # The fill is shared until the next write; a lagging replica would skew it
+    with primary_reads():
+        count = count_unread_in_db(user_id)
+    if quiet and cache.add(_count_key(user_id), count, UNREAD_COUNT_TTL):
+        # A write started while we were counting: our number may or may not
+        # include it, so drop it and let the next read count again
+        if cache.get(_generation_key(user_id), 0) != generation:
+            cache.delete(_count_key(user_id))
+    return count
+
+
+class UnreadCountChange:
+    delta = 0
+
+
+@contextmanager
+def unread_count_change(user_id):
+    """
+    Wrap a write that changes ``user_id``'s unread notifications and set
+    ``delta`` on the yielded object to the number of rows that became unread
+    (positive) or read/deleted (negative). The counter is adjusted once the
+    surrounding transaction commits.
+    """
+    change = UnreadCountChange()
+    _incr(_generation_key(user_id))
+    _incr(_in_flight_key(user_id), IN_FLIGHT_TTL)
+    try:
+        yield change
+    except BaseException:
+        _decr(_in_flight_key(user_id))
+        raise
+    transaction.on_commit(lambda: _finish_change(user_id, change.delta))
+
+
+def _finish_change(user_id, delta):
+    if delta:
+        try:
+            cache.incr(_count_key(user_id), delta)
+        except ValueError:
+            # Not cached; the next read fills it from the database
+            pass
+    _decr(_in_flight_key(user_id))
+
+
+def reconcile_unread_counts(user_ids):
+    """
+    Compare cached counters with the table for ``user_ids`` and drop the ones
+    that disagree so they are refilled from the database. Returns the number
+    of counters dropped.
+    """
+    keys = {_count_key(user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys)
+    if not cached:
+        return 0
+    counts = dict(
+        Notification.objects.filter(
+            recipient_id__in=[keys[key] for key in cached], is_read=False
+        ).values_list('recipient').annotate(count=Count('id')).order_by()
+    )
+    stale = [key for key, count in cached.items() if count != counts.get(keys[key], 0)]
+    cache.delete_many(stale)
+    return len(stale)
@@ -0,0 +1,107 @@
+"""
+Queued notification delivery.
+
+The chat send path only enqueues a PendingNotification row.
+``flush_notifications`` turns queued rows into Notification rows with one
+bulk_create per batch and deletes them in the same transaction, so a batch
+is either fully delivered or left queued for the next attempt (at least
+once). Rows are taken in id order, so each recipient receives notifications
+in the order they were sent.
+
+Run ``manage.py process_notifications --loop`` as the worker. With
+``NOTIFICATIONS_QUEUED = False`` every enqueue is flushed right after its
+transaction commits, which is handy in development.
+
+Messages are coalesced: while a recipient has an unread notification for a
+given sender and chat, further messages update that row in place (count,
+latest preview, timestamp) instead of adding new rows.
+"""
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import unread_count_change
+from .models import Notification, PendingNotification, describe_chat_notification
+from .services import push_notification
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def enqueue_notification(**fields):
+    """Queue a notification; see PendingNotification for the fields"""
+    pending = PendingNotification.objects.create(**fields)
+    if not getattr(settings, 'NOTIFICATIONS_QUEUED', True):
+        transaction.on_commit(flush_notifications)
+    return pending
+
+
+def flush_notifications(batch_size=DEFAULT_BATCH_SIZE):
+    """Deliver up to ``batch_size`` queued notifications; returns how many were taken"""
+    with ExitStack() as stack:
+        with transaction.atomic():
+            pending = list(
+                PendingNotification.objects.select_for_update()
+                .select_related('sender', 'job', 'issue')
+                .order_by('id')[:batch_size]
+            )
+            if not pending:
+                return 0
+
+            # Fold the batch per (recipient, sender, chat), keeping send order
+            groups = {}
+            for item in pending:
+                groups.setdefault(item.coalesce_key, []).append(item)
+
+            # Unread rows the batch can be folded into; locked so a concurrent
+            # mark-read cannot swallow the messages added here
+            recipients = {item.recipient_id for item in pending}
+            existing = {}
+            for notification in (
+                Notification.objects.select_for_update()
+                .filter(recipient_id__in=recipients, is_read=False)
+                .order_by('created_at', 'id')
+            ):
+                existing[notification.coalesce_key] = notification
+
+            now = timezone.now()
+            created, updated = [], []
+            for key, items in groups.items():
+                latest = items[-1]
+                notification = existing.get(key)
+                if notification is None:
+                    notification = latest.build_notification()
+                    notification.message_count = len(items)
+                    created.append(notification)
+                else:
+                    notification.message_count += len(items)
+                    updated.append(notification)
+                notification.sender = latest.sender
+                notification.job = latest.job
+                notification.issue = latest.issue
+                notification.preview = latest.preview
+                notification.message = describe_chat_notification(notification)
+                notification.created_at = now
+
+            # Only new rows change unread counts; counters move after the commit
+            changes = {
+                recipient_id: stack.enter_context(unread_count_change(recipient_id))
+                for recipient_id in {notification.recipient_id for notification in created}
+            }
+            Notification.objects.bulk_create(created)
+            Notification.objects.bulk_update(updated, ['message_count', 'preview', 'message', 'created_at'])
+            PendingNotification.objects.filter(id__in=[item.id for item in pending]).delete()
+            for notification in created:
+                changes[notification.recipient_id].delta += 1
+
+    # Tell the open sockets once the batch has committed and been counted:
+    # right away in autocommit, or when a surrounding transaction commits
+    delivered = sorted(created + updated, key=lambda notification: notification.id)
+    transaction.on_commit(lambda: push_notifications(delivered))
+    return len(pending)
+
+
+def push_notifications(notifications):
+    for notification in notifications:
+        push_notification(notification)
@@ -0,0 +1,39 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.dispatcher import DEFAULT_BATCH_SIZE, flush_notifications
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        delivered = 0
+        while True:
+            try:
+                count = flush_notifications(batch_size)
+            except Exception:
+                # The batch stays queued and is retried on the next pass
+                if not options["loop"]:
+                    raise
+                logger.exception("Notification batch failed")
+                count = 0
+            delivered += count
+
+            if count < batch_size:
+                if not options["loop"]:
+                    break
+                if count == 0:
+                    time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Delivered {delivered} notifications"))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.retention import DEFAULT_BATCH_SIZE, count_expired, purge_notifications
+
+
+class Command(BaseCommand):
+    help = "Delete notifications past their retention age in small batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--read-days", type=int, help="Override the retention for read notifications")
+        parser.add_argument("--unread-days", type=int, help="Override the retention for unread notifications")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+        parser.add_argument("--archive", help="Append deleted rows to this gzipped JSON-lines file")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = count_expired(options["read_days"], options["unread_days"])
+            self.stdout.write(f"{count} notifications would be deleted")
+            return
+
+        def on_batch(deleted):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  deleted {deleted}")
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        total = purge_notifications(
+            read_days=options["read_days"],
+            unread_days=options["unread_days"],
+            batch_size=options["batch_size"],
+            archive_path=options["archive"],
+            on_batch=on_batch,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} notifications"))
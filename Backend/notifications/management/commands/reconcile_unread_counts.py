@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from notifications.counters import reconcile_unread_counts
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Drop cached unread-notification counters that disagree with the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        user_ids = User.objects.order_by("id").values_list("id", flat=True)
+
+        checked = dropped = 0
+        last_id = 0
+        while True:
+            batch = list(user_ids.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            dropped += reconcile_unread_counts(batch)
+            checked += len(batch)
+            last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} users, dropped {dropped} stale counters"
+        ))
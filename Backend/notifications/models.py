@@ -21,11 +21,77 @@ class Notification(models.Model):
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, null=True, blank=True)
     
     message = models.TextField()
+    # Unread messages from the same sender in the same chat are folded into
+    # one row: how many there are and the text of the latest one
+    message_count = models.PositiveIntegerField(default=1)
+    preview = models.TextField(blank=True, default='')
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        ordering = ['-created_at']
+        # id breaks ties between notifications dispatched in the same batch
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['recipient', 'is_read'], name='notif_recipient_unread_idx'),
+            # Cursor pagination of a user's notifications
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_created_idx'),
+            # Retention purges walk old rows oldest first
+            models.Index(fields=['is_read', 'created_at'], name='notif_read_created_idx'),
+        ]
+
+    @property
+    def coalesce_key(self):
+        """Unread notifications sharing this key are kept as a single row"""
+        return (self.recipient_id, self.sender_id, self.notification_type, self.job_id, self.issue_id)
     
     def __str__(self):
-        return f"Notification for {self.recipient.username}: {self.message[:50]}"
\ No newline at end of file
+        return f"Notification for {self.recipient.username}: {self.message[:50]}"
+
+
+class PendingNotification(models.Model):
+    """
+    A notification waiting in the dispatch queue. Request handlers only
+    insert these small rows; notifications.dispatcher turns them into
+    Notification rows in batches.
+    """
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    preview = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Pending {self.notification_type} for user {self.recipient_id}"
+
+    @property
+    def coalesce_key(self):
+        return (self.recipient_id, self.sender_id, self.notification_type, self.job_id, self.issue_id)
+
+    def build_notification(self):
+        return Notification(
+            recipient_id=self.recipient_id,
+            sender=self.sender,
+            notification_type=self.notification_type,
+            job=self.job,
+            issue=self.issue,
+        )
+
+
+def describe_chat_notification(notification):
+    """Human readable text for a (possibly coalesced) chat notification"""
+    if notification.job_id:
+        subject = f"job '{notification.job.title}'"
+    else:
+        subject = f"issue '{notification.issue.title}'"
+    sender = notification.sender.username
+    if notification.message_count == 1:
+        return f"New private message from {sender} on {subject}: {notification.preview[:50]}..."
+    return (
+        f"{notification.message_count} new private messages from {sender} on {subject}. "
+        f"Latest: {notification.preview[:50]}..."
+    )
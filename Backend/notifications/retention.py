@@ -0,0 +1,93 @@
+"""
+Retention for notifications: rows older than the configured age are
+deleted in small batches, each in its own short transaction, so purging a
+large backlog never holds the write lock for long.
+"""
+import gzip
+import json
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .counters import unread_count_change
+from .models import Notification
+
+DEFAULT_RETENTION_DAYS = {'read': 30, 'unread': None}
+DEFAULT_BATCH_SIZE = 1000
+
+ARCHIVE_FIELDS = [
+    'id', 'recipient_id', 'sender_id', 'notification_type', 'job_id', 'issue_id',
+    'message', 'message_count', 'preview', 'is_read', 'created_at',
+]
+
+
+def retention_cutoffs(read_days=None, unread_days=None):
+    """{is_read: cutoff datetime} for every policy that is enabled"""
+    policy = {**DEFAULT_RETENTION_DAYS, **getattr(settings, 'NOTIFICATION_RETENTION_DAYS', {})}
+    if read_days is not None:
+        policy['read'] = read_days
+    if unread_days is not None:
+        policy['unread'] = unread_days
+    now = timezone.now()
+    return {
+        is_read: now - timedelta(days=policy[key])
+        for is_read, key in ((True, 'read'), (False, 'unread'))
+        if policy[key] is not None
+    }
+
+
+def expired(is_read, cutoff):
+    # Served by the (is_read, created_at) index, oldest first
+    return Notification.objects.filter(is_read=is_read, created_at__lt=cutoff).order_by('created_at', 'id')
+
+
+def purge_batch(is_read, cutoff, batch_size=DEFAULT_BATCH_SIZE, archive=None):
+    """Delete one batch of expired notifications; returns how many were deleted"""
+    with ExitStack() as stack:
+        with transaction.atomic():
+            ids = list(expired(is_read, cutoff).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return 0
+            batch = Notification.objects.filter(id__in=ids)
+            if archive is not None:
+                for row in batch.order_by('id').values(*ARCHIVE_FIELDS):
+                    archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+            if not is_read:
+                # Deleting unread rows lowers their recipients' unread counts
+                for row in batch.values('recipient_id').annotate(count=Count('id')).order_by():
+                    change = stack.enter_context(unread_count_change(row['recipient_id']))
+                    change.delta = -row['count']
+            return batch.delete()[0]
+
+
+def purge_notifications(read_days=None, unread_days=None, batch_size=DEFAULT_BATCH_SIZE,
+                        archive_path=None, on_batch=None):
+    """
+    Delete every notification past its retention age. With ``archive_path``
+    the deleted rows are first appended to a gzipped JSON-lines file.
+    Returns the number of rows deleted.
+    """
+    total = 0
+    with ExitStack() as stack:
+        archive = stack.enter_context(gzip.open(archive_path, 'at')) if archive_path else None
+        for is_read, cutoff in retention_cutoffs(read_days, unread_days).items():
+            while True:
+                deleted = purge_batch(is_read, cutoff, batch_size, archive)
+                if not deleted:
+                    break
+                total += deleted
+                if on_batch:
+                    on_batch(deleted)
+    return total
+
+
+def count_expired(read_days=None, unread_days=None):
+    return sum(
+        expired(is_read, cutoff).count()
+        for is_read, cutoff in retention_cutoffs(read_days, unread_days).items()
+    )
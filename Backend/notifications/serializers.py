@@ -1,16 +1,18 @@
 from rest_framework import serializers
+from users.serializers import ProfileThumbnailField
 from .models import Notification
 
 class NotificationSerializer(serializers.ModelSerializer):
     sender_username = serializers.CharField(source='sender.username', read_only=True)
+    sender_profile_picture = ProfileThumbnailField('small', source='sender.profile_thumbnails')
     job_title = serializers.CharField(source='job.title', read_only=True)
     issue_title = serializers.CharField(source='issue.title', read_only=True)
     
     class Meta:
         model = Notification
         fields = [
-            'id', 'notification_type', 'message', 'is_read', 
-            'created_at', 'sender_username', 'job_title', 'issue_title',
+            'id', 'notification_type', 'message', 'message_count', 'preview',
+            'is_read', 'created_at', 'sender_username', 'sender_profile_picture', 'job_title', 'issue_title',
             'job', 'issue'
         ]
         read_only_fields = ['sender', 'created_at']
\ No newline at end of file
@@ -0,0 +1,43 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from .counters import get_unread_count
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def notification_group_name(user_id):
+    """Channel layer group every notification socket of a user joins"""
+    return f"notifications_{user_id}"
+
+
+def push_notification(notification):
+    """Push a freshly created notification and the new unread count"""
+    _group_send(notification.recipient_id, {
+        "type": "notification.created",
+        "notification": NotificationSerializer(notification).data,
+        "unread_count": get_unread_count(notification.recipient_id),
+    })
+
+
+def push_unread_count(user_id):
+    """Push the current unread count, e.g. after notifications were marked read"""
+    _group_send(user_id, {
+        "type": "notification.unread_count",
+        "unread_count": get_unread_count(user_id),
+    })
+
+
+def _group_send(user_id, event):
+    # Pushing is best effort: clients fall back to the REST endpoints, so an
+    # unreachable channel layer must never fail the write that triggered it.
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(notification_group_name(user_id), event)
+    except Exception:
+        logger.exception("Could not push notification event to user %s", user_id)
@@ -0,0 +1,243 @@
+import random
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+
+from jobs.models import Job, ServiceCategory
+from users.models import User
+from .counters import count_unread_in_db, get_unread_count, unread_count_change
+from .dispatcher import flush_notifications
+from .models import Notification, PendingNotification
+
+
+class UnreadCounterConcurrencyTests(TestCase):
+    """
+    Interleave counter writes, commits, reads and cache evictions the way
+    concurrent requests can, and check the cached counter never drifts from
+    the table. Commits are simulated by holding back each write's on_commit
+    callback until the test decides the write commits.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+        self.sender = User.objects.create_user('sender', 'sender@example.com', 'pw')
+        self.uncommitted = []
+        patcher = mock.patch('notifications.counters.transaction.on_commit', side_effect=self.uncommitted.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def db_count(self):
+        return Notification.objects.filter(recipient=self.user, is_read=False).count()
+
+    def create(self):
+        with unread_count_change(self.user.id) as change:
+            Notification.objects.create(
+                recipient=self.user, sender=self.sender, notification_type='job_message', message='m',
+            )
+            change.delta = 1
+
+    def mark_one_read(self):
+        notification = Notification.objects.filter(recipient=self.user, is_read=False).first()
+        if notification is None:
+            return
+        with unread_count_change(self.user.id) as change:
+            change.delta = -Notification.objects.filter(id=notification.id, is_read=False).update(is_read=True)
+
+    def mark_all_read(self):
+        with unread_count_change(self.user.id) as change:
+            change.delta = -Notification.objects.filter(recipient=self.user, is_read=False).update(is_read=True)
+
+    def commit(self, index=0):
+        self.uncommitted.pop(index)()
+
+    def commit_all(self):
+        while self.uncommitted:
+            self.commit()
+
+    def assertCounterMatches(self):
+        self.assertEqual(get_unread_count(self.user.id), self.db_count())
+
+    def test_read_while_write_in_flight(self):
+        self.create()
+        # The write has not committed: the reader must not cache its count
+        get_unread_count(self.user.id)
+        self.commit_all()
+        self.assertCounterMatches()
+
+    def test_write_starts_and_commits_during_fill(self):
+        self.create()
+        self.commit_all()
+        cache.clear()
+
+        def count_then_write(user_id):
+            count = count_unread_in_db(user_id)
+            # Another request writes and commits between the reader's COUNT
+            # and its cache fill
+            self.create()
+            self.commit_all()
+            return count
+
+        with mock.patch('notifications.counters.count_unread_in_db', side_effect=count_then_write):
+            get_unread_count(self.user.id)
+        self.assertCounterMatches()
+
+    def test_mark_read_commits_during_fill(self):
+        for _ in range(3):
+            self.create()
+        self.commit_all()
+        cache.clear()
+
+        def count_then_mark_read(user_id):
+            count = count_unread_in_db(user_id)
+            self.mark_all_read()
+            self.commit_all()
+            return count
+
+        with mock.patch('notifications.counters.count_unread_in_db', side_effect=count_then_mark_read):
+            get_unread_count(self.user.id)
+        self.assertCounterMatches()
+
+    def test_random_interleavings(self):
+        writes = [self.create, self.create, self.mark_one_read, self.mark_all_read]
+        for seed in range(20):
+            rng = random.Random(seed)
+            for step in range(60):
+                action = rng.random()
+                if action < 0.4:
+                    rng.choice(writes)()
+                elif action < 0.65 and self.uncommitted:
+                    self.commit(rng.randrange(len(self.uncommitted)))
+                elif action < 0.9:
+                    get_unread_count(self.user.id)
+                else:
+                    cache.delete(f'notifications:unread:{self.user.id}')
+                if not self.uncommitted:
+                    with self.subTest(seed=seed, step=step):
+                        self.assertCounterMatches()
+            self.commit_all()
+            with self.subTest(seed=seed):
+                self.assertCounterMatches()
+
+
+class FlushNotificationsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.recipient = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.sender = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        category = ServiceCategory.objects.create(name='Plumbing')
+        self.job = Job.objects.create(
+            title='Leaking tap', description='', category=category, created_by=self.recipient,
+        )
+        patcher = mock.patch('notifications.dispatcher.push_notification')
+        self.push = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def enqueue(self, preview, sender=None):
+        PendingNotification.objects.create(
+            recipient=self.recipient, sender=sender or self.sender, notification_type='job_message',
+            job=self.job, preview=preview,
+        )
+
+    def flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return flush_notifications()
+
+    def test_batch_is_folded_per_sender_and_chat(self):
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.enqueue('first')
+        self.enqueue('hello', sender=other)
+        self.enqueue('second')
+        self.assertEqual(self.flush(), 3)
+
+        self.assertFalse(PendingNotification.objects.exists())
+        folded = Notification.objects.get(sender=self.sender)
+        self.assertEqual((folded.message_count, folded.preview), (2, 'second'))
+        self.assertTrue(folded.message.startswith("2 new private messages from worker on job 'Leaking tap'"))
+        self.assertEqual(Notification.objects.get(sender=other).message_count, 1)
+        self.assertEqual(self.push.call_count, 2)
+
+    def test_messages_merge_into_the_unread_row(self):
+        self.enqueue('first')
+        self.flush()
+        notification = Notification.objects.get()
+
+        self.enqueue('second')
+        self.enqueue('third')
+        self.flush()
+        merged = Notification.objects.get()
+        self.assertEqual(merged.id, notification.id)
+        self.assertEqual((merged.message_count, merged.preview), (3, 'third'))
+        self.assertGreater(merged.created_at, notification.created_at)
+        self.push.assert_called_with(merged)
+
+    def test_read_row_starts_a_new_notification(self):
+        self.enqueue('first')
+        self.flush()
+        Notification.objects.update(is_read=True)
+
+        self.enqueue('second')
+        self.flush()
+        unread = Notification.objects.get(is_read=False)
+        self.assertEqual((unread.message_count, unread.preview), (1, 'second'))
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_only_new_rows_change_the_unread_counter(self):
+        # Cache the counter so the flushes have to adjust it
+        self.assertEqual(get_unread_count(self.recipient.id), 0)
+        self.enqueue('first')
+        self.flush()
+        self.assertEqual(get_unread_count(self.recipient.id), 1)
+
+        self.enqueue('second')
+        self.flush()
+        self.assertEqual(get_unread_count(self.recipient.id), 1)
+
+        with self.captureOnCommitCallbacks(execute=True), unread_count_change(self.recipient.id) as change:
+            change.delta = -Notification.objects.update(is_read=True)
+        self.enqueue('third')
+        self.flush()
+        self.assertEqual(get_unread_count(self.recipient.id), 1)
+        self.assertEqual(count_unread_in_db(self.recipient.id), 1)
+
+    def test_queue_is_delivered_in_batches(self):
+        for i in range(3):
+            self.enqueue('hello', sender=User.objects.create_user(f'sender{i}', f'sender{i}@example.com', 'pw'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_notifications(batch_size=2), 2)
+        self.assertEqual(PendingNotification.objects.count(), 1)
+        self.assertEqual(self.push.call_count, 2)
+
+        self.assertEqual(self.flush(), 1)
+        self.assertEqual(self.flush(), 0)
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertEqual(self.push.call_count, 3)
+
+    def test_failed_batch_stays_queued(self):
+        self.enqueue('first')
+        self.flush()
+        self.enqueue('second')
+        self.enqueue('hello', sender=User.objects.create_user('other', 'other@example.com', 'pw'))
+
+        with mock.patch.object(Notification.objects, 'bulk_update', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.flush()
+        self.assertEqual(PendingNotification.objects.count(), 2)
+        self.assertEqual(Notification.objects.get().message_count, 1)
+        self.assertEqual(self.push.call_count, 1)
+
+    def test_nothing_is_pushed_when_the_transaction_rolls_back(self):
+        self.assertEqual(get_unread_count(self.recipient.id), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.enqueue('first')
+                self.assertEqual(flush_notifications(), 1)
+                raise RuntimeError
+        self.push.assert_not_called()
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(get_unread_count(self.recipient.id), 0)
@@ -1,50 +1,76 @@
+from django.db import transaction
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from backend.conditional import conditional, queryset_state
+from backend.db_router import ReplicaReadMixin
+from backend.pagination import CreatedAtCursorPagination
+from backend.values import ValuesListMixin
 from .models import Notification
 from .serializers import NotificationSerializer
+from .counters import get_unread_count, unread_count_change
+from .services import push_unread_count
 
-class NotificationListView(generics.ListAPIView):
+
+# Conditional GET validators. Coalescing moves created_at forward and
+# purging changes the count; marking read shows up in the unread count.
+def notification_list_state(view, request, *args, **kwargs):
+    etag_parts, last_modified = queryset_state(view.get_queryset(), 'created_at')
+    return [request.user.id, get_unread_count(request.user.id), *etag_parts], last_modified
+
+
+def unread_count_state(view, request, *args, **kwargs):
+    return [request.user.id, get_unread_count(request.user.id)], None
+
+class NotificationListView(ReplicaReadMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
-        return Notification.objects.filter(recipient=self.request.user)
+        return Notification.objects.filter(recipient=self.request.user).select_related('sender', 'job', 'issue')
 
+    @conditional(notification_list_state)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
-class UnreadNotificationCountView(APIView):
+
+class UnreadNotificationCountView(ReplicaReadMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(unread_count_state)
     def get(self, request):
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        return Response({'unread_count': count})
+        return Response({'unread_count': get_unread_count(request.user.id)})
 
 
 class MarkNotificationReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, notification_id):
-        try:
-            notification = Notification.objects.get(
-                id=notification_id,
-                recipient=request.user
-            )
-            notification.is_read = True
-            notification.save()
-            return Response({'success': True})
-        except Notification.DoesNotExist:
+        notifications = Notification.objects.filter(
+            id=notification_id,
+            recipient=request.user
+        )
+        with unread_count_change(request.user.id) as change:
+            change.delta = -notifications.filter(is_read=False).update(is_read=True)
+
+        if change.delta:
+            transaction.on_commit(lambda: push_unread_count(request.user.id))
+        elif not notifications.exists():
             return Response({'error': 'Notification not found'}, status=404)
+        return Response({'success': True})
 
 
 class MarkAllNotificationsReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
+        with unread_count_change(request.user.id) as change:
+            change.delta = -Notification.objects.filter(
+                recipient=request.user,
+                is_read=False
+            ).update(is_read=True)
+
+        if change.delta:
+            transaction.on_commit(lambda: push_unread_count(request.user.id))
         return Response({'success': True})
\ No newline at end of file
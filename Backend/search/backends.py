@@ -0,0 +1,197 @@
+"""
+Pluggable full-text search backends.
+
+Every backend narrows a queryset to the rows matching the search terms and
+annotates them with ``search_rank`` (higher is more relevant), so list views
+and pagination do not care which engine answered. The backend is chosen by
+``settings.SEARCH_BACKEND``; when it cannot run on the configured database,
+``get_backend`` falls back to plain ``icontains`` matching.
+"""
+import operator
+import re
+from functools import reduce
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.utils.module_loading import import_string
+
+from .indexes import get_entry_model, get_index_fields, indexed_models
+
+DEFAULT_BACKEND = 'search.backends.SQLiteFTS5Backend'
+
+
+class BaseSearchBackend:
+
+    def is_available(self):
+        return True
+
+    def search(self, queryset, terms):
+        raise NotImplementedError
+
+    def index(self, instance, using=DEFAULT_DB_ALIAS):
+        """Add or refresh ``instance`` in the index"""
+
+    def remove(self, model, pk, using=DEFAULT_DB_ALIAS):
+        """Drop the row with primary key ``pk`` of ``model`` from the index"""
+
+    def create_index(self, model, using=DEFAULT_DB_ALIAS):
+        """Create the index structures for ``model``"""
+
+    def index_exists(self, model, using=DEFAULT_DB_ALIAS):
+        """Whether the index structures for ``model`` have been created"""
+        return True
+
+    def is_empty(self, model, using=DEFAULT_DB_ALIAS):
+        """Whether the index holds no rows of ``model`` yet"""
+        return False
+
+    def rebuild(self, model, using=DEFAULT_DB_ALIAS):
+        """Re-index every row of ``model``; returns the number of rows indexed"""
+        return 0
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Unranked ``icontains`` matching, the behaviour of DRF's SearchFilter"""
+
+    def search(self, queryset, terms):
+        fields = get_index_fields(queryset.model)
+        for term in terms:
+            queryset = queryset.filter(reduce(
+                operator.or_, (Q(**{f'{field}__icontains': term}) for field in fields)
+            ))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    One FTS5 virtual table per indexed model, keyed by the model's primary
+    key as rowid and joined back through the unmanaged entry models. Results
+    are ranked by bm25 with earlier fields weighted higher. Terms are matched
+    as prefixes and all of them must match.
+    """
+    _available = None
+
+    def is_available(self):
+        if connection.vendor != 'sqlite':
+            return False
+        if SQLiteFTS5Backend._available is None:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)')
+                    cursor.execute('DROP TABLE temp.fts5_probe')
+                SQLiteFTS5Backend._available = True
+            except OperationalError:
+                SQLiteFTS5Backend._available = False
+        return SQLiteFTS5Backend._available
+
+    @staticmethod
+    def table_name(model):
+        return get_entry_model(model)._meta.db_table
+
+    @staticmethod
+    def match_expression(terms):
+        # Quote every term so user input can never be read as FTS5 syntax
+        tokens = [token for term in terms for token in re.findall(r'\w+', term)]
+        return ' '.join('"%s"*' % token for token in tokens)
+
+    def search(self, queryset, terms):
+        match = self.match_expression(terms)
+        if not match:
+            return queryset.none()
+        # bm25 scores are lower for better matches
+        return queryset.filter(search_entry__document__match=match).annotate(
+            search_rank=ExpressionWrapper(-F('search_entry__rank'), output_field=FloatField())
+        )
+
+    def index(self, instance, using=DEFAULT_DB_ALIAS):
+        model = type(instance)
+        fields = get_index_fields(model)
+        table = self.table_name(model)
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [instance.pk])
+            cursor.execute(
+                f'INSERT INTO {table} (rowid, {", ".join(fields)}) VALUES (%s, {", ".join(["%s"] * len(fields))})',
+                [instance.pk, *[getattr(instance, field) or '' for field in fields]],
+            )
+
+    def remove(self, model, pk, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table_name(model)} WHERE rowid = %s', [pk])
+
+    def create_index(self, model, using=DEFAULT_DB_ALIAS):
+        fields = get_index_fields(model)
+        table = self.table_name(model)
+        weights = ', '.join(str(float(len(fields) - i)) for i in range(len(fields)))
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({", ".join(fields)})')
+            # Make the table's rank column use our per-field weights
+            cursor.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('rank', 'bm25({weights})')")
+
+    def index_exists(self, model, using=DEFAULT_DB_ALIAS):
+        return self.table_name(model) in connections[using].introspection.table_names()
+
+    def is_empty(self, model, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {self.table_name(model)})')
+            return not cursor.fetchone()[0]
+
+    def rebuild(self, model, using=DEFAULT_DB_ALIAS):
+        fields = get_index_fields(model)
+        table = self.table_name(model)
+        columns = ', '.join(fields)
+        source = ', '.join(f'COALESCE("{model._meta.get_field(field).column}", \'\')' for field in fields)
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table}')
+            cursor.execute(
+                f'INSERT INTO {table} (rowid, {columns}) '
+                f'SELECT "{model._meta.pk.column}", {source} FROM "{model._meta.db_table}"'
+            )
+            return cursor.rowcount
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Ranks with Postgres ``tsvector``/``tsquery``. Vectors are computed from
+    the indexed columns at query time, so save/delete need no extra work;
+    back them with a GIN expression index for large tables.
+    """
+    weights = ['A', 'B', 'C', 'D']
+
+    def is_available(self):
+        return connection.vendor == 'postgresql'
+
+    def search(self, queryset, terms):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        fields = get_index_fields(queryset.model)
+        vector = reduce(operator.add, (
+            SearchVector(field, weight=self.weights[min(i, 3)]) for i, field in enumerate(fields)
+        ))
+        query = SearchQuery(' '.join(terms), search_type='websearch')
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, query),
+        ).filter(search_vector=query)
+
+
+_backend = None
+
+
+def get_backend():
+    """The configured backend, or the ``icontains`` fallback if it cannot run"""
+    global _backend
+    if _backend is None:
+        backend = import_string(getattr(settings, 'SEARCH_BACKEND', DEFAULT_BACKEND))()
+        _backend = backend if backend.is_available() else LikeSearchBackend()
+    return _backend
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """Rebuild every model's index; returns {model label: rows indexed}"""
+    backend = get_backend()
+    counts = {}
+    for model, _ in indexed_models():
+        backend.create_index(model, using)
+        counts[model._meta.label] = backend.rebuild(model, using)
+    return counts
@@ -0,0 +1,16 @@
+from rest_framework.filters import SearchFilter
+
+from .backends import get_backend
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter (same ``?search=`` parameter)
+    that answers from the full-text index and annotates ``search_rank``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_backend().search(queryset, terms)
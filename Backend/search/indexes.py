@@ -0,0 +1,22 @@
+from django.apps import apps
+
+# Models kept in the full-text index: the text fields indexed for each, in
+# weight order (earlier fields rank higher), and the model mapping its FTS5 table
+SEARCH_INDEXES = {
+    'jobs.Job': (['title', 'description'], 'search.JobSearchEntry'),
+    'issues.Issue': (['title', 'description'], 'search.IssueSearchEntry'),
+}
+
+
+def indexed_models():
+    """Yield (model, fields) for every indexed model"""
+    for label, (fields, _) in SEARCH_INDEXES.items():
+        yield apps.get_model(label), fields
+
+
+def get_index_fields(model):
+    return SEARCH_INDEXES[model._meta.label][0]
+
+
+def get_entry_model(model):
+    return apps.get_model(SEARCH_INDEXES[model._meta.label][1])
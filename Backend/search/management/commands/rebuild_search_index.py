@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from search.backends import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for jobs and issues"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to rebuild")
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        for label, count in rebuild_index(options["database"]).items():
+            self.stdout.write(f"{label}: {count} rows indexed")
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt ({type(backend).__name__})"))
@@ -0,0 +1,50 @@
+from django.db import OperationalError, migrations, transaction
+
+# Frozen copy of the FTS5 layout: one table per indexed model, its columns in
+# weight order. The rows are filled by the post_migrate hook in search.apps
+# (or ``manage.py rebuild_search_index``), never from here.
+FTS_TABLES = {
+    'search_job_fts': ['title', 'description'],
+    'search_issue_fts': ['title', 'description'],
+}
+
+
+def fts5_available(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return False
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)')
+            schema_editor.execute('DROP TABLE temp.fts5_probe')
+    except OperationalError:
+        return False
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    # Other databases search without these tables (see search.backends)
+    if not fts5_available(schema_editor):
+        return
+    for table, columns in FTS_TABLES.items():
+        weights = ', '.join(str(float(len(columns) - i)) for i in range(len(columns)))
+        schema_editor.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({", ".join(columns)})')
+        schema_editor.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('rank', 'bm25({weights})')")
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in FTS_TABLES:
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_created_at_index'),
+        ('issues', '0003_created_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:08
+
+import django.db.models.deletion
+import search.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_created_at_index'),
+        ('jobs', '0003_created_at_index'),
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueSearchEntry',
+            fields=[
+                ('issue', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='issues.issue')),
+                ('document', search.models.FTSDocumentField(db_column='search_issue_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'search_issue_fts',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSearchEntry',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='jobs.job')),
+                ('document', search.models.FTSDocumentField(db_column='search_job_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'search_job_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import models
+from django.db.models import Lookup
+
+from issues.models import Issue
+from jobs.models import Job
+
+
+class FTSDocumentField(models.TextField):
+    """
+    The hidden column named after an FTS5 table; matching against it
+    searches every indexed column of the row.
+    """
+
+
+@FTSDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+# Unmanaged views of the SQLite FTS5 tables (created by migration 0001,
+# keyed by the indexed row's primary key as rowid). They exist only so search
+# results can be joined to their rows and ranked in a single query.
+
+class JobSearchEntry(models.Model):
+    job = models.OneToOneField(
+        Job, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_entry',
+    )
+    document = FTSDocumentField(db_column='search_job_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'search_job_fts'
+
+
+class IssueSearchEntry(models.Model):
+    issue = models.OneToOneField(
+        Issue, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_entry',
+    )
+    document = FTSDocumentField(db_column='search_issue_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'search_issue_fts'
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+
+from .backends import get_backend
+from .indexes import indexed_models
+
+
+def update_index(sender, instance, using, **kwargs):
+    get_backend().index(instance, using)
+
+
+def remove_from_index(sender, instance, using, **kwargs):
+    get_backend().remove(sender, instance.pk, using)
+
+
+def populate_index(sender, using, **kwargs):
+    """
+    Fill an index the migration has just created from the rows already in
+    the table; afterwards the save/delete signals keep it current.
+    """
+    backend = get_backend()
+    for model, _ in indexed_models():
+        unfilled = backend.index_exists(model, using) and backend.is_empty(model, using)
+        if unfilled and model._default_manager.using(using).exists():
+            backend.rebuild(model, using)
+
+
+for model, _ in indexed_models():
+    post_save.connect(update_index, sender=model, dispatch_uid=f'search_index_{model._meta.label}')
+    post_delete.connect(remove_from_index, sender=model, dispatch_uid=f'search_remove_{model._meta.label}')
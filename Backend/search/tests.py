@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import Job, ServiceCategory
+from users.models import User
+from .backends import LikeSearchBackend, SQLiteFTS5Backend, get_backend
+from .models import JobSearchEntry
+from .signals import populate_index
+
+
+class FullTextSearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.category = ServiceCategory.objects.create(name='Plumbing')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def job(self, title, description=''):
+        return Job.objects.create(title=title, description=description, category=self.category, created_by=self.owner)
+
+    def search(self, term):
+        response = self.client.get('/api/jobs/', {'search': term, 'fields': 'id'})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_fts5_backend_is_used(self):
+        self.assertIsInstance(get_backend(), SQLiteFTS5Backend)
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_title = self.job('Leaking tap', 'Kitchen sink')
+        in_description = self.job('Kitchen work', 'The tap is leaking')
+        unrelated = self.job('Paint the fence')
+        # The title match is older: only its rank can put it first
+        self.assertEqual(self.search('leak'), [in_title.id, in_description.id])
+        self.assertNotIn(unrelated.id, self.search('tap'))
+
+    def test_every_term_must_match(self):
+        job = self.job('Leaking tap', 'Kitchen sink')
+        self.assertEqual(self.search('leak sink'), [job.id])
+        self.assertEqual(self.search('leak roof'), [])
+
+    def test_fts5_syntax_in_input_is_matched_literally(self):
+        job = self.job('Leaking tap')
+        self.assertEqual(self.search('tap" OR "x'), [])
+        self.assertEqual(self.search('"leaking"'), [job.id])
+
+    def test_index_follows_saves_and_deletes(self):
+        job = self.job('Leaking tap')
+        self.assertEqual(self.search('leaking'), [job.id])
+
+        job.title = 'Broken window'
+        job.save()
+        cache.clear()
+        self.assertEqual(self.search('leaking'), [])
+        self.assertEqual(self.search('window'), [job.id])
+
+        job_id = job.id
+        job.delete()
+        self.assertFalse(JobSearchEntry.objects.filter(pk=job_id).exists())
+
+    def test_populate_fills_an_empty_index(self):
+        job = self.job('Leaking tap')
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM search_job_fts')
+        populate_index(sender=None, using='default')
+        self.assertEqual(self.search('leaking'), [job.id])
+
+
+class LikeFallbackTests(TestCase):
+
+    def setUp(self):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        category = ServiceCategory.objects.create(name='Plumbing')
+        self.tap = Job.objects.create(title='Leaking TAP', description='', category=category, created_by=owner)
+        self.fence = Job.objects.create(
+            title='Paint', description='The garden fence', category=category, created_by=owner,
+        )
+
+    @override_settings(SEARCH_BACKEND='search.backends.PostgresSearchBackend')
+    def test_unavailable_backend_falls_back_to_like(self):
+        with mock.patch('search.backends._backend', None):
+            self.assertIsInstance(get_backend(), LikeSearchBackend)
+
+    def test_like_matches_substrings_in_any_field(self):
+        backend = LikeSearchBackend()
+        self.assertEqual(list(backend.search(Job.objects.all(), ['tap'])), [self.tap])
+        self.assertEqual(list(backend.search(Job.objects.all(), ['arden'])), [self.fence])
+        self.assertEqual(list(backend.search(Job.objects.all(), ['tap', 'fence'])), [])
+        self.assertEqual(backend.search(Job.objects.all(), ['tap']).get().search_rank, 0.0)
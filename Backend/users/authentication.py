@@ -0,0 +1,106 @@
+"""
+JWT authentication that resolves users from the cache.
+
+SimpleJWT's JWTAuthentication loads the user row on every request. Here the
+columns requests read (USER_CACHE_FIELDS) are cached for USER_CACHE_TTL
+seconds and dropped whenever the user is saved or deleted, so an
+authenticated request normally costs no queries at all. The password hash is
+never cached, only the md5 of it that revocable tokens are checked against;
+the other columns are deferred on the rebuilt user and load on first access.
+Writes that bypass signals (``QuerySet.update()``) must call
+``invalidate_user``; the TTL bounds how long they can go unnoticed.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_CACHE_TTL = getattr(settings, 'USER_CACHE_TTL', 5 * 60)
+
+# Columns read while handling requests: authentication, the profile and the
+# views that act as request.user. Keep secrets out of this list.
+USER_CACHE_FIELDS = (
+    'id', 'username', 'email', 'phone_number', 'location', 'latitude', 'longitude',
+    'profile_picture', 'profile_thumbnails', 'thumbnails_pending', 'selected_avatar',
+    'date_joined', 'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def _user_key(user_id):
+    return f'users:auth:{user_id}'
+
+
+def _load_user_row(user_id):
+    User = get_user_model()
+    users = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+    row = users.values(*USER_CACHE_FIELDS, 'password').first()
+    if row is not None:
+        row['password_md5'] = get_md5_hash_password(row.pop('password'))
+    return row
+
+
+def get_cached_user_row(user_id):
+    """The cached columns of the user whose USER_ID_FIELD is ``user_id``, or None"""
+    row = cache.get(_user_key(user_id))
+    if row is None:
+        row = _load_user_row(user_id)
+        if row is not None:
+            cache.set(_user_key(user_id), row, USER_CACHE_TTL)
+    return row
+
+
+def user_from_row(row):
+    """A User with the cached columns loaded and every other column deferred"""
+    User = get_user_model()
+    # from_db() takes the values in concrete field order
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in row]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [row[name] for name in names])
+
+
+def get_cached_user(user_id):
+    """The user whose USER_ID_FIELD is ``user_id``, or None"""
+    row = get_cached_user_row(user_id)
+    return user_from_row(row) if row is not None else None
+
+
+def invalidate_user(user_id):
+    cache.delete(_user_key(user_id))
+    # A request that read the old row before the commit may have cached it again
+    transaction.on_commit(lambda: cache.delete(_user_key(user_id)))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication with the user lookup served from the cache"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        row = get_cached_user_row(user_id)
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not row['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != row['password_md5']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user_from_row(row)
+
+
+def user_for_access_token(raw_token):
+    """The active user behind a raw access token, or None if either is invalid"""
+    authentication = CachedJWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
@@ -0,0 +1,148 @@
+"""
+In-process membership filter in front of the refresh-token blacklist.
+
+Every refresh used to ask the database whether the token was blacklisted.
+Each worker now keeps a Bloom filter of the jtis of unexpired blacklisted
+tokens: a token the filter has never seen skips the database entirely, and
+only possible members (real ones plus ~1% false positives) are confirmed
+with the usual query.
+
+The filter is built when the server process starts (``warm_up``, called
+from the ASGI/WSGI entry points) and then kept current incrementally,
+loading the rows blacklisted since the previous load. Loads overlap by
+LOAD_OVERLAP seconds, so a row whose transaction commits after a later one
+is still picked up; ids are not used because they do not commit in order.
+A load happens whenever the blacklist generation in the cache moves
+(bumped after every blacklisting) and at least every
+BLACKLIST_FILTER_REFRESH seconds, which bounds staleness when the cache is
+not shared between processes.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = getattr(settings, 'BLACKLIST_FILTER_REFRESH', 5)
+# Longest a blacklisting transaction (or clock skew between workers) may
+# take between stamping blacklisted_at and committing
+LOAD_OVERLAP = timedelta(seconds=60)
+ERROR_RATE = 0.01
+GENERATION_KEY = 'users:blacklist:generation'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        self.capacity = max(capacity, 1024)
+        self.size = int(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        if item in self:
+            # Overlapping loads see rows again; count each item once
+            return
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._loaded_at = None
+        self._generation = None
+        self._synced_at = 0.0
+
+    def _rebuild(self):
+        loaded_at = aware_utcnow()
+        # Expired tokens fail signature validation anyway, so leave them out
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=loaded_at).values_list('token__jti', flat=True)
+        )
+        bloom = BloomFilter(capacity=2 * len(jtis))
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom, self._loaded_at = bloom, loaded_at
+
+    def _load_new(self):
+        loaded_at = aware_utcnow()
+        jtis = BlacklistedToken.objects.filter(
+            blacklisted_at__gte=self._loaded_at - LOAD_OVERLAP,
+        ).values_list('token__jti', flat=True)
+        for jti in jtis:
+            self._bloom.add(jti)
+        self._loaded_at = loaded_at
+        if self._bloom.count > self._bloom.capacity:
+            # Past capacity the false-positive rate climbs; start over at a larger size
+            self._rebuild()
+
+    def _sync(self):
+        # Read the generation first so a bump during the load triggers another one
+        generation = cache.get(GENERATION_KEY)
+        now = time.monotonic()
+        if self._bloom is None:
+            self._rebuild()
+        elif generation != self._generation or now - self._synced_at > REFRESH_INTERVAL:
+            self._load_new()
+        else:
+            return
+        self._generation, self._synced_at = generation, now
+
+    def warm_up(self):
+        """Build the filter now rather than on the first refresh"""
+        try:
+            with self._lock:
+                self._sync()
+        except DatabaseError:
+            # Not migrated yet: the first check builds it instead
+            logger.warning("Could not build the token blacklist filter", exc_info=True)
+
+    def might_contain(self, jti):
+        """False means ``jti`` is certainly not blacklisted"""
+        with self._lock:
+            self._sync()
+            return jti in self._bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def bump_generation():
+    """Tell every process to load new blacklist rows on its next check"""
+    cache.add(GENERATION_KEY, 0, None)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, None)
@@ -0,0 +1,39 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.thumbnails import DEFAULT_BATCH_SIZE, process_thumbnails
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Render profile picture thumbnails for users with a new picture"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new pictures")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to wait when nothing is pending")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        processed = 0
+        while True:
+            try:
+                count = process_thumbnails(batch_size)
+            except Exception:
+                # The users stay flagged and are retried on the next pass
+                if not options["loop"]:
+                    raise
+                logger.exception("Thumbnail batch failed")
+                count = 0
+            processed += count
+
+            if count < batch_size:
+                if not options["loop"]:
+                    break
+                if count == 0:
+                    time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Processed thumbnails for {processed} users"))
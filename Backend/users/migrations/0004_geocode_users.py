@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from geo.gazetteer import geocode
+from geo.geohash import encode
+
+
+def geocode_users(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    locations = User.objects.exclude(location__isnull=True).exclude(location='').values_list('location', flat=True)
+    for location in locations.order_by().distinct():
+        point = geocode(location)
+        if point:
+            User.objects.filter(location=location).update(latitude=point[0], longitude=point[1], geohash=encode(*point))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_geocoded_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(geocode_users, migrations.RunPython.noop),
+    ]
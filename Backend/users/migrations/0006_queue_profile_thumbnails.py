@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def queue_thumbnails(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    users = User.objects.exclude(profile_picture__isnull=True).exclude(profile_picture='')
+    for user in users.only('id', 'profile_picture').iterator():
+        user.profile_thumbnails = {'source': user.profile_picture.name}
+        user.thumbnails_pending = True
+        user.save(update_fields=['profile_thumbnails', 'thumbnails_pending'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_profile_thumbnails'),
+    ]
+
+    operations = [
+        migrations.RunPython(queue_thumbnails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index the blacklist's blacklisted_at column (a third-party table), which
+    the in-process blacklist filter loads new rows by.
+    """
+
+    dependencies = [
+        ('users', '0006_queue_profile_thumbnails'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX token_blacklist_at_idx ON token_blacklist_blacklistedtoken (blacklisted_at)',
+            'DROP INDEX token_blacklist_at_idx',
+        ),
+    ]
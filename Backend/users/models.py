@@ -1,12 +1,41 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from geo.models import GeoLocated
 
-class User(AbstractUser):
+THUMBNAIL_FIELDS = ('profile_thumbnails', 'thumbnails_pending')
+
+
+class User(AbstractUser, GeoLocated):
     
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     location = models.CharField(max_length=200, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
     selected_avatar = models.CharField(max_length=20, blank=True, null=True)
+    # {'source': <profile_picture name>, <size>: <thumbnail name>, ...}, filled
+    # in by the thumbnail worker (see users.thumbnails)
+    profile_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+    thumbnails_pending = models.BooleanField(default=False, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=['id'], condition=models.Q(thumbnails_pending=True), name='users_thumbs_pending_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.username
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'profile_picture' in update_fields:
+            # Store a fresh upload now so its final name is known
+            picture = self._meta.get_field('profile_picture').pre_save(self, self._state.adding)
+            source = picture.name or ''
+            if source != self.profile_thumbnails.get('source', ''):
+                # Old thumbnails no longer apply; the worker renders new ones
+                self.profile_thumbnails = {'source': source} if source else {}
+                self.thumbnails_pending = True
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, *THUMBNAIL_FIELDS}
+        super().save(*args, **kwargs)
@@ -1,11 +1,46 @@
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from backend.fieldsets import DynamicFieldsMixin
 from .models import User
+from .thumbnails import thumbnail_url
+from .tokens import FilteredRefreshToken
+
+
+class ProfileThumbnailField(serializers.ReadOnlyField):
+    """
+    URL of one profile picture thumbnail (every size by name when ``size`` is
+    None), falling back to the original picture until the thumbnails exist
+    """
+    def __init__(self, size=None, **kwargs):
+        self.size = size
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        if self.size is not None:
+            return thumbnail_url(value, self.size, request)
+        if not value:
+            return None
+        return {size: thumbnail_url(value, size, request) for size in settings.PROFILE_THUMBNAIL_SIZES}
+
+
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    profile_thumbnails = ProfileThumbnailField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'phone_number', 'location', 'latitude', 'longitude', 'profile_picture', 'profile_thumbnails', 'selected_avatar', 'date_joined']
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Public profile embedded in other resources via ?expand= (no contact details)"""
+    profile_picture = ProfileThumbnailField('small', source='profile_thumbnails')
 
-class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'phone_number', 'location', 'profile_picture', 'selected_avatar', 'date_joined']
+        fields = ['id', 'username', 'location', 'profile_picture', 'selected_avatar']
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -29,3 +64,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('password2')
         user = User.objects.create_user(**validated_data)
         return user
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
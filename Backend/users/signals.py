@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from backend.response_cache import track_versions
+
+from .authentication import invalidate_user
+from .blacklist import blacklist_filter, bump_generation
+from .models import User
+from .thumbnails import process_thumbnails
+
+
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_user(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+post_save.connect(drop_cached_user, sender=User, dispatch_uid='users_auth_cache_save')
+post_delete.connect(drop_cached_user, sender=User, dispatch_uid='users_auth_cache_delete')
+
+# Public profiles are embedded in job and issue responses via ?expand=
+track_versions(User)
+
+
+def track_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        blacklist_filter.add(instance.token.jti)
+        transaction.on_commit(bump_generation)
+
+
+post_save.connect(track_blacklisted_token, sender=BlacklistedToken, dispatch_uid='users_blacklist_filter')
+
+
+def render_thumbnails_now(sender, instance, **kwargs):
+    if instance.thumbnails_pending and not getattr(settings, 'PROFILE_THUMBNAILS_QUEUED', True):
+        transaction.on_commit(lambda: process_thumbnails(user_ids=[instance.pk]))
+
+
+post_save.connect(render_thumbnails_now, sender=User, dispatch_uid='users_thumbnails_now')
@@ -0,0 +1,166 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .authentication import _user_key, get_cached_user, invalidate_user
+from .blacklist import (
+    GENERATION_KEY, LOAD_OVERLAP, REFRESH_INTERVAL, BlacklistFilter, blacklist_filter, bump_generation,
+)
+from .models import User
+from .tokens import FilteredRefreshToken
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    url = '/api/notifications/unread-count/'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user('worker', 'worker@example.com', 'pw')
+        self.refresh = FilteredRefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+    def test_warm_request_runs_no_queries(self):
+        # The first request loads the user row and the unread counter
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_cache_holds_no_password_hash(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        row = cache.get(_user_key(self.user.pk))
+        self.assertNotIn('password', row)
+        self.assertNotIn(self.user.password, row.values())
+
+    def test_cached_user_defers_uncached_columns(self):
+        user = get_cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.username, user.email), ('worker', 'worker@example.com'))
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('pw'))
+
+    def test_warm_profile_request_runs_no_queries(self):
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/profile/')
+        self.assertEqual(response.json()['email'], 'worker@example.com')
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_update_without_signals_is_rejected_after_invalidation(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        # update() sends no signals: the cached row still authenticates
+        self.assertTrue(get_cached_user(self.user.pk).is_active)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_user(self.user.pk)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deleted_user_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_blacklisted_refresh_token_is_rejected(self):
+        response = self.client.post('/api/users/token/refresh/', {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.refresh.blacklist()
+        response = self.client.post('/api/users/token/refresh/', {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class BlacklistFilterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user('worker', 'worker@example.com', 'pw')
+
+    def blacklisted(self, **fields):
+        token = FilteredRefreshToken.for_user(self.user)
+        entry, _ = token.blacklist()
+        if fields:
+            BlacklistedToken.objects.filter(pk=entry.pk).update(**fields)
+        return token['jti']
+
+    def warm_filter(self):
+        # A fresh instance stands in for another worker process
+        blacklist = BlacklistFilter()
+        blacklist.warm_up()
+        return blacklist
+
+    def test_rebuild_loads_unexpired_tokens(self):
+        jti = self.blacklisted()
+        expired = FilteredRefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired['jti']).update(expires_at=aware_utcnow() - timedelta(days=1))
+
+        unlisted = FilteredRefreshToken.for_user(self.user)
+
+        blacklist = self.warm_filter()
+        with self.assertNumQueries(0):
+            self.assertTrue(blacklist.might_contain(jti))
+            self.assertFalse(blacklist.might_contain(expired['jti']))
+            self.assertFalse(blacklist.might_contain(unlisted['jti']))
+
+    def test_incremental_load_overlaps_the_previous_one(self):
+        blacklist = self.warm_filter()
+        # Stamped before the last load but committed after it
+        late = self.blacklisted(blacklisted_at=blacklist._loaded_at - LOAD_OVERLAP / 2)
+        missed = self.blacklisted(blacklisted_at=blacklist._loaded_at - LOAD_OVERLAP * 2)
+        bump_generation()
+        self.assertTrue(blacklist.might_contain(late))
+        self.assertFalse(blacklist.might_contain(missed))
+        # A rebuild picks up everything
+        blacklist.reset()
+        self.assertTrue(blacklist.might_contain(missed))
+
+    def test_generation_bump_reloads_other_processes(self):
+        other = self.warm_filter()
+        token = FilteredRefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+            # Not committed yet: the generation has not moved and nothing is loaded
+            with self.assertNumQueries(0):
+                self.assertFalse(other.might_contain(token['jti']))
+        self.assertTrue(other.might_contain(token['jti']))
+        with self.assertNumQueries(0):
+            self.assertTrue(other.might_contain(token['jti']))
+
+    def test_refresh_interval_bounds_staleness_without_a_shared_cache(self):
+        other = self.warm_filter()
+        jti = self.blacklisted()
+        cache.clear()
+        other._generation = cache.get(GENERATION_KEY)
+        self.assertFalse(other.might_contain(jti))
+        with mock.patch('users.blacklist.time.monotonic', return_value=time.monotonic() + REFRESH_INTERVAL + 1):
+            self.assertTrue(other.might_contain(jti))
+
+    def test_token_blacklisted_after_warm_up_is_rejected(self):
+        blacklist_filter.reset()
+        self.addCleanup(blacklist_filter.reset)
+        blacklist_filter.warm_up()
+        refresh = FilteredRefreshToken.for_user(self.user)
+        url = '/api/users/token/refresh/'
+
+        self.assertEqual(self.client.post(url, {'refresh': str(refresh)}, format='json').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh.blacklist()
+            # This process knows at once, before the generation moves
+            with self.assertNumQueries(0):
+                self.assertTrue(blacklist_filter.might_contain(refresh['jti']))
+        self.assertEqual(self.client.post(url, {'refresh': str(refresh)}, format='json').status_code, 401)
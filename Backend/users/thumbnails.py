@@ -0,0 +1,136 @@
+"""
+Profile picture thumbnails.
+
+Saving a new profile picture only flags the user (``thumbnails_pending``).
+``manage.py process_thumbnails --loop`` is the worker: it renders every size
+in PROFILE_THUMBNAIL_SIZES as a square WebP and records the file names in
+``User.profile_thumbnails``. File names carry a hash of their bytes, so a
+thumbnail URL never changes content and ``MEDIA_URL + 'profile_pics/thumbs/'``
+can be served with far-future immutable cache headers. Run a single worker:
+it also deletes each user's thumbnails that are no longer referenced.
+
+Until the worker has run, and for uploads Pillow cannot read, URLs fall
+back to the original picture. With ``PROFILE_THUMBNAILS_QUEUED = False``
+thumbnails are rendered right after the upload commits, which is handy in
+development.
+"""
+import hashlib
+import io
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from backend.response_cache import bump_version
+
+from .authentication import invalidate_user
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+THUMBNAIL_DIR = 'profile_pics/thumbs'
+WEBP_QUALITY = 80
+
+
+def picture_storage():
+    return User._meta.get_field('profile_picture').storage
+
+
+def thumbnail_url(thumbnails, size, request=None):
+    """URL of the ``size`` thumbnail, else of the original picture, or None"""
+    name = thumbnails.get(size) or thumbnails.get('source')
+    if not name:
+        return None
+    url = picture_storage().url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def render_thumbnails(file):
+    """WebP bytes of every configured thumbnail of the image in ``file``, by size"""
+    sizes = settings.PROFILE_THUMBNAIL_SIZES
+    with Image.open(file) as image:
+        # JPEGs decode straight at a reduced scale when they are much larger
+        largest = max(sizes.values())
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        rendered = {}
+        for size, edge in sizes.items():
+            # Never upscale: a small upload is only cropped to a square
+            edge = min(edge, *image.size)
+            thumbnail = ImageOps.fit(image, (edge, edge), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, 'WEBP', quality=WEBP_QUALITY)
+            rendered[size] = buffer.getvalue()
+    return rendered
+
+
+def store_thumbnail(user_id, size, data):
+    """Save thumbnail bytes under a content-hashed name; returns the name"""
+    storage = picture_storage()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    name = f'{THUMBNAIL_DIR}/{user_id}/{size}-{digest}.webp'
+    if not storage.exists(name):
+        name = storage.save(name, ContentFile(data))
+    return name
+
+
+def delete_stale_thumbnails(user_id, keep):
+    """Delete the user's thumbnail files whose names are not in ``keep``"""
+    storage = picture_storage()
+    directory = f'{THUMBNAIL_DIR}/{user_id}'
+    try:
+        _, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        name = f'{directory}/{filename}'
+        if name not in keep:
+            storage.delete(name)
+
+
+def generate_thumbnails(user_id, source):
+    """
+    Render and record the thumbnails of picture ``source`` for one user.
+    Returns False, leaving the user flagged, when the picture changed in the
+    meantime.
+    """
+    thumbnails = {'source': source} if source else {}
+    if source:
+        try:
+            with picture_storage().open(source) as file:
+                rendered = render_thumbnails(file)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # Unreadable or hostile upload: keep serving the original
+            logger.warning("Could not render thumbnails of %s for user %s", source, user_id, exc_info=True)
+            rendered = {}
+        for size, data in rendered.items():
+            thumbnails[size] = store_thumbnail(user_id, size, data)
+
+    current = Q(profile_picture=source) if source else Q(profile_picture='') | Q(profile_picture__isnull=True)
+    updated = User.objects.filter(current, pk=user_id).update(
+        profile_thumbnails=thumbnails, thumbnails_pending=False,
+    )
+    if not updated:
+        return False
+    # update() sends no signals
+    invalidate_user(user_id)
+    bump_version(User)
+    delete_stale_thumbnails(user_id, set(thumbnails.values()))
+    return True
+
+
+def process_thumbnails(batch_size=DEFAULT_BATCH_SIZE, user_ids=None):
+    """Render thumbnails for up to ``batch_size`` flagged users; returns how many were taken"""
+    queryset = User.objects.filter(thumbnails_pending=True)
+    if user_ids is not None:
+        queryset = queryset.filter(pk__in=user_ids)
+    pending = list(queryset.order_by('id').values_list('id', 'profile_picture')[:batch_size])
+    for user_id, source in pending:
+        generate_thumbnails(user_id, source or '')
+    return len(pending)
@@ -1,16 +1,16 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import User
-from .serializers import RegisterSerializer, UserSerializer
+from .serializers import FilteredTokenRefreshSerializer, RegisterSerializer, UserSerializer
+from .tokens import FilteredRefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework import status
 
-# Token Refresh (use built-in SimpleJWT view)
+# Token Refresh (built-in SimpleJWT view, blacklist checked through the filter)
 class CustomTokenRefreshView(TokenRefreshView):
-    pass
+    serializer_class = FilteredTokenRefreshSerializer
 
 # Register View
 class RegisterView(generics.CreateAPIView):
@@ -46,7 +46,7 @@ class LoginView(APIView):
                 status=400
             )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = FilteredRefreshToken.for_user(user)
         return Response({
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -60,7 +60,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()  # invalidate the token
             return Response({"message": "Logged out successfully"}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
@@ -71,5 +71,5 @@ class ProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(request.user, context={'query_params': request.query_params})
         return Response(serializer.data)
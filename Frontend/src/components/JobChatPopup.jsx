@@ -1,9 +1,11 @@
 import { useState, useEffect, useRef } from "react";
 import { X, Send, Users } from "lucide-react";
 import { useAuth } from "../hooks/useAuth";
+import { useChatSocket } from "../hooks/useChatSocket";
 
 function JobChatPopup({ isOpen, onClose, job }) {
   const [messages, setMessages] = useState([]);
+  const [hasMoreBefore, setHasMoreBefore] = useState(false);
   const [newMessage, setNewMessage] = useState("");
   const [loading, setLoading] = useState(false);
   const [conversations, setConversations] = useState([]);
@@ -20,6 +22,22 @@ function JobChatPopup({ isOpen, onClose, job }) {
     scrollToBottom();
   }, [messages]);
 
+  const appendMessage = (message) => {
+    setMessages((prev) =>
+      prev.some((m) => m.id === message.id) ? prev : [...prev, message]
+    );
+  };
+
+  const isCreator = user?.id === job?.created_by;
+
+  useChatSocket({
+    kind: "job",
+    objectId: job?.id,
+    userId: isCreator ? selectedUserId : null,
+    enabled: isOpen && (!isCreator || Boolean(selectedUserId)),
+    onMessage: appendMessage,
+  });
+
   useEffect(() => {
     if (isOpen && job) {
       fetchConversations();
@@ -63,11 +81,12 @@ function JobChatPopup({ isOpen, onClose, job }) {
     }
   };
 
-  const fetchMessages = async (userId = null) => {
+  const fetchMessages = async (userId = null, before = null) => {
     try {
-      const url = userId
-        ? `http://localhost:8000/api/chat/job/${job.id}/messages/?user_id=${userId}`
-        : `http://localhost:8000/api/chat/job/${job.id}/messages/`;
+      const params = new URLSearchParams();
+      if (userId) params.set("user_id", userId);
+      if (before) params.set("before", before);
+      const url = `http://localhost:8000/api/chat/job/${job.id}/messages/?${params}`;
 
       const response = await fetch(url, {
         headers: {
@@ -77,7 +96,8 @@ function JobChatPopup({ isOpen, onClose, job }) {
 
       if (response.ok) {
         const data = await response.json();
-        setMessages(data);
+        setMessages((prev) => (before ? [...data.results, ...prev] : data.results));
+        setHasMoreBefore(data.has_more_before);
       }
     } catch (error) {
       console.error("Error fetching messages:", error);
@@ -110,7 +130,7 @@ function JobChatPopup({ isOpen, onClose, job }) {
 
       if (response.ok) {
         const data = await response.json();
-        setMessages([...messages, data]);
+        appendMessage(data);
         setNewMessage("");
       } else {
         const errorData = await response.json();
@@ -215,7 +235,16 @@ function JobChatPopup({ isOpen, onClose, job }) {
               No messages yet. Start the conversation!
             </div>
           ) : (
-            messages.map((message, index) => (
+            <>
+            {hasMoreBefore && (
+              <button
+                onClick={() => fetchMessages(selectedUserId, messages[0]?.id)}
+                className="w-full text-xs text-indigo-600 hover:underline"
+              >
+                Load earlier messages
+              </button>
+            )}
+            {messages.map((message, index) => (
               <div
                 key={index}
                 className={`flex ${
@@ -235,7 +264,8 @@ function JobChatPopup({ isOpen, onClose, job }) {
                   </p>
                 </div>
               </div>
-            ))
+            ))}
+            </>
           )}
           <div ref={messagesEndRef} />
         </div>
@@ -0,0 +1,33 @@
+import { useEffect, useRef } from "react";
+import { useAuth } from "./useAuth";
+
+// Subscribe to live messages of one private job/issue chat.
+// The REST endpoints remain the source of history; the socket only
+// delivers messages sent after it connects.
+export const useChatSocket = ({ kind, objectId, userId, enabled, onMessage }) => {
+  const { token } = useAuth();
+  const onMessageRef = useRef(onMessage);
+  onMessageRef.current = onMessage;
+
+  useEffect(() => {
+    if (!enabled || !token || !objectId) return;
+
+    const params = new URLSearchParams({ token });
+    if (userId) params.set("user_id", userId);
+
+    const socket = new WebSocket(
+      `ws://localhost:8000/ws/chat/${kind}/${objectId}/?${params}`
+    );
+
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.id) onMessageRef.current(data);
+    };
+
+    socket.onerror = (error) => {
+      console.error("Chat socket error:", error);
+    };
+
+    return () => socket.close();
+  }, [kind, objectId, userId, enabled, token]);
+};
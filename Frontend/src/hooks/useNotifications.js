@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useAuth } from "./useAuth";
 
 export const useNotifications = () => {
@@ -6,6 +6,7 @@ export const useNotifications = () => {
   const [notifications, setNotifications] = useState([]);
   const [unreadCount, setUnreadCount] = useState(0);
   const [loading, setLoading] = useState(true);
+  const socketOpen = useRef(false);
 
   const fetchNotifications = async () => {
     if (!token) return;
@@ -19,7 +20,7 @@ export const useNotifications = () => {
 
       if (response.ok) {
         const data = await response.json();
-        setNotifications(data);
+        setNotifications(data.results ?? data);
       } else if (response.status === 401 || response.status === 403) {
         const refreshed = await refreshToken();
         if (refreshed) {
@@ -32,7 +33,7 @@ export const useNotifications = () => {
           );
           if (retry.ok) {
             const data = await retry.json();
-            setNotifications(data);
+            setNotifications(data.results ?? data);
           }
         }
       }
@@ -58,7 +59,7 @@ export const useNotifications = () => {
 
       if (response.ok) {
         const data = await response.json();
-        setUnreadCount(data.count);
+        setUnreadCount(data.unread_count);
       } else if (response.status === 401 || response.status === 403) {
         const refreshed = await refreshToken();
         if (refreshed) {
@@ -71,7 +72,7 @@ export const useNotifications = () => {
           );
           if (retry.ok) {
             const data = await retry.json();
-            setUnreadCount(data.count);
+            setUnreadCount(data.unread_count);
           }
         }
       }
@@ -113,8 +114,9 @@ export const useNotifications = () => {
     fetchNotifications();
     fetchUnreadCount();
 
-    // Refresh notifications more frequently (every 10 seconds) to catch new messages
+    // Fall back to polling only while the push socket is not connected
     const interval = setInterval(() => {
+      if (socketOpen.current) return;
       fetchNotifications();
       fetchUnreadCount();
     }, 10000);
@@ -122,6 +124,52 @@ export const useNotifications = () => {
     return () => clearInterval(interval);
   }, [token]);
 
+  // Server pushes new notifications and unread count changes over WebSocket
+  useEffect(() => {
+    if (!token) return;
+
+    let socket;
+    let reconnectTimer;
+    let closed = false;
+
+    const connect = () => {
+      socket = new WebSocket(
+        `ws://localhost:8000/ws/notifications/?token=${encodeURIComponent(token)}`
+      );
+
+      socket.onopen = () => {
+        socketOpen.current = true;
+      };
+
+      socket.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type === "notification") {
+          // Coalesced notifications arrive again with the same id
+          setNotifications((prev) => [
+            data.notification,
+            ...prev.filter((n) => n.id !== data.notification.id),
+          ]);
+        }
+        if (data.unread_count !== undefined) {
+          setUnreadCount(data.unread_count);
+        }
+      };
+
+      socket.onclose = () => {
+        socketOpen.current = false;
+        if (!closed) reconnectTimer = setTimeout(connect, 5000);
+      };
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      socket?.close();
+    };
+  }, [token]);
+
   return {
     notifications,
     unreadCount,
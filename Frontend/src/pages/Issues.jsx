@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { useAuth } from "../hooks/useAuth";
 import { useNavigate } from "react-router-dom";
 import IssueCard from "../components/IssueCard";
@@ -6,6 +6,21 @@ import IssueForm from "../components/IssueForm";
 import IssueChatPopup from "../components/IssueChatPopup";
 import { Search, Filter } from "lucide-react";
 
+const ISSUES_LIST_URL = "http://localhost:8000/api/issues/";
+// Only the fields the cards render
+const ISSUES_LIST_FIELDS = "id,title,description,category,salary,user";
+
+// First page URL for the search box and the selected filter; the server
+// searches, so results are not limited to the pages already loaded
+function issuesListUrl(searchTerm, searchFilter) {
+  const params = new URLSearchParams({ fields: ISSUES_LIST_FIELDS });
+  if (searchTerm) {
+    const param = searchFilter === "category" ? "category_name" : "search";
+    params.set(param, searchTerm);
+  }
+  return `${ISSUES_LIST_URL}?${params}`;
+}
+
 export default function Issues() {
   const [issues, setIssues] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -13,7 +28,10 @@ export default function Issues() {
   const [selectedIssue, setSelectedIssue] = useState(null);
   const [showChat, setShowChat] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [searchFilter, setSearchFilter] = useState("all");
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [highlightedIssueId, setHighlightedIssueId] = useState(null);
   const { token, refreshToken, user } = useAuth();
   const navigate = useNavigate();
@@ -52,111 +70,98 @@ export default function Issues() {
     }
   }, [issues]);
 
-  // Fetch issues(problems) from backend
+  // Wait until typing pauses before querying the server
   useEffect(() => {
-    if (!token) {
-      navigate("/login");
-      return;
-    }
-
-    const fetchIssues = async () => {
-      try {
-        const response = await fetch("http://localhost:8000/api/issues/", {
+    const timer = setTimeout(() => setDebouncedSearch(searchTerm.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  // Fetch one page of issues, refreshing the token once if it expired
+  const fetchIssuesPage = useCallback(
+    async (url) => {
+      const request = (currentToken) =>
+        fetch(url, {
           headers: {
             "Content-Type": "application/json",
-            Authorization: `Bearer ${token}`,
+            Authorization: `Bearer ${currentToken}`,
           },
         });
 
-        let data;
-        try {
-          data = await response.json();
-        } catch (e) {
-          console.error("Failed to parse response:", e);
-          throw new Error("Invalid response from server");
+      let response = await request(token);
+      if (response.status === 401) {
+        // Token expired, try to refresh
+        const refreshed = await refreshToken();
+        if (!refreshed) {
+          navigate("/login");
+          return null;
         }
+        // Retry with new token
+        response = await request(localStorage.getItem("token"));
+      }
 
-        if (response.status === 401) {
-          // Token expired, try to refresh
-          const refreshed = await refreshToken();
-          if (refreshed) {
-            // Retry with new token
-            const newToken = localStorage.getItem("token");
-            const newResponse = await fetch(
-              "http://localhost:8000/api/issues/",
-              {
-                headers: {
-                  "Content-Type": "application/json",
-                  Authorization: `Bearer ${newToken}`,
-                },
-              }
-            );
-
-            let newData;
-            try {
-              newData = await newResponse.json();
-            } catch (e) {
-              console.error("Failed to parse response after token refresh:", e);
-              throw new Error(
-                "Invalid response from server after token refresh"
-              );
-            }
+      let data;
+      try {
+        data = await response.json();
+      } catch (e) {
+        console.error("Failed to parse response:", e);
+        throw new Error("Invalid response from server");
+      }
 
-            if (!newResponse.ok) {
-              throw new Error(newData.detail || "Failed to fetch issues");
-            }
-            setIssues(newData);
-            setLoading(false);
-            return;
-          } else {
-            navigate("/login");
-            return;
-          }
-        }
+      if (!response.ok) {
+        throw new Error(data.detail || "Failed to fetch issues");
+      }
+      return data;
+    },
+    [token, navigate, refreshToken]
+  );
 
-        if (!response.ok) {
-          throw new Error(data.detail || "Failed to fetch issues");
-        }
+  // Fetch the first page of issues matching the search
+  useEffect(() => {
+    if (!token) {
+      navigate("/login");
+      return;
+    }
 
-        setIssues(data);
-        setLoading(false);
-      } catch (err) {
-        console.error("Fetch error:", err);
-        setLoading(false);
-      }
+    let cancelled = false;
+
+    fetchIssuesPage(issuesListUrl(debouncedSearch, searchFilter))
+      .then((data) => {
+        if (cancelled || !data) return;
+        setIssues(data.results ?? data);
+        setNextUrl(data.next ?? null);
+      })
+      .catch((err) => console.error("Fetch error:", err))
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
     };
+  }, [token, navigate, fetchIssuesPage, debouncedSearch, searchFilter]);
 
-    fetchIssues();
-  }, [token, navigate, refreshToken]);
+  // Follow the cursor to the next page
+  const handleLoadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchIssuesPage(nextUrl);
+      if (data) {
+        setIssues((loaded) => [...loaded, ...data.results]);
+        setNextUrl(data.next);
+      }
+    } catch (err) {
+      console.error("Fetch error:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const handleChat = (issue) => {
     setSelectedIssue(issue);
     setShowChat(true);
   };
 
-  // Filter issues based on search term and selected filter
-  const filteredIssues = issues.filter((issue) => {
-    if (!searchTerm) return true;
-
-    const searchLower = searchTerm.toLowerCase();
-
-    switch (searchFilter) {
-      case "title":
-        return issue.title?.toLowerCase().includes(searchLower);
-      case "category":
-        return issue.category?.toLowerCase().includes(searchLower);
-      case "description":
-        return issue.description?.toLowerCase().includes(searchLower);
-      case "all":
-      default:
-        return (
-          issue.title?.toLowerCase().includes(searchLower) ||
-          issue.category?.toLowerCase().includes(searchLower) ||
-          issue.description?.toLowerCase().includes(searchLower)
-        );
-    }
-  });
-
   const handleDeleteIssue = async (issue) => {
     if (!confirm(`Are you sure you want to delete "${issue.title}"?`)) {
       return;
@@ -340,17 +345,11 @@ export default function Issues() {
               className="block w-full h-10 pl-10 pr-8 py-2 border border-gray-300 rounded-md bg-orange-500 text-white focus:outline-none focus:ring-1 focus:ring-orange-600 focus:border-orange-600 text-sm appearance-none"
             >
               <option value="all" className="bg-white text-gray-700">
-                All Fields
-              </option>
-              <option value="title" className="bg-white text-gray-700">
-                Title
+                Title & Description
               </option>
               <option value="category" className="bg-white text-gray-700">
                 Category
               </option>
-              <option value="description" className="bg-white text-gray-700">
-                Description
-              </option>
             </select>
             <div className="absolute inset-y-0 right-0 flex items-center pr-3 pointer-events-none">
               <svg
@@ -373,7 +372,7 @@ export default function Issues() {
 
       {/* Issues Grid */}
       <div className="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-6">
-        {filteredIssues.map((issue) => (
+        {issues.map((issue) => (
           <div
             key={issue.id}
             id={`issue-${issue.id}`}
@@ -397,18 +396,31 @@ export default function Issues() {
             />
           </div>
         ))}
-        {filteredIssues.length === 0 && issues.length > 0 && (
+        {issues.length === 0 && !loading && debouncedSearch && (
           <p className="text-gray-500 col-span-full text-center py-8">
-            No problems found matching "{searchTerm}". Try different keywords.
+            No problems found matching "{debouncedSearch}". Try different
+            keywords.
           </p>
         )}
-        {issues.length === 0 && !loading && (
+        {issues.length === 0 && !loading && !debouncedSearch && (
           <p className="text-gray-500 col-span-full text-center py-8">
             No problems found. Click "Post New Problem" to create one.
           </p>
         )}
       </div>
 
+      {nextUrl && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="bg-orange-500 text-white px-4 py-2 rounded-md shadow hover:opacity-95 transition text-sm font-medium disabled:opacity-60"
+          >
+            {loadingMore ? "Loading..." : "Load more problems"}
+          </button>
+        </div>
+      )}
+
       <style>{`
         @keyframes zoomInOut {
           0% {
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { useAuth } from "../hooks/useAuth";
 import { useNavigate } from "react-router-dom";
 import JobCard from "../components/JobCard";
@@ -6,6 +6,29 @@ import JobForm from "../components/JobForm";
 import JobChatPopup from "../components/JobChatPopup";
 import { Search, Filter } from "lucide-react";
 
+const JOBS_LIST_URL = "http://localhost:8000/api/jobs/";
+// Only the fields the cards render
+const JOBS_LIST_FIELDS = "id,title,description,category_name,salary,created_by";
+
+// First page URL for the search box and the selected filter; the server
+// searches, so results are not limited to the pages already loaded
+function jobsListUrl(searchTerm, searchFilter) {
+  const params = new URLSearchParams({ fields: JOBS_LIST_FIELDS });
+  if (searchTerm) {
+    const amount = Number(searchTerm.replace(/[^\d.]/g, ""));
+    if (searchFilter === "category") {
+      params.set("category_name", searchTerm);
+    } else if (searchFilter === "price" && amount) {
+      // Jobs whose pay range includes the amount
+      params.set("salary_min", amount);
+      params.set("salary_max", amount);
+    } else {
+      params.set("search", searchTerm);
+    }
+  }
+  return `${JOBS_LIST_URL}?${params}`;
+}
+
 export default function Jobs() {
   const [jobs, setJobs] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -13,7 +36,10 @@ export default function Jobs() {
   const [selectedJob, setSelectedJob] = useState(null);
   const [showChat, setShowChat] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [searchFilter, setSearchFilter] = useState("all");
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [highlightedJobId, setHighlightedJobId] = useState(null);
   const { token, refreshToken, user } = useAuth();
   const navigate = useNavigate();
@@ -52,115 +78,98 @@ export default function Jobs() {
     }
   }, [jobs]);
 
-  // Fetch jobs from backend
+  // Wait until typing pauses before querying the server
   useEffect(() => {
-    if (!token) {
-      navigate("/login");
-      return;
-    }
-
-    const fetchJobs = async () => {
-      try {
-        const response = await fetch("http://localhost:8000/api/jobs/", {
+    const timer = setTimeout(() => setDebouncedSearch(searchTerm.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  // Fetch one page of jobs, refreshing the token once if it expired
+  const fetchJobsPage = useCallback(
+    async (url) => {
+      const request = (currentToken) =>
+        fetch(url, {
           headers: {
             "Content-Type": "application/json",
-            Authorization: `Bearer ${token}`,
+            Authorization: `Bearer ${currentToken}`,
           },
         });
 
-        let data;
-        try {
-          data = await response.json();
-        } catch (e) {
-          console.error("Failed to parse response:", e);
-          throw new Error("Invalid response from server");
+      let response = await request(token);
+      if (response.status === 401) {
+        // Token expired, try to refresh
+        const refreshed = await refreshToken();
+        if (!refreshed) {
+          navigate("/login");
+          return null;
         }
+        // Retry with new token
+        response = await request(localStorage.getItem("token"));
+      }
 
-        if (response.status === 401) {
-          // Token expired, try to refresh
-          const refreshed = await refreshToken();
-          if (refreshed) {
-            // Retry with new token
-            const newToken = localStorage.getItem("token");
-            const newResponse = await fetch("http://localhost:8000/api/jobs/", {
-              headers: {
-                "Content-Type": "application/json",
-                Authorization: `Bearer ${newToken}`,
-              },
-            });
-
-            let newData;
-            try {
-              newData = await newResponse.json();
-            } catch (e) {
-              console.error("Failed to parse response after token refresh:", e);
-              throw new Error(
-                "Invalid response from server after token refresh"
-              );
-            }
+      let data;
+      try {
+        data = await response.json();
+      } catch (e) {
+        console.error("Failed to parse response:", e);
+        throw new Error("Invalid response from server");
+      }
 
-            if (!newResponse.ok) {
-              throw new Error(newData.detail || "Failed to fetch jobs");
-            }
-            setJobs(newData);
-            setLoading(false);
-            return;
-          } else {
-            navigate("/login");
-            return;
-          }
-        }
+      if (!response.ok) {
+        throw new Error(data.detail || "Failed to fetch jobs");
+      }
+      return data;
+    },
+    [token, navigate, refreshToken]
+  );
 
-        if (!response.ok) {
-          throw new Error(data.detail || "Failed to fetch jobs");
-        }
+  // Fetch the first page of jobs matching the search
+  useEffect(() => {
+    if (!token) {
+      navigate("/login");
+      return;
+    }
 
-        setJobs(data);
-        setLoading(false);
-      } catch (err) {
-        console.error("Fetch error:", err);
-        setLoading(false);
-      }
+    let cancelled = false;
+
+    fetchJobsPage(jobsListUrl(debouncedSearch, searchFilter))
+      .then((data) => {
+        if (cancelled || !data) return;
+        setJobs(data.results ?? data);
+        setNextUrl(data.next ?? null);
+      })
+      .catch((err) => console.error("Fetch error:", err))
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
     };
+  }, [token, navigate, fetchJobsPage, debouncedSearch, searchFilter]);
 
-    fetchJobs();
-  }, [token, navigate, refreshToken]);
+  // Follow the cursor to the next page
+  const handleLoadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchJobsPage(nextUrl);
+      if (data) {
+        setJobs((loaded) => [...loaded, ...data.results]);
+        setNextUrl(data.next);
+      }
+    } catch (err) {
+      console.error("Fetch error:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const handleChat = (job) => {
     setSelectedJob(job);
     setShowChat(true);
   };
 
-  // Filter jobs(services) based on search term and selected filter
-  const filteredJobs = jobs.filter((job) => {
-    if (!searchTerm) return true;
-
-    const searchLower = searchTerm.toLowerCase();
-
-    switch (searchFilter) {
-      case "title":
-        return job.title?.toLowerCase().includes(searchLower);
-      case "category":
-        return (
-          job.category?.toLowerCase().includes(searchLower) ||
-          job.category_name?.toLowerCase().includes(searchLower)
-        );
-      case "description":
-        return job.description?.toLowerCase().includes(searchLower);
-      case "price":
-        return job.salary?.toString().includes(searchTerm);
-      case "all":
-      default:
-        return (
-          job.title?.toLowerCase().includes(searchLower) ||
-          job.category?.toLowerCase().includes(searchLower) ||
-          job.category_name?.toLowerCase().includes(searchLower) ||
-          job.description?.toLowerCase().includes(searchLower) ||
-          job.salary?.toString().includes(searchTerm)
-        );
-    }
-  });
-
   // Handle adding a new job(services) with token refresh logic
   const handleAddJob = async (formData) => {
     try {
@@ -328,17 +337,11 @@ export default function Jobs() {
               className="block w-full h-10 pl-10 pr-8 py-2 border border-gray-300 rounded-md bg-orange-500 text-white focus:outline-none focus:ring-1 focus:ring-orange-600 focus:border-orange-600 text-sm appearance-none"
             >
               <option value="all" className="bg-white text-gray-700">
-                All Fields
-              </option>
-              <option value="title" className="bg-white text-gray-700">
-                Title
+                Title & Description
               </option>
               <option value="category" className="bg-white text-gray-700">
                 Category
               </option>
-              <option value="description" className="bg-white text-gray-700">
-                Description
-              </option>
               <option value="price" className="bg-white text-gray-700">
                 Price
               </option>
@@ -364,7 +367,7 @@ export default function Jobs() {
 
       {/* Job Cards */}
       <div className="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-6">
-        {filteredJobs.map((job) => (
+        {jobs.map((job) => (
           <div
             key={job.id}
             id={`job-${job.id}`}
@@ -388,18 +391,31 @@ export default function Jobs() {
             />
           </div>
         ))}
-        {filteredJobs.length === 0 && jobs.length > 0 && (
+        {jobs.length === 0 && !loading && debouncedSearch && (
           <p className="text-gray-500 col-span-full text-center py-8">
-            No services found matching "{searchTerm}". Try different keywords.
+            No services found matching "{debouncedSearch}". Try different
+            keywords.
           </p>
         )}
-        {jobs.length === 0 && !loading && (
+        {jobs.length === 0 && !loading && !debouncedSearch && (
           <p className="text-gray-500 col-span-full text-center py-8">
             No services available. Click "Post New Service" to add one.
           </p>
         )}
       </div>
 
+      {nextUrl && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="bg-orange-500 text-white px-4 py-2 rounded-md shadow hover:opacity-95 transition text-sm font-medium disabled:opacity-60"
+          >
+            {loadingMore ? "Loading..." : "Load more services"}
+          </button>
+        </div>
+      )}
+
       <style>{`
         @keyframes zoomInOut {
           0% {
@@ -43,35 +43,33 @@ function Profile() {
     navigate("/login");
   };
 
-  const fetchMyJobs = async () => {
-    setJobsLoading(true);
-    try {
-      const response = await fetch("http://localhost:8000/api/jobs/my/", {
+  // The lists are paginated (at most 100 per page): follow the cursor
+  // until every page has been loaded
+  const fetchAllPages = async (url) => {
+    const results = [];
+    while (url) {
+      const response = await fetch(url, {
         headers: {
           "Content-Type": "application/json",
           Authorization: `Bearer ${token}`,
         },
       });
-
-      if (response.ok) {
-        const data = await response.json();
-        setMyJobs(data);
-      } else {
-        // Fallback: filter all jobs by current user
-        const allJobsResponse = await fetch("http://localhost:8000/api/jobs/", {
-          headers: {
-            "Content-Type": "application/json",
-            Authorization: `Bearer ${token}`,
-          },
-        });
-        if (allJobsResponse.ok) {
-          const allJobs = await allJobsResponse.json();
-          const userJobs = allJobs.filter(
-            (job) => job.user_id === user.id || job.created_by === user.id
-          );
-          setMyJobs(userJobs);
-        }
+      if (!response.ok) {
+        throw new Error(`Request failed with status ${response.status}`);
       }
+      const data = await response.json();
+      results.push(...(data.results ?? data));
+      url = data.next ?? null;
+    }
+    return results;
+  };
+
+  const fetchMyJobs = async () => {
+    setJobsLoading(true);
+    try {
+      setMyJobs(
+        await fetchAllPages("http://localhost:8000/api/jobs/my/?page_size=100")
+      );
     } catch (err) {
       console.error("Error fetching my jobs:", err);
     }
@@ -81,35 +79,9 @@ function Profile() {
   const fetchMyIssues = async () => {
     setIssuesLoading(true);
     try {
-      const response = await fetch("http://localhost:8000/api/issues/my/", {
-        headers: {
-          "Content-Type": "application/json",
-          Authorization: `Bearer ${token}`,
-        },
-      });
-
-      if (response.ok) {
-        const data = await response.json();
-        setMyIssues(data);
-      } else {
-        // Fallback: filter all issues by current user
-        const allIssuesResponse = await fetch(
-          "http://localhost:8000/api/issues/",
-          {
-            headers: {
-              "Content-Type": "application/json",
-              Authorization: `Bearer ${token}`,
-            },
-          }
-        );
-        if (allIssuesResponse.ok) {
-          const allIssues = await allIssuesResponse.json();
-          const userIssues = allIssues.filter(
-            (issue) => issue.user === user.id
-          );
-          setMyIssues(userIssues);
-        }
-      }
+      setMyIssues(
+        await fetchAllPages("http://localhost:8000/api/issues/my/?page_size=100")
+      );
     } catch (err) {
       console.error("Error fetching my issues:", err);
     }